@@ -3,9 +3,21 @@
 """
 
 from backend.internal.entity.good import Good
+from backend.internal.entity.import_checkpoint import ImportCheckpoint
 from backend.internal.entity.order import Order
 from backend.internal.entity.order_item import OrderItem
 from backend.internal.entity.order_pick_up_point import OrderPickUpPoint
+from backend.internal.entity.order_summary import OrderSummary
+from backend.internal.entity.stock_reservation import StockReservation
 from backend.internal.entity.user import User
 
-__all__ = ["Good", "Order", "OrderItem", "OrderPickUpPoint", "User"]
+__all__ = [
+    "Good",
+    "ImportCheckpoint",
+    "Order",
+    "OrderItem",
+    "OrderPickUpPoint",
+    "OrderSummary",
+    "StockReservation",
+    "User",
+]
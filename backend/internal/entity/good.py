@@ -2,15 +2,65 @@
 ORM модель для товаров
 """
 
-from sqlalchemy import Column, Integer, String, Numeric, Text
+from sqlalchemy import Column, Integer, String, Numeric, Text, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from backend.pkg.postgres.postgres import Base
 
+# Конфигурация полнотекстового поиска и взвешенный вектор по текстовым полям
+SEARCH_CONFIG = "russian"
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(article, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(category, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(manufacturer, '')), 'C') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(provider, '')), 'C') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'D')"
+)
+# Поля товара, из которых строится поисковый вектор
+SEARCH_FIELDS = (
+    "name",
+    "article",
+    "category",
+    "manufacturer",
+    "provider",
+    "description",
+)
+
 
 class Good(Base):
     __tablename__ = "Goods"
+    __table_args__ = (
+        Index("ix_goods_search_vector", "search_vector", postgresql_using="gin"),
+        # Триграммные индексы для подсказок в строке поиска (pg_trgm)
+        Index(
+            "ix_goods_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_goods_article_trgm",
+            "article",
+            postgresql_using="gin",
+            postgresql_ops={"article": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_goods_manufacturer_trgm",
+            "manufacturer",
+            postgresql_using="gin",
+            postgresql_ops={"manufacturer": "gin_trgm_ops"},
+        ),
+        # Сортировка каталога по остатку, в том числе с фильтром по поставщику
+        Index("ix_goods_count_id", "count", "id"),
+        Index("ix_goods_provider_count_id", "provider", "count", "id"),
+        # Списки категорий и производителей
+        Index("ix_goods_category", "category"),
+        Index("ix_goods_manufacturer", "manufacturer"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    article = Column(String(100), nullable=False)
+    article = Column(String(100), nullable=False, unique=True)
     name = Column(String(255), nullable=False)
     unit_of_measurement = Column(String(10), nullable=False)
     price = Column(Numeric(12, 2), nullable=False)
@@ -21,6 +71,12 @@ class Good(Base):
     count = Column(Integer, nullable=False, default=0)
     description = Column(Text, nullable=True)
     image = Column(String(255), nullable=True)
+    search_vector = deferred(
+        Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True))
+    )
+    # Ранг совпадения с поисковым запросом: в БД не хранится, заполняется
+    # страницей результатов поиска без сортировки (GoodsPostgres.get_page)
+    search_rank = None
 
     def __init__(
         self,
@@ -0,0 +1,31 @@
+"""
+ORM модель для контрольных точек импорта данных из Excel
+"""
+
+from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy.sql import func
+from backend.pkg.postgres.postgres import Base
+
+
+class ImportCheckpoint(Base):
+    __tablename__ = "Import_Checkpoint"
+
+    file_name = Column(String(255), primary_key=True)
+    content_hash = Column(String(64), nullable=False)
+    row_offset = Column(Integer, nullable=False, default=0)
+    completed = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(
+        DateTime, nullable=False, server_default=func.current_timestamp()
+    )
+
+    def __init__(
+        self,
+        file_name: str,
+        content_hash: str,
+        row_offset: int = 0,
+        completed: bool = False,
+    ):
+        self.file_name = file_name
+        self.content_hash = content_hash
+        self.row_offset = row_offset
+        self.completed = completed
@@ -2,13 +2,18 @@
 ORM модель для заказов
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from backend.pkg.postgres.postgres import Base
 
 
 class Order(Base):
     __tablename__ = "Order"
+    __table_args__ = (
+        # Заказы пользователя и ON DELETE SET NULL по внешним ключам
+        Index("ix_order_user_id", "user_id"),
+        Index("ix_order_pick_up_point_id", "pick_up_point_id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("User.id", ondelete="SET NULL"), nullable=True)
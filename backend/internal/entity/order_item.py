@@ -2,12 +2,18 @@
 ORM модель для элементов заказа (связь многие-ко-многим между Order и Goods)
 """
 
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint, Index
 from backend.pkg.postgres.postgres import Base
 
 
 class OrderItem(Base):
     __tablename__ = "Order_Items"
+    # Товар входит в заказ одной строкой (ключ для сверки состава заказа)
+    __table_args__ = (
+        UniqueConstraint("order_id", "goods_id"),
+        # Проверка, входит ли товар в заказы, и ON DELETE CASCADE товара
+        Index("ix_order_items_goods_id", "goods_id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     order_id = Column(
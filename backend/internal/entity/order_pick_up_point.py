@@ -10,7 +10,7 @@ class OrderPickUpPoint(Base):
     __tablename__ = "Order_Pick_Up_Point"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    full_address = Column(String(255), nullable=False)
+    full_address = Column(String(255), nullable=False, unique=True)
 
     def __init__(self, full_address: str):
         self.full_address = full_address
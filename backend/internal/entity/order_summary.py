@@ -0,0 +1,16 @@
+"""
+Сводка по составу заказа (не ORM модель - результат агрегирующего запроса)
+"""
+
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass
+class OrderSummary:
+    order_id: int
+    # Сумма заказа с учетом скидок на товары
+    total: float = 0.0
+    # Количество единиц товара в заказе
+    items_count: int = 0
+    articles: List[str] = field(default_factory=list)
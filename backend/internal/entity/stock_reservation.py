@@ -0,0 +1,35 @@
+"""
+ORM модель для временного резерва товара в открытой корзине
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from backend.pkg.postgres.postgres import Base
+
+
+class StockReservation(Base):
+    __tablename__ = "Stock_Reservation"
+    __table_args__ = (
+        # Доступный остаток: сумма действующих резервов товара читается
+        # только из индекса (index-only scan)
+        Index(
+            "ix_stock_reservation_goods_expires",
+            "goods_id",
+            "expires_at",
+            postgresql_include=["quantity", "cart_id"],
+        ),
+        # Удаление просроченных резервов
+        Index("ix_stock_reservation_expires", "expires_at"),
+    )
+
+    cart_id = Column(String(36), primary_key=True)
+    goods_id = Column(
+        Integer, ForeignKey("Goods.id", ondelete="CASCADE"), primary_key=True
+    )
+    quantity = Column(Integer, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __init__(self, cart_id: str, goods_id: int, quantity: int, expires_at):
+        self.cart_id = cart_id
+        self.goods_id = goods_id
+        self.quantity = quantity
+        self.expires_at = expires_at
@@ -6,5 +6,12 @@ from backend.internal.repo.persistent.goods_postgres import GoodsPostgres
 from backend.internal.repo.persistent.user_postgres import UserPostgres
 from backend.internal.repo.persistent.order_postgres import OrderPostgres
 from backend.internal.repo.persistent.pick_up_point_postgres import PickUpPointPostgres
+from backend.internal.repo.persistent.reservation_postgres import ReservationPostgres
 
-__all__ = ["GoodsPostgres", "UserPostgres", "OrderPostgres", "PickUpPointPostgres"]
+__all__ = [
+    "GoodsPostgres",
+    "UserPostgres",
+    "OrderPostgres",
+    "PickUpPointPostgres",
+    "ReservationPostgres",
+]
@@ -2,10 +2,37 @@
 Репозиторий для работы с товарами через PostgreSQL
 """
 
-from backend.pkg.postgres.postgres import PG
-from backend.internal.entity.good import Good
-from sqlalchemy import select, or_, and_, func
-from typing import List, Optional
+from backend.pkg.postgres.postgres import PG, column_values, ids_any
+from backend.pkg.cache.data_loader import DataLoader, scoped_loader
+from backend.internal.entity.good import Good, SEARCH_CONFIG
+from sqlalchemy import (
+    select,
+    insert,
+    update,
+    delete,
+    and_,
+    or_,
+    func,
+    tuple_,
+    cast,
+    literal,
+    union_all,
+    text,
+)
+from sqlalchemy.dialects.postgresql import REAL, REGCONFIG
+from typing import Dict, List, Optional, Tuple
+import re
+
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_SUGGESTIONS_LIMIT = 10
+# Минимальная длина строки, с которой имеет смысл искать по триграммам
+MIN_SUGGEST_LENGTH = 2
+# Порог похожести для оператора <% (по умолчанию в pg_trgm 0.6)
+SUGGEST_SIMILARITY_THRESHOLD = 0.4
+# Сколько кандидатов на одну подсказку выбирается из каждого поля
+SUGGEST_CANDIDATES_FACTOR = 20
+# Предельное время запроса поиска, чтобы он не занимал соединение пула
+SEARCH_STATEMENT_TIMEOUT_MS = 5000
 
 
 class GoodsPostgres:
@@ -13,18 +40,33 @@ class GoodsPostgres:
         self.pg = pg
 
     async def create(self, good: Good) -> Good:
-        """Создать товар"""
+        """Создать товар (INSERT ... RETURNING)"""
         async with self.pg.get_session() as session:
-            session.add(good)
+            result = await session.execute(
+                insert(Good).values(column_values(good)).returning(Good)
+            )
+            created = result.scalar_one()
             await session.commit()
-            await session.refresh(good)
-            return good
+            self._loader().prime(created.id, created)
+            return created
+
+    def _loader(self) -> DataLoader[int, Good]:
+        return scoped_loader((Good, self.pg), self.get_many)
 
     async def get(self, id: int) -> Optional[Good]:
-        """Получить товар по ID"""
+        """
+        Получить товар по ID. Вызовы в одной итерации event loop объединяются
+        в один запрос get_many, результат запоминается до конца запроса GUI
+        """
+        return await self._loader().load(id)
+
+    async def get_many(self, ids: List[int]) -> Dict[int, Good]:
+        """Получить товары по списку ID одним запросом (id = ANY(:ids))"""
+        if not ids:
+            return {}
         async with self.pg.get_session() as session:
-            result = await session.execute(select(Good).filter(Good.id == id))
-            return result.scalar_one_or_none()
+            result = await session.execute(select(Good).filter(ids_any(Good.id, ids)))
+            return {good.id: good for good in result.scalars()}
 
     async def get_all(self) -> List[Good]:
         """Получить все товары"""
@@ -39,55 +81,127 @@ class GoodsPostgres:
             return result.scalar_one_or_none()
 
     async def update(self, good: Good) -> Good:
-        """Обновить товар"""
+        """Обновить товар (UPDATE ... RETURNING)"""
         async with self.pg.get_session() as session:
-            result = await session.execute(select(Good).filter(Good.id == good.id))
+            result = await session.execute(
+                update(Good)
+                .filter(Good.id == good.id)
+                .values(
+                    article=good.article,
+                    name=good.name,
+                    unit_of_measurement=good.unit_of_measurement,
+                    price=good.price,
+                    count=good.count,
+                    provider=good.provider,
+                    manufacturer=good.manufacturer,
+                    category=good.category,
+                    discount=good.discount,
+                    description=good.description,
+                    image=good.image,
+                )
+                .returning(Good)
+            )
             db_good = result.scalar_one_or_none()
 
             if not db_good:
                 raise ValueError(f"Товар с ID {good.id} не найден")
 
-            db_good.article = good.article
-            db_good.name = good.name
-            db_good.unit_of_measurement = good.unit_of_measurement
-            db_good.price = good.price
-            db_good.count = good.count
-            db_good.provider = good.provider
-            db_good.manufacturer = good.manufacturer
-            db_good.category = good.category
-            db_good.discount = good.discount
-            db_good.description = good.description
-            db_good.image = good.image
-
             await session.commit()
-            await session.refresh(db_good)
+            self._loader().prime(db_good.id, db_good)
             return db_good
 
-    async def delete(self, id: int) -> bool:
-        """Удалить товар по ID"""
+    async def delete(self, id: int) -> Optional[Good]:
+        """Удалить товар по ID; возвращает удаленный товар или None"""
         async with self.pg.get_session() as session:
-            good = await self.get(id)
-            if good:
-                await session.delete(good)
-                await session.commit()
-                return True
-            return False
+            result = await session.execute(
+                delete(Good).filter(Good.id == id).returning(Good)
+            )
+            good = result.scalar_one_or_none()
+            await session.commit()
+            self._loader().clear(id)
+            return good
+
+    async def _limit_search_time(self, session) -> None:
+        """
+        Ограничить время запросов поиска до конца транзакции сессии. Внутри
+        единицы работы лимит не ставится: он действовал бы и на все ее
+        последующие запросы, в том числе на запись
+        """
+        if self.pg.in_unit_of_work():
+            return
+        await session.execute(
+            text("SELECT set_config('statement_timeout', :timeout, true)"),
+            {"timeout": str(SEARCH_STATEMENT_TIMEOUT_MS)},
+        )
 
     async def search(self, query: str) -> List[Good]:
-        """Поиск товаров по всем текстовым полям"""
+        """Полнотекстовый поиск товаров по всем текстовым полям с ранжированием"""
         async with self.pg.get_session() as session:
+            await self._limit_search_time(session)
             result = await session.execute(
-                select(Good).filter(
-                    (Good.name.ilike(f"%{query}%"))
-                    | (Good.article.ilike(f"%{query}%"))
-                    | (Good.description.ilike(f"%{query}%"))
-                    | (Good.category.ilike(f"%{query}%"))
-                    | (Good.manufacturer.ilike(f"%{query}%"))
-                    | (Good.provider.ilike(f"%{query}%"))
+                self._apply_filters(
+                    select(Good), search_query=query, order_by_rank=True
                 )
             )
             return list(result.scalars().all())
 
+    async def suggest(
+        self, query: str, limit: int = DEFAULT_SUGGESTIONS_LIMIT
+    ) -> List[str]:
+        """
+        Подсказки для строки поиска по названию, артикулу и производителю.
+        Сначала совпадения по префиксу, затем похожие (с опечатками) по pg_trgm
+        """
+        query = query.strip()
+        if len(query) < MIN_SUGGEST_LENGTH:
+            return []
+
+        # Из каждого поля берется ограниченное число кандидатов по префиксу
+        # и по похожести, чтобы стоимость не зависела от размера каталога
+        candidates = []
+        for column in (Good.name, Good.article, Good.manufacturer):
+            for condition in (
+                column.istartswith(query, autoescape=True),
+                literal(query).bool_op("<%")(column),
+            ):
+                found = (
+                    select(column.label("value"))
+                    .filter(condition)
+                    .limit(limit * SUGGEST_CANDIDATES_FACTOR)
+                    .subquery()
+                )
+                candidates.append(
+                    select(
+                        found.c.value,
+                        found.c.value.istartswith(query, autoescape=True).label(
+                            "is_prefix"
+                        ),
+                        func.word_similarity(query, found.c.value).label("score"),
+                    )
+                )
+        matches = union_all(*candidates).subquery()
+
+        async with self.pg.get_session() as session:
+            await self._limit_search_time(session)
+            await session.execute(
+                text(
+                    "SELECT set_config('pg_trgm.word_similarity_threshold', "
+                    ":threshold, true)"
+                ),
+                {"threshold": str(SUGGEST_SIMILARITY_THRESHOLD)},
+            )
+            result = await session.execute(
+                select(matches.c.value)
+                .group_by(matches.c.value)
+                .order_by(
+                    func.bool_or(matches.c.is_prefix).desc(),
+                    func.max(matches.c.score).desc(),
+                    matches.c.value,
+                )
+                .limit(limit)
+            )
+            return [row[0] for row in result.all()]
+
     async def filter_by_provider(self, provider: Optional[str] = None) -> List[Good]:
         """Фильтрация товаров по поставщику"""
         async with self.pg.get_session() as session:
@@ -99,31 +213,107 @@ class GoodsPostgres:
                 result = await session.execute(select(Good))
             return list(result.scalars().all())
 
-    async def get_all_providers(self) -> List[str]:
-        """Получить список всех поставщиков"""
+    async def _get_distinct(self, column) -> List[str]:
+        """
+        Различные непустые значения колонки по возрастанию. Значения
+        перебираются по индексу колонки рекурсивным запросом (каждое
+        следующее - один переход по B-дереву), а не чтением всей таблицы
+        """
+        values = (
+            select(column.label("value"))
+            .filter(column.isnot(None))
+            .order_by(column)
+            .limit(1)
+            .cte("distinct_values", recursive=True)
+        )
+        next_value = (
+            select(column)
+            .filter(column > values.c.value)
+            .order_by(column)
+            .limit(1)
+            .scalar_subquery()
+        )
+        values = values.union_all(select(next_value).filter(values.c.value.isnot(None)))
         async with self.pg.get_session() as session:
             result = await session.execute(
-                select(Good.provider).distinct().filter(Good.provider.isnot(None))
+                select(values.c.value).filter(values.c.value.isnot(None))
             )
-            return [row[0] for row in result.all() if row[0]]
+            return [value for value in result.scalars() if value]
+
+    async def get_all_providers(self) -> List[str]:
+        """Получить список всех поставщиков"""
+        return await self._get_distinct(Good.provider)
 
     async def get_all_categories(self) -> List[str]:
         """Получить список всех категорий"""
-        async with self.pg.get_session() as session:
-            result = await session.execute(
-                select(Good.category).distinct().filter(Good.category.isnot(None))
-            )
-            return [row[0] for row in result.all() if row[0]]
+        return await self._get_distinct(Good.category)
 
     async def get_all_manufacturers(self) -> List[str]:
         """Получить список всех производителей"""
-        async with self.pg.get_session() as session:
-            result = await session.execute(
-                select(Good.manufacturer)
-                .distinct()
-                .filter(Good.manufacturer.isnot(None))
+        return await self._get_distinct(Good.manufacturer)
+
+    def _parse_search_query(self, search_query: str):
+        """
+        Разобрать поисковую строку на полнотекстовый запрос (префиксный поиск
+        по каждому слову) и условия на категорию для слов "муж"/"жен"
+        """
+        words = search_query.strip().lower().split()
+
+        def get_gender_prefix(word: str) -> Optional[str]:
+            if word.startswith("муж"):
+                return "муж"
+            if word.startswith("жен"):
+                return "жен"
+            return None
+
+        lexemes = []
+        gender_conditions = []
+
+        for w in words:
+            prefix = get_gender_prefix(w)
+            if prefix:
+                gender_conditions.append(func.lower(Good.category).ilike(f"%{prefix}%"))
+            else:
+                lexemes.extend(re.findall(r"[^\W_]+", w))
+
+        ts_query = None
+        if lexemes:
+            ts_query = func.to_tsquery(
+                cast(SEARCH_CONFIG, REGCONFIG),
+                " & ".join(f"{lexeme}:*" for lexeme in lexemes),
             )
-            return [row[0] for row in result.all() if row[0]]
+        return ts_query, gender_conditions
+
+    @staticmethod
+    def _search_rank(ts_query):
+        """Ранг совпадения товара с полнотекстовым запросом"""
+        return func.ts_rank_cd(Good.search_vector, ts_query, type_=REAL)
+
+    def _apply_filters(
+        self,
+        query,
+        provider: Optional[str] = None,
+        search_query: Optional[str] = None,
+        order_by_rank: bool = False,
+    ):
+        """Применить к запросу фильтр по поставщику и поисковый запрос"""
+        if search_query and search_query.strip():
+            ts_query, gender_conditions = self._parse_search_query(search_query)
+
+            if ts_query is not None:
+                query = query.filter(Good.search_vector.bool_op("@@")(ts_query))
+                if order_by_rank:
+                    query = query.order_by(
+                        self._search_rank(ts_query).desc(), Good.id.asc()
+                    )
+
+            if gender_conditions:
+                query = query.filter(and_(*gender_conditions))
+
+        if provider:
+            query = query.filter(Good.provider == provider)
+
+        return query
 
     async def filter_and_sort(
         self,
@@ -132,52 +322,72 @@ class GoodsPostgres:
         search_query: Optional[str] = None,
     ) -> List[Good]:
         async with self.pg.get_session() as session:
-            query = select(Good)
-
             if search_query:
-                search_lower = search_query.strip().lower()
-                words = search_lower.split()
-
-                def is_gender_word(word: str) -> bool:
-                    return word.startswith("муж") or word.startswith("жен")
-
-                def get_gender_prefix(word: str) -> Optional[str]:
-                    if word.startswith("муж"):
-                        return "муж"
-                    if word.startswith("жен"):
-                        return "жен"
-                    return None
-
-                name_cat_conditions = []
-                gender_conditions = []
-
-                for w in words:
-                    if is_gender_word(w):
-                        prefix = get_gender_prefix(w)
-                        gender_conditions.append(
-                            func.lower(Good.category).ilike(f"%{prefix}%")
-                        )
-                    else:
-                        name_cat_conditions.append(
-                            or_(
-                                func.lower(Good.name).ilike(f"%{w}%"),
-                                func.lower(Good.category).ilike(f"%{w}%"),
-                            )
-                        )
+                await self._limit_search_time(session)
+            query = self._apply_filters(
+                select(Good), provider, search_query, order_by_rank=not sort_by_count
+            )
 
-                if name_cat_conditions:
-                    query = query.filter(and_(*name_cat_conditions))
+            if sort_by_count == "asc":
+                query = query.order_by(Good.count.asc(), Good.id.asc())
+            elif sort_by_count == "desc":
+                query = query.order_by(Good.count.desc(), Good.id.desc())
 
-                if gender_conditions:
-                    query = query.filter(and_(*gender_conditions))
+            result = await session.execute(query)
+            return list(result.scalars().all())
 
-            if provider:
-                query = query.filter(Good.provider == provider)
+    async def get_page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[Tuple[float, int]] = None,
+        provider: Optional[str] = None,
+        sort_by_count: Optional[str] = None,
+        search_query: Optional[str] = None,
+    ) -> List[Good]:
+        """
+        Получить страницу товаров с keyset-пагинацией.
+        after - курсор (count, id) последнего товара предыдущей страницы;
+        результаты поиска без сортировки идут по убыванию ранга совпадения,
+        и курсор для них - (search_rank, id)
+        """
+        rank = None
+        if search_query and search_query.strip() and not sort_by_count:
+            ts_query, _ = self._parse_search_query(search_query)
+            if ts_query is not None:
+                rank = self._search_rank(ts_query)
+
+        async with self.pg.get_session() as session:
+            if search_query:
+                await self._limit_search_time(session)
+            query = self._apply_filters(select(Good), provider, search_query)
 
             if sort_by_count == "asc":
+                if after:
+                    query = query.filter(tuple_(Good.count, Good.id) > tuple_(*after))
                 query = query.order_by(Good.count.asc(), Good.id.asc())
             elif sort_by_count == "desc":
+                if after:
+                    query = query.filter(tuple_(Good.count, Good.id) < tuple_(*after))
                 query = query.order_by(Good.count.desc(), Good.id.desc())
+            elif rank is not None:
+                if after:
+                    query = query.filter(
+                        or_(
+                            rank < after[0],
+                            and_(rank == after[0], Good.id > after[1]),
+                        )
+                    )
+                query = query.add_columns(rank).order_by(rank.desc(), Good.id.asc())
+            else:
+                if after:
+                    query = query.filter(Good.id > after[1])
+                query = query.order_by(Good.id.asc())
 
-            result = await session.execute(query)
-            return list(result.scalars().all())
+            result = await session.execute(query.limit(limit))
+            if rank is None:
+                return list(result.scalars().all())
+            goods = []
+            for good, search_rank in result.all():
+                good.search_rank = search_rank
+                goods.append(good)
+            return goods
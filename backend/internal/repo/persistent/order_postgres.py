@@ -2,11 +2,29 @@
 Репозиторий для работы с заказами через PostgreSQL
 """
 
-from backend.pkg.postgres.postgres import PG
+from backend.pkg.postgres.postgres import PG, column_values, ids_any
+from backend.pkg.cache.data_loader import DataLoader, forget, scoped_loader
 from backend.internal.entity.order import Order
+from backend.internal.entity.good import Good
 from backend.internal.entity.order_item import OrderItem
-from sqlalchemy import select, delete
-from typing import List
+from backend.internal.entity.order_summary import OrderSummary
+from backend.internal.entity.stock_reservation import StockReservation
+from backend.internal.repo.persistent.reservation_postgres import active_reserved
+from sqlalchemy import (
+    select,
+    delete,
+    insert,
+    update,
+    func,
+    bindparam,
+    exists,
+    literal,
+    all_,
+    Integer,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Dict, List, Optional
 
 
 class OrderPostgres:
@@ -14,46 +32,145 @@ class OrderPostgres:
         self.pg = pg
 
     async def create(self, order: Order) -> Order:
-        """Создать заказ"""
+        """Создать заказ (INSERT ... RETURNING)"""
         async with self.pg.get_session() as session:
-            session.add(order)
+            result = await session.execute(
+                insert(Order).values(column_values(order)).returning(Order)
+            )
+            created = result.scalar_one()
             await session.commit()
-            await session.refresh(order)
+            self._loader().prime(created.id, created)
+            return created
+
+    async def create_with_items(
+        self,
+        order: Order,
+        items: Dict[int, int],
+        decrement_stock: bool = True,
+        cart_id: Optional[str] = None,
+    ) -> Order:
+        """
+        Создать заказ с товарами в одной транзакции. items - количество
+        по ID товара. Строки товаров блокируются (SELECT ... FOR UPDATE)
+        в порядке ID, поэтому параллельные заказы не взаимоблокируются,
+        а остаток проверяется и списывается под блокировкой.
+        Резервы других корзин уменьшают доступный остаток, резервы
+        корзины cart_id переходят в заказ
+        """
+        goods_ids = sorted(items)
+        goods_table = Good.__table__
+        async with self.pg.get_session() as session:
+            async with session.begin():
+                result = await session.execute(
+                    select(
+                        Good.id,
+                        Good.name,
+                        Good.count,
+                        active_reserved(Good.id, cart_id).label("reserved"),
+                    )
+                    .filter(Good.id.in_(goods_ids))
+                    .order_by(Good.id)
+                    .with_for_update(of=Good)
+                )
+                stock = {row.id: row for row in result}
+
+                for goods_id in goods_ids:
+                    good = stock.get(goods_id)
+                    if good is None:
+                        raise ValueError(f"Товар с ID {goods_id} не найден")
+                    quantity = items[goods_id]
+                    available = good.count - good.reserved
+                    if decrement_stock and available < quantity:
+                        raise ValueError(
+                            f"Недостаточно товара '{good.name}'. В наличии: {max(available, 0)}, запрошено: {quantity}"
+                        )
+
+                result = await session.execute(
+                    insert(Order).values(column_values(order)).returning(Order)
+                )
+                order = result.scalar_one()
+
+                await session.execute(
+                    insert(OrderItem),
+                    [
+                        {
+                            "order_id": order.id,
+                            "goods_id": goods_id,
+                            "quantity": items[goods_id],
+                        }
+                        for goods_id in goods_ids
+                    ],
+                )
+                if decrement_stock:
+                    await session.execute(
+                        update(goods_table)
+                        .where(goods_table.c.id == bindparam("goods_id"))
+                        .values(count=goods_table.c.count - bindparam("quantity")),
+                        [
+                            {"goods_id": goods_id, "quantity": items[goods_id]}
+                            for goods_id in goods_ids
+                        ],
+                    )
+                if cart_id is not None:
+                    await session.execute(
+                        delete(StockReservation).filter(
+                            StockReservation.cart_id == cart_id
+                        )
+                    )
+            self._loader().prime(order.id, order)
+            if decrement_stock:
+                forget((Good, self.pg), goods_ids)
             return order
 
-    async def get(self, id: int) -> Order | None:
-        """Получить заказ по ID"""
+    def _loader(self) -> DataLoader[int, Order]:
+        return scoped_loader((Order, self.pg), self.get_many)
+
+    async def get(self, id: int) -> Optional[Order]:
+        """
+        Получить заказ по ID. Вызовы в одной итерации event loop
+        объединяются в один запрос get_many
+        """
+        return await self._loader().load(id)
+
+    async def get_many(self, ids: List[int]) -> Dict[int, Order]:
+        """Получить заказы по списку ID одним запросом (id = ANY(:ids))"""
+        if not ids:
+            return {}
         async with self.pg.get_session() as session:
-            result = await session.execute(select(Order).filter(Order.id == id))
-            return result.scalar_one_or_none()
+            result = await session.execute(select(Order).filter(ids_any(Order.id, ids)))
+            return {row.id: row for row in result.scalars()}
 
     async def update(self, order: Order) -> Order:
-        """Обновить заказ"""
+        """
+        Обновить заказ (UPDATE ... RETURNING). Незаданные (None) поля
+        не изменяются, кроме даты доставки
+        """
+        values = {"delivered_at": order.delivered_at}
+        for field in (
+            "status",
+            "created_at",
+            "recipient_code",
+            "user_id",
+            "pick_up_point_id",
+        ):
+            value = getattr(order, field)
+            if value is not None:
+                values[field] = value
+
         async with self.pg.get_session() as session:
-            result = await session.execute(select(Order).filter(Order.id == order.id))
+            result = await session.execute(
+                update(Order)
+                .filter(Order.id == order.id)
+                .values(values)
+                .returning(Order)
+            )
             db_order = result.scalar_one_or_none()
 
             if not db_order:
                 raise ValueError(f"Заказ с ID {order.id} не найден")
 
-            if hasattr(order, "status") and order.status is not None:
-                db_order.status = order.status
-            if hasattr(order, "created_at") and order.created_at is not None:
-                db_order.created_at = order.created_at
-            if hasattr(order, "delivered_at"):
-                db_order.delivered_at = order.delivered_at
-            if hasattr(order, "recipient_code") and order.recipient_code is not None:
-                db_order.recipient_code = order.recipient_code
-            if hasattr(order, "user_id") and order.user_id is not None:
-                db_order.user_id = order.user_id
-            if (
-                hasattr(order, "pick_up_point_id")
-                and order.pick_up_point_id is not None
-            ):
-                db_order.pick_up_point_id = order.pick_up_point_id
-
             await session.commit()
-            await session.refresh(db_order)
+            self._loader().prime(db_order.id, db_order)
             return db_order
 
     async def get_all(self) -> List[Order]:
@@ -70,23 +187,23 @@ class OrderPostgres:
             )
             return list(result.scalars().all())
 
-    async def delete(self, id: int) -> bool:
-        """Удалить заказ по ID"""
+    async def delete(self, id: int) -> Optional[Order]:
+        """Удалить заказ по ID; возвращает удаленный заказ или None"""
         async with self.pg.get_session() as session:
-            order = await self.get(id)
-            if order:
-                await session.delete(order)
-                await session.commit()
-                return True
-            return False
+            result = await session.execute(
+                delete(Order).filter(Order.id == id).returning(Order)
+            )
+            order = result.scalar_one_or_none()
+            await session.commit()
+            self._loader().clear(id)
+            return order
 
     async def is_good_in_orders(self, goods_id: int) -> bool:
         """Проверить, используется ли товар в каких-либо заказах"""
         async with self.pg.get_session() as session:
-            result = await session.execute(
-                select(OrderItem).filter(OrderItem.goods_id == goods_id)
+            return await session.scalar(
+                select(exists().where(OrderItem.goods_id == goods_id))
             )
-            return result.scalar_one_or_none() is not None
 
     async def get_order_items(self, order_id: int) -> List[OrderItem]:
         """Получить все товары в заказе"""
@@ -96,13 +213,96 @@ class OrderPostgres:
             )
             return list(result.scalars().all())
 
+    async def get_order_summaries(
+        self, order_ids: List[int]
+    ) -> Dict[int, OrderSummary]:
+        """
+        Сумма (с учетом скидок), количество единиц товара и артикулы
+        для набора заказов одним агрегирующим запросом
+        """
+        if not order_ids:
+            return {}
+        price = Good.price * (1 - func.coalesce(Good.discount, 0) / 100)
+        query = (
+            select(
+                OrderItem.order_id,
+                func.sum(price * OrderItem.quantity).label("total"),
+                func.sum(OrderItem.quantity).label("items_count"),
+                func.array_agg(aggregate_order_by(Good.article, OrderItem.id)).label(
+                    "articles"
+                ),
+            )
+            .join(Good, Good.id == OrderItem.goods_id)
+            .filter(OrderItem.order_id.in_(order_ids))
+            .group_by(OrderItem.order_id)
+        )
+        async with self.pg.get_session() as session:
+            result = await session.execute(query)
+            return {
+                row.order_id: OrderSummary(
+                    order_id=row.order_id,
+                    total=float(row.total),
+                    items_count=int(row.items_count),
+                    articles=list(row.articles),
+                )
+                for row in result
+            }
+
     async def add_order_item(self, order_item: OrderItem) -> OrderItem:
         """Добавить товар в заказ"""
         async with self.pg.get_session() as session:
-            session.add(order_item)
+            result = await session.execute(
+                insert(OrderItem).values(column_values(order_item)).returning(OrderItem)
+            )
+            created = result.scalar_one()
+            await session.commit()
+            return created
+
+    async def replace_order_items(self, order_id: int, items: Dict[int, int]) -> int:
+        """
+        Привести состав заказа к items (количество по ID товара) одним
+        запросом: строки товаров, которых нет в items, удаляются, новые
+        добавляются, у остальных меняется количество, если оно другое
+        (по ключу order_id, goods_id). Возвращает число измененных строк
+        """
+        goods_ids = sorted(items)
+        goods_array = literal(goods_ids, ARRAY(Integer))
+        table = OrderItem.__table__
+
+        deleted = (
+            delete(table)
+            .where(table.c.order_id == order_id, table.c.goods_id != all_(goods_array))
+            .returning(table.c.id)
+            .cte("deleted")
+        )
+        wanted = select(
+            literal(order_id, Integer),
+            func.unnest(goods_array),
+            func.unnest(
+                literal([items[goods_id] for goods_id in goods_ids], ARRAY(Integer))
+            ),
+        )
+        upsert = pg_insert(table).from_select(
+            ["order_id", "goods_id", "quantity"], wanted
+        )
+        upserted = (
+            upsert.on_conflict_do_update(
+                index_elements=["order_id", "goods_id"],
+                set_={"quantity": upsert.excluded.quantity},
+                where=table.c.quantity != upsert.excluded.quantity,
+            )
+            .returning(table.c.id)
+            .cte("upserted")
+        )
+        query = select(
+            select(func.count()).select_from(deleted).scalar_subquery()
+            + select(func.count()).select_from(upserted).scalar_subquery()
+        )
+
+        async with self.pg.get_session() as session:
+            changed = await session.scalar(query)
             await session.commit()
-            await session.refresh(order_item)
-            return order_item
+            return changed
 
     async def delete_order_items(self, order_id: int) -> None:
         """Удалить все товары из заказа"""
@@ -2,10 +2,11 @@
 Репозиторий для работы с пунктами выдачи через PostgreSQL
 """
 
-from backend.pkg.postgres.postgres import PG
+from backend.pkg.postgres.postgres import PG, column_values, ids_any
+from backend.pkg.cache.data_loader import DataLoader, scoped_loader
 from backend.internal.entity.order_pick_up_point import OrderPickUpPoint
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import select, insert, update, delete
+from typing import Dict, List, Optional
 
 
 class PickUpPointPostgres:
@@ -13,20 +14,37 @@ class PickUpPointPostgres:
         self.pg = pg
 
     async def create(self, point: OrderPickUpPoint) -> OrderPickUpPoint:
-        """Создать пункт выдачи"""
+        """Создать пункт выдачи (INSERT ... RETURNING)"""
         async with self.pg.get_session() as session:
-            session.add(point)
+            result = await session.execute(
+                insert(OrderPickUpPoint)
+                .values(column_values(point))
+                .returning(OrderPickUpPoint)
+            )
+            created = result.scalar_one()
             await session.commit()
-            await session.refresh(point)
-            return point
+            self._loader().prime(created.id, created)
+            return created
+
+    def _loader(self) -> DataLoader[int, OrderPickUpPoint]:
+        return scoped_loader((OrderPickUpPoint, self.pg), self.get_many)
 
     async def get(self, id: int) -> Optional[OrderPickUpPoint]:
-        """Получить пункт выдачи по ID"""
+        """
+        Получить пункт выдачи по ID. Вызовы в одной итерации event loop
+        объединяются в один запрос get_many
+        """
+        return await self._loader().load(id)
+
+    async def get_many(self, ids: List[int]) -> Dict[int, OrderPickUpPoint]:
+        """Получить пункты выдачи по списку ID одним запросом (id = ANY(:ids))"""
+        if not ids:
+            return {}
         async with self.pg.get_session() as session:
             result = await session.execute(
-                select(OrderPickUpPoint).filter(OrderPickUpPoint.id == id)
+                select(OrderPickUpPoint).filter(ids_any(OrderPickUpPoint.id, ids))
             )
-            return result.scalar_one_or_none()
+            return {row.id: row for row in result.scalars()}
 
     async def get_all(self) -> List[OrderPickUpPoint]:
         """Получить все пункты выдачи"""
@@ -35,19 +53,32 @@ class PickUpPointPostgres:
             return list(result.scalars().all())
 
     async def update(self, point: OrderPickUpPoint) -> OrderPickUpPoint:
-        """Обновить пункт выдачи"""
+        """Обновить пункт выдачи (UPDATE ... RETURNING)"""
         async with self.pg.get_session() as session:
-            await session.merge(point)
+            result = await session.execute(
+                update(OrderPickUpPoint)
+                .filter(OrderPickUpPoint.id == point.id)
+                .values(column_values(point))
+                .returning(OrderPickUpPoint)
+            )
+            db_point = result.scalar_one_or_none()
+
+            if not db_point:
+                raise ValueError(f"Пункт выдачи с ID {point.id} не найден")
+
             await session.commit()
-            await session.refresh(point)
-            return point
+            self._loader().prime(db_point.id, db_point)
+            return db_point
 
     async def delete(self, id: int) -> bool:
         """Удалить пункт выдачи по ID"""
         async with self.pg.get_session() as session:
-            point = await self.get(id)
-            if point:
-                await session.delete(point)
-                await session.commit()
-                return True
-            return False
+            result = await session.execute(
+                delete(OrderPickUpPoint)
+                .filter(OrderPickUpPoint.id == id)
+                .returning(OrderPickUpPoint.id)
+            )
+            deleted = result.scalar_one_or_none() is not None
+            await session.commit()
+            self._loader().clear(id)
+            return deleted
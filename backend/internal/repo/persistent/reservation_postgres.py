@@ -0,0 +1,138 @@
+"""
+Репозиторий для резервов товара в корзинах через PostgreSQL
+"""
+
+from backend.pkg.postgres.postgres import PG
+from backend.internal.entity.good import Good
+from backend.internal.entity.stock_reservation import StockReservation
+from sqlalchemy import select, delete, update, func
+from sqlalchemy.dialects.postgresql import insert
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+
+def active_reserved(goods_id, exclude_cart_id: Optional[str] = None):
+    """
+    Сумма действующих резервов товара (скалярный подзапрос по индексу
+    goods_id, expires_at). Резервы корзины exclude_cart_id не учитываются
+    """
+    query = select(func.coalesce(func.sum(StockReservation.quantity), 0)).filter(
+        StockReservation.goods_id == goods_id,
+        StockReservation.expires_at > func.now(),
+    )
+    if exclude_cart_id is not None:
+        query = query.filter(StockReservation.cart_id != exclude_cart_id)
+    return query.scalar_subquery()
+
+
+class ReservationPostgres:
+    def __init__(self, pg: PG):
+        self.pg = pg
+
+    async def reserve(
+        self, cart_id: str, goods_id: int, quantity: int, ttl: timedelta
+    ) -> StockReservation:
+        """
+        Зарезервировать quantity единиц товара за корзиной (количество
+        задается целиком, а не добавляется). Строка товара блокируется,
+        поэтому параллельные резервы одного товара не превышают остаток.
+        Срок всех резервов корзины продлевается на ttl
+        """
+        async with self.pg.get_session() as session:
+            async with session.begin():
+                result = await session.execute(
+                    select(Good.name, Good.count)
+                    .filter(Good.id == goods_id)
+                    .with_for_update()
+                )
+                good = result.one_or_none()
+                if good is None:
+                    raise ValueError(f"Товар с ID {goods_id} не найден")
+
+                reserved = await session.scalar(
+                    select(active_reserved(goods_id, cart_id))
+                )
+                available = good.count - reserved
+                if quantity > available:
+                    raise ValueError(
+                        f"Недостаточно товара '{good.name}'. Доступно: {max(available, 0)}, запрошено: {quantity}"
+                    )
+
+                expires_at = func.now() + ttl
+                await session.execute(
+                    update(StockReservation)
+                    .filter(StockReservation.cart_id == cart_id)
+                    .values(expires_at=expires_at)
+                )
+                result = await session.execute(
+                    insert(StockReservation)
+                    .values(
+                        cart_id=cart_id,
+                        goods_id=goods_id,
+                        quantity=quantity,
+                        expires_at=expires_at,
+                    )
+                    .on_conflict_do_update(
+                        index_elements=["cart_id", "goods_id"],
+                        set_={"quantity": quantity, "expires_at": expires_at},
+                    )
+                    .returning(StockReservation)
+                )
+                reservation = result.scalar_one()
+            return reservation
+
+    async def extend(self, cart_id: str, ttl: timedelta) -> List[int]:
+        """
+        Продлить действующие резервы корзины на ttl; возвращает ID товаров,
+        резерв которых продлен (истекшие резервы не восстанавливаются)
+        """
+        async with self.pg.get_session() as session:
+            result = await session.execute(
+                update(StockReservation)
+                .filter(
+                    StockReservation.cart_id == cart_id,
+                    StockReservation.expires_at > func.now(),
+                )
+                .values(expires_at=func.now() + ttl)
+                .returning(StockReservation.goods_id)
+            )
+            goods_ids = list(result.scalars())
+            await session.commit()
+            return goods_ids
+
+    async def release(self, cart_id: str, goods_id: Optional[int] = None) -> None:
+        """Снять резерв товара корзины (или всей корзины, если goods_id не задан)"""
+        query = delete(StockReservation).filter(StockReservation.cart_id == cart_id)
+        if goods_id is not None:
+            query = query.filter(StockReservation.goods_id == goods_id)
+        async with self.pg.get_session() as session:
+            await session.execute(query)
+            await session.commit()
+
+    async def get_available(
+        self, goods_ids: List[int], exclude_cart_id: Optional[str] = None
+    ) -> Dict[int, int]:
+        """
+        Доступный остаток товаров: количество на складе за вычетом
+        действующих резервов других корзин
+        """
+        if not goods_ids:
+            return {}
+        async with self.pg.get_session() as session:
+            result = await session.execute(
+                select(
+                    Good.id, Good.count - active_reserved(Good.id, exclude_cart_id)
+                ).filter(Good.id.in_(goods_ids))
+            )
+            return dict(result.all())
+
+    async def delete_expired(self) -> int:
+        """Удалить просроченные резервы; возвращает число удаленных"""
+        async with self.pg.get_session() as session:
+            result = await session.execute(
+                delete(StockReservation).filter(
+                    StockReservation.expires_at <= func.now()
+                )
+            )
+            await session.commit()
+            return result.rowcount
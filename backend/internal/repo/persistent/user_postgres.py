@@ -2,10 +2,11 @@
 Репозиторий для работы с пользователями через PostgreSQL
 """
 
-from backend.pkg.postgres.postgres import PG
+from backend.pkg.postgres.postgres import PG, column_values, ids_any
+from backend.pkg.cache.data_loader import DataLoader, scoped_loader
 from backend.internal.entity.user import User
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import select, insert, update, delete
+from typing import Dict, List, Optional
 
 
 class UserPostgres:
@@ -13,18 +14,33 @@ class UserPostgres:
         self.pg = pg
 
     async def create(self, user: User) -> User:
-        """Создать пользователя"""
+        """Создать пользователя (INSERT ... RETURNING)"""
         async with self.pg.get_session() as session:
-            session.add(user)
+            result = await session.execute(
+                insert(User).values(column_values(user)).returning(User)
+            )
+            created = result.scalar_one()
             await session.commit()
-            await session.refresh(user)
-            return user
+            self._loader().prime(created.id, created)
+            return created
+
+    def _loader(self) -> DataLoader[int, User]:
+        return scoped_loader((User, self.pg), self.get_many)
 
     async def get(self, id: int) -> Optional[User]:
-        """Получить пользователя по ID"""
+        """
+        Получить пользователя по ID. Вызовы в одной итерации event loop
+        объединяются в один запрос get_many
+        """
+        return await self._loader().load(id)
+
+    async def get_many(self, ids: List[int]) -> Dict[int, User]:
+        """Получить пользователей по списку ID одним запросом (id = ANY(:ids))"""
+        if not ids:
+            return {}
         async with self.pg.get_session() as session:
-            result = await session.execute(select(User).filter(User.id == id))
-            return result.scalar_one_or_none()
+            result = await session.execute(select(User).filter(ids_any(User.id, ids)))
+            return {row.id: row for row in result.scalars()}
 
     async def get_by_login(self, login: str) -> Optional[User]:
         """Получить пользователя по логину"""
@@ -47,22 +63,33 @@ class UserPostgres:
             return list(result.scalars().all())
 
     async def update(self, user: User) -> User:
-        """Обновить пользователя"""
+        """Обновить пользователя (UPDATE ... RETURNING)"""
         async with self.pg.get_session() as session:
-            await session.merge(user)
+            result = await session.execute(
+                update(User)
+                .filter(User.id == user.id)
+                .values(column_values(user))
+                .returning(User)
+            )
+            db_user = result.scalar_one_or_none()
+
+            if not db_user:
+                raise ValueError(f"Пользователь с ID {user.id} не найден")
+
             await session.commit()
-            await session.refresh(user)
-            return user
+            self._loader().prime(db_user.id, db_user)
+            return db_user
 
     async def delete(self, id: int) -> bool:
         """Удалить пользователя по ID"""
         async with self.pg.get_session() as session:
-            user = await self.get(id)
-            if user:
-                await session.delete(user)
-                await session.commit()
-                return True
-            return False
+            result = await session.execute(
+                delete(User).filter(User.id == id).returning(User.id)
+            )
+            deleted = result.scalar_one_or_none() is not None
+            await session.commit()
+            self._loader().clear(id)
+            return deleted
 
     async def verify_password(self, user: User, password: str) -> bool:
         """Проверить пароль пользователя"""
@@ -45,13 +45,13 @@ class AuthUseCase:
         if not is_valid:
             raise ValueError(error_msg)
 
-        existing_user = await self.user_repo.get_by_login(login)
-        if existing_user:
-            raise ValueError(f"Пользователь с логином '{login}' уже существует")
-
         user = User(role=role, full_name=full_name, login=login, password=password)
 
-        return await self.user_repo.create(user)
+        async with self.user_repo.pg.unit_of_work():
+            existing_user = await self.user_repo.get_by_login(login)
+            if existing_user:
+                raise ValueError(f"Пользователь с логином '{login}' уже существует")
+            return await self.user_repo.create(user)
 
     async def get_all_users(self) -> List[User]:
         """Получить всех пользователей"""
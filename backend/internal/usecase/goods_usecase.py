@@ -2,21 +2,43 @@
 Use case для работы с товарами
 """
 
-from backend.internal.repo.persistent.goods_postgres import GoodsPostgres
+from backend.internal.repo.persistent.goods_postgres import (
+    GoodsPostgres,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_SUGGESTIONS_LIMIT,
+)
 from backend.internal.repo.persistent.order_postgres import OrderPostgres
 from backend.internal.entity.good import Good
+from backend.pkg.cache.ttl_cache import TTLCache
 from backend.internal.entity.user import User
 from backend.internal.usecase.authorization_usecase import (
     AuthorizationUseCase,
     PermissionError,
 )
-from typing import List, Optional
+from typing import List, Optional, Tuple
+
+
+CACHE_KEY_PROVIDERS = "goods:providers"
+CACHE_KEY_CATEGORIES = "goods:categories"
+CACHE_KEY_MANUFACTURERS = "goods:manufacturers"
 
 
 class GoodsUseCase:
-    def __init__(self, goods_repo: GoodsPostgres, order_repo: OrderPostgres = None):
+    def __init__(
+        self,
+        goods_repo: GoodsPostgres,
+        order_repo: OrderPostgres = None,
+        cache: Optional[TTLCache] = None,
+    ):
         self.goods_repo = goods_repo
         self.order_repo = order_repo
+        self.cache = cache or TTLCache()
+
+    def invalidate_reference_data(self) -> None:
+        """Сбросить кэш справочников поставщиков, категорий и производителей"""
+        self.cache.invalidate(
+            CACHE_KEY_PROVIDERS, CACHE_KEY_CATEGORIES, CACHE_KEY_MANUFACTURERS
+        )
 
     async def get_all(self, user: Optional[User] = None) -> List[Good]:
         """Получить все товары"""
@@ -40,6 +62,21 @@ class GoodsUseCase:
             return await self.get_all()
         return await self.goods_repo.search(query)
 
+    async def suggest(
+        self,
+        query: str,
+        limit: int = DEFAULT_SUGGESTIONS_LIMIT,
+        user: Optional[User] = None,
+    ) -> List[str]:
+        """Подсказки для строки поиска товаров"""
+        if not AuthorizationUseCase.can_search_filter_sort_goods(user):
+            raise PermissionError(
+                "Только менеджер или администратор может выполнять поиск товаров"
+            )
+        if not query or not query.strip():
+            return []
+        return await self.goods_repo.suggest(query, limit)
+
     async def create(
         self,
         article: str,
@@ -69,10 +106,6 @@ class GoodsUseCase:
         if count < 0:
             raise ValueError("Количество товара не может быть отрицательным")
 
-        existing = await self.goods_repo.get_by_article(article)
-        if existing:
-            raise ValueError(f"Товар с артикулом '{article}' уже существует")
-
         good = Good(
             article=article,
             name=name,
@@ -87,7 +120,13 @@ class GoodsUseCase:
             image=image,
         )
 
-        return await self.goods_repo.create(good)
+        async with self.goods_repo.pg.unit_of_work():
+            existing = await self.goods_repo.get_by_article(article)
+            if existing:
+                raise ValueError(f"Товар с артикулом '{article}' уже существует")
+            created_good = await self.goods_repo.create(good)
+        self.invalidate_reference_data()
+        return created_good
 
     async def update(self, good: Good, user: Optional[User] = None) -> Good:
         """Обновить товар"""
@@ -104,7 +143,9 @@ class GoodsUseCase:
         if good.count < 0:
             raise ValueError("Количество товара не может быть отрицательным")
 
-        return await self.goods_repo.update(good)
+        updated_good = await self.goods_repo.update(good)
+        self.invalidate_reference_data()
+        return updated_good
 
     async def update_good_data(
         self,
@@ -125,54 +166,71 @@ class GoodsUseCase:
         """Обновить данные товара по ID"""
         AuthorizationUseCase.require_admin(user, "редактировать товары")
 
-        good = await self.goods_repo.get(good_id)
-        if not good:
-            raise ValueError(f"Товар с ID {good_id} не найден")
-
-        good.article = article
-        good.name = name
-        good.unit_of_measurement = unit_of_measurement
-        good.price = price
-        good.provider = provider
-        good.manufacturer = manufacturer
-        good.category = category
-        good.discount = discount
-        good.count = count
-        good.description = description
-        if image is not None:
-            good.image = image
-
-        return await self.update(good, user)
-
-    async def delete(self, id: int, user: Optional[User] = None) -> bool:
-        """Удалить товар"""
+        async with self.goods_repo.pg.unit_of_work():
+            good = await self.goods_repo.get(good_id)
+            if not good:
+                raise ValueError(f"Товар с ID {good_id} не найден")
+
+            good.article = article
+            good.name = name
+            good.unit_of_measurement = unit_of_measurement
+            good.price = price
+            good.provider = provider
+            good.manufacturer = manufacturer
+            good.category = category
+            good.discount = discount
+            good.count = count
+            good.description = description
+            if image is not None:
+                good.image = image
+
+            return await self.update(good, user)
+
+    async def delete(self, id: int, user: Optional[User] = None) -> Optional[Good]:
+        """Удалить товар; возвращает удаленный товар или None, если его нет"""
         AuthorizationUseCase.require_admin(user, "удалять товары")
-        if self.order_repo:
-            is_in_orders = await self.order_repo.is_good_in_orders(id)
-            if is_in_orders:
-                raise ValueError("Товар, который присутствует в заказе, удалить нельзя")
-        return await self.goods_repo.delete(id)
+        async with self.goods_repo.pg.unit_of_work():
+            if self.order_repo:
+                is_in_orders = await self.order_repo.is_good_in_orders(id)
+                if is_in_orders:
+                    raise ValueError(
+                        "Товар, который присутствует в заказе, удалить нельзя"
+                    )
+            deleted = await self.goods_repo.delete(id)
+        if deleted:
+            self.invalidate_reference_data()
+        return deleted
 
     async def update_count(self, id: int, new_count: int) -> Optional[Good]:
         """Обновить количество товара"""
-        good = await self.goods_repo.get(id)
-        if not good:
-            return None
+        async with self.goods_repo.pg.unit_of_work():
+            good = await self.goods_repo.get(id)
+            if not good:
+                return None
 
-        good.count = new_count
-        return await self.goods_repo.update(good)
+            good.count = new_count
+            return await self.goods_repo.update(good)
 
     async def get_all_providers(self) -> List[str]:
         """Получить список всех поставщиков"""
-        return await self.goods_repo.get_all_providers()
+        providers = await self.cache.get_or_load(
+            CACHE_KEY_PROVIDERS, self.goods_repo.get_all_providers
+        )
+        return list(providers)
 
     async def get_all_categories(self) -> List[str]:
         """Получить список всех категорий"""
-        return await self.goods_repo.get_all_categories()
+        categories = await self.cache.get_or_load(
+            CACHE_KEY_CATEGORIES, self.goods_repo.get_all_categories
+        )
+        return list(categories)
 
     async def get_all_manufacturers(self) -> List[str]:
         """Получить список всех производителей"""
-        return await self.goods_repo.get_all_manufacturers()
+        manufacturers = await self.cache.get_or_load(
+            CACHE_KEY_MANUFACTURERS, self.goods_repo.get_all_manufacturers
+        )
+        return list(manufacturers)
 
     def calculate_price_with_discount(
         self, price: float, discount: Optional[float] = None
@@ -197,3 +255,26 @@ class GoodsUseCase:
         return await self.goods_repo.filter_and_sort(
             provider, sort_by_count, search_query
         )
+
+    async def get_page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[Tuple[float, int]] = None,
+        provider: Optional[str] = None,
+        sort_by_count: Optional[str] = None,
+        search_query: Optional[str] = None,
+        user: Optional[User] = None,
+    ) -> List[Good]:
+        """Получить страницу товаров с учетом фильтров (keyset-пагинация)"""
+        has_filters = bool(
+            provider or sort_by_count or (search_query and search_query.strip())
+        )
+        if has_filters and not AuthorizationUseCase.can_search_filter_sort_goods(user):
+            raise PermissionError(
+                "Только менеджер или администратор может фильтровать и сортировать товары"
+            )
+        if limit <= 0:
+            raise ValueError("Размер страницы должен быть больше 0")
+        return await self.goods_repo.get_page(
+            limit, after, provider, sort_by_count, search_query
+        )
@@ -5,16 +5,29 @@ Use case для работы с заказами
 from backend.internal.repo.persistent.order_postgres import OrderPostgres
 from backend.internal.repo.persistent.goods_postgres import GoodsPostgres
 from backend.internal.repo.persistent.pick_up_point_postgres import PickUpPointPostgres
+from backend.internal.repo.persistent.reservation_postgres import ReservationPostgres
 from backend.internal.entity.order import Order
-from backend.internal.entity.order_item import OrderItem
 from backend.internal.entity.user import User
 from backend.internal.entity.order_pick_up_point import OrderPickUpPoint
+from backend.internal.entity.order_summary import OrderSummary
+from backend.internal.entity.stock_reservation import StockReservation
+from backend.pkg.cache.ttl_cache import TTLCache
 from backend.internal.usecase.authorization_usecase import (
     AuthorizationUseCase,
     PermissionError,
 )
 from typing import List, Optional, Dict
-from datetime import datetime
+from datetime import datetime, timedelta
+import asyncio
+
+
+CACHE_KEY_PICK_UP_POINTS = "orders:pick_up_points"
+# Сколько держится резерв корзины после последнего изменения
+RESERVATION_TTL = timedelta(minutes=15)
+# Период продления резервов открытой корзины (с запасом до истечения TTL)
+RESERVATION_REFRESH_INTERVAL = RESERVATION_TTL / 3
+# Период удаления просроченных резервов
+RESERVATION_SWEEP_INTERVAL = 60
 
 
 class OrdersUseCase:
@@ -23,10 +36,14 @@ class OrdersUseCase:
         order_repo: OrderPostgres,
         goods_repo: GoodsPostgres,
         pick_up_repo: Optional[PickUpPointPostgres] = None,
+        cache: Optional[TTLCache] = None,
+        reservation_repo: Optional[ReservationPostgres] = None,
     ):
         self.order_repo = order_repo
         self.goods_repo = goods_repo
         self.pick_up_repo = pick_up_repo
+        self.cache = cache or TTLCache()
+        self.reservation_repo = reservation_repo
 
     async def get_all(self, user: Optional[User] = None) -> List[Order]:
         """Получить все заказы"""
@@ -62,8 +79,9 @@ class OrdersUseCase:
         recipient_code: Optional[str] = None,
         items: List[Dict] = None,
         user: Optional[User] = None,
+        cart_id: Optional[str] = None,
     ) -> Order:
-        """Создать заказ с товарами"""
+        """Создать заказ с товарами; резервы корзины cart_id переходят в заказ"""
         if user:
             if not AuthorizationUseCase.can_create_order(user):
                 raise PermissionError(
@@ -73,22 +91,6 @@ class OrdersUseCase:
         if not items:
             raise ValueError("Заказ должен содержать хотя бы один товар")
 
-        for item in items:
-            goods_id = item["goods_id"]
-            quantity = item["quantity"]
-
-            if quantity <= 0:
-                raise ValueError("Количество товара должно быть больше 0")
-
-            good = await self.goods_repo.get(goods_id)
-            if not good:
-                raise ValueError(f"Товар с ID {goods_id} не найден")
-
-            if good.count < quantity:
-                raise ValueError(
-                    f"Недостаточно товара '{good.name}'. В наличии: {good.count}, запрошено: {quantity}"
-                )
-
         order = Order(
             user_id=user.id if user else None,
             pick_up_point_id=pick_up_point_id,
@@ -96,17 +98,9 @@ class OrdersUseCase:
             status="новый",
         )
 
-        created_order = await self.order_repo.create(order)
-
-        for item in items:
-            order_item = OrderItem(
-                order_id=created_order.id,
-                goods_id=item["goods_id"],
-                quantity=item["quantity"],
-            )
-            await self.order_repo.add_order_item(order_item)
-
-        return created_order
+        return await self.order_repo.create_with_items(
+            order, self._merge_items(items), cart_id=cart_id
+        )
 
     async def create_order_for_admin(
         self,
@@ -128,18 +122,24 @@ class OrdersUseCase:
         if delivered_at:
             order.delivered_at = delivered_at
 
-        created_order = await self.order_repo.create(order)
-
-        if items:
-            for item in items:
-                order_item = OrderItem(
-                    order_id=created_order.id,
-                    goods_id=item["goods_id"],
-                    quantity=item["quantity"],
-                )
-                await self.order_repo.add_order_item(order_item)
+        if not items:
+            return await self.order_repo.create(order)
+        # Заказ, заведенный администратором, остатки не списывает
+        return await self.order_repo.create_with_items(
+            order, self._merge_items(items), decrement_stock=False
+        )
 
-        return created_order
+    @staticmethod
+    def _merge_items(items: List[Dict]) -> Dict[int, int]:
+        """Количество по ID товара (повторы одного товара складываются)"""
+        merged: Dict[int, int] = {}
+        for item in items:
+            quantity = item["quantity"]
+            if quantity <= 0:
+                raise ValueError("Количество товара должно быть больше 0")
+            goods_id = item["goods_id"]
+            merged[goods_id] = merged.get(goods_id, 0) + quantity
+        return merged
 
     async def calculate_order_total(
         self, order_id: Optional[int] = None, items: Optional[List[Dict]] = None
@@ -148,24 +148,22 @@ class OrdersUseCase:
         total = 0.0
 
         if order_id:
-            order_items = await self.order_repo.get_order_items(order_id)
-            for order_item in order_items:
-                good = await self.goods_repo.get(order_item.goods_id)
-                if not good:
-                    continue
-                price = float(good.price)
-                if good.discount:
-                    price = price * (1 - float(good.discount) / 100)
-                total += price * order_item.quantity
+            summaries = await self.order_repo.get_order_summaries([order_id])
+            if order_id in summaries:
+                total = summaries[order_id].total
         elif items:
             for item in items:
+                if item["quantity"] <= 0:
+                    raise ValueError("Количество товара должно быть больше 0")
+
+            # Товары загружаются одним запросом (get объединяет вызовы)
+            goods = await asyncio.gather(
+                *(self.goods_repo.get(item["goods_id"]) for item in items)
+            )
+            for item, good in zip(items, goods):
                 goods_id = item["goods_id"]
                 quantity = item["quantity"]
 
-                if quantity <= 0:
-                    raise ValueError("Количество товара должно быть больше 0")
-
-                good = await self.goods_repo.get(goods_id)
                 if not good:
                     raise ValueError(f"Товар с ID {goods_id} не найден")
 
@@ -177,24 +175,127 @@ class OrdersUseCase:
 
         return total
 
-    async def get_all_pick_up_points(self) -> List[OrderPickUpPoint]:
-        """Получить все пункты выдачи"""
-        if not self.pick_up_repo:
-            from backend.internal.repo.persistent.pick_up_point_postgres import (
-                PickUpPointPostgres,
+    async def get_order_summaries(
+        self, order_ids: List[int]
+    ) -> Dict[int, OrderSummary]:
+        """Суммы, количество товаров и артикулы заказов по их ID"""
+        return await self.order_repo.get_order_summaries(order_ids)
+
+    def _get_reservation_repo(self) -> ReservationPostgres:
+        """Получить репозиторий резервов товара"""
+        if not self.reservation_repo:
+            self.reservation_repo = ReservationPostgres(self.order_repo.pg)
+        return self.reservation_repo
+
+    async def reserve_goods(
+        self,
+        cart_id: str,
+        goods_id: int,
+        quantity: int,
+        user: Optional[User] = None,
+    ) -> Optional[StockReservation]:
+        """
+        Зарезервировать товар за корзиной на RESERVATION_TTL
+        (quantity - все количество товара в корзине, 0 снимает резерв)
+        """
+        if user and not AuthorizationUseCase.can_create_order(user):
+            raise PermissionError(
+                "Только клиент или администратор может создавать заказы"
             )
+        if quantity < 0:
+            raise ValueError("Количество товара должно быть больше 0")
+        if quantity == 0:
+            await self._get_reservation_repo().release(cart_id, goods_id)
+            return None
+        return await self._get_reservation_repo().reserve(
+            cart_id, goods_id, quantity, RESERVATION_TTL
+        )
 
-            pick_up_repo = PickUpPointPostgres(self.order_repo.pg)
-            return await pick_up_repo.get_all()
-        return await self.pick_up_repo.get_all()
+    async def release_reservation(
+        self, cart_id: str, goods_id: Optional[int] = None
+    ) -> None:
+        """Снять резерв товара корзины или всей корзины"""
+        await self._get_reservation_repo().release(cart_id, goods_id)
+
+    async def extend_reservation(self, cart_id: str) -> List[int]:
+        """
+        Продлить резервы открытой корзины на RESERVATION_TTL; возвращает
+        ID товаров, резерв которых еще действовал и продлен
+        """
+        return await self._get_reservation_repo().extend(cart_id, RESERVATION_TTL)
+
+    async def get_available_stock(
+        self, goods_ids: List[int], cart_id: Optional[str] = None
+    ) -> Dict[int, int]:
+        """Доступный остаток товаров с учетом резервов других корзин"""
+        return await self._get_reservation_repo().get_available(goods_ids, cart_id)
+
+    async def run_reservation_sweeper(
+        self, interval: float = RESERVATION_SWEEP_INTERVAL
+    ):
+        """Фоновая задача: периодически удалять просроченные резервы"""
+        while True:
+            try:
+                await self._get_reservation_repo().delete_expired()
+            except Exception as e:
+                print(f"Ошибка при удалении просроченных резервов: {e}")
+            await asyncio.sleep(interval)
+
+    def _get_pick_up_repo(self) -> PickUpPointPostgres:
+        """Получить репозиторий пунктов выдачи"""
+        if not self.pick_up_repo:
+            self.pick_up_repo = PickUpPointPostgres(self.order_repo.pg)
+        return self.pick_up_repo
+
+    async def get_all_pick_up_points(self) -> List[OrderPickUpPoint]:
+        """Получить все пункты выдачи"""
+        points = await self.cache.get_or_load(
+            CACHE_KEY_PICK_UP_POINTS, self._get_pick_up_repo().get_all
+        )
+        return list(points)
+
+    async def create_pick_up_point(
+        self, full_address: str, user: Optional[User] = None
+    ) -> OrderPickUpPoint:
+        """Создать пункт выдачи"""
+        AuthorizationUseCase.require_admin(user, "создавать пункты выдачи")
+        if not full_address or not full_address.strip():
+            raise ValueError("Адрес пункта выдачи не может быть пустым")
+
+        point = await self._get_pick_up_repo().create(
+            OrderPickUpPoint(full_address=full_address.strip())
+        )
+        self.cache.invalidate(CACHE_KEY_PICK_UP_POINTS)
+        return point
+
+    async def update_pick_up_point(
+        self, point: OrderPickUpPoint, user: Optional[User] = None
+    ) -> OrderPickUpPoint:
+        """Обновить пункт выдачи"""
+        AuthorizationUseCase.require_admin(user, "редактировать пункты выдачи")
+        if not point.full_address or not point.full_address.strip():
+            raise ValueError("Адрес пункта выдачи не может быть пустым")
+
+        updated_point = await self._get_pick_up_repo().update(point)
+        self.cache.invalidate(CACHE_KEY_PICK_UP_POINTS)
+        return updated_point
+
+    async def delete_pick_up_point(self, id: int, user: Optional[User] = None) -> bool:
+        """Удалить пункт выдачи"""
+        AuthorizationUseCase.require_admin(user, "удалять пункты выдачи")
+        deleted = await self._get_pick_up_repo().delete(id)
+        if deleted:
+            self.cache.invalidate(CACHE_KEY_PICK_UP_POINTS)
+        return deleted
 
     async def update_status(self, order_id: int, status: str) -> Optional[Order]:
         """Обновить статус заказа"""
-        order = await self.order_repo.get(order_id)
-        if not order:
-            return None
-        order.status = status
-        return await self.order_repo.update(order)
+        async with self.order_repo.pg.unit_of_work():
+            order = await self.order_repo.get(order_id)
+            if not order:
+                return None
+            order.status = status
+            return await self.order_repo.update(order)
 
     async def update(
         self, order: Order, user: Optional[User] = None
@@ -217,33 +318,29 @@ class OrdersUseCase:
         """Обновить данные заказа"""
         AuthorizationUseCase.require_admin(user, "редактировать заказы")
 
-        order = await self.order_repo.get(order_id)
-        if not order:
-            raise ValueError(f"Заказ с ID {order_id} не найден")
-        if status is not None:
-            order.status = status
-        if user_id is not None:
-            order.user_id = user_id
-        if pick_up_point_id is not None:
-            order.pick_up_point_id = pick_up_point_id
-        if created_at is not None:
-            order.created_at = created_at
-        if delivered_at is not None:
-            order.delivered_at = delivered_at
-
-        if items is not None:
-            await self.order_repo.delete_order_items(order_id)
-            for item in items:
-                order_item = OrderItem(
-                    order_id=order_id,
-                    goods_id=item["goods_id"],
-                    quantity=item["quantity"],
+        async with self.order_repo.pg.unit_of_work():
+            order = await self.order_repo.get(order_id)
+            if not order:
+                raise ValueError(f"Заказ с ID {order_id} не найден")
+            if status is not None:
+                order.status = status
+            if user_id is not None:
+                order.user_id = user_id
+            if pick_up_point_id is not None:
+                order.pick_up_point_id = pick_up_point_id
+            if created_at is not None:
+                order.created_at = created_at
+            if delivered_at is not None:
+                order.delivered_at = delivered_at
+
+            if items is not None:
+                await self.order_repo.replace_order_items(
+                    order_id, self._merge_items(items)
                 )
-                await self.order_repo.add_order_item(order_item)
 
-        return await self.order_repo.update(order)
+            return await self.order_repo.update(order)
 
-    async def delete(self, id: int, user: Optional[User] = None) -> bool:
-        """Удалить заказ"""
+    async def delete(self, id: int, user: Optional[User] = None) -> Optional[Order]:
+        """Удалить заказ; возвращает удаленный заказ или None, если его нет"""
         AuthorizationUseCase.require_admin(user, "удалять заказы")
         return await self.order_repo.delete(id)
@@ -0,0 +1,48 @@
+-- Исходные таблицы магазина: пользователи, пункты выдачи, товары, заказы.
+-- Все миграции повторно применимы (IF NOT EXISTS): базы, созданные
+-- до появления schema_version, проходят их начиная с версии 0
+CREATE TABLE IF NOT EXISTS "User" (
+    id serial PRIMARY KEY,
+    role VARCHAR(32) NOT NULL,
+    full_name VARCHAR(255) NOT NULL,
+    login VARCHAR(100) NOT NULL,
+    password VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS "Order_Pick_Up_Point" (
+    id serial PRIMARY KEY,
+    full_address VARCHAR(255) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS "Goods" (
+    id serial PRIMARY KEY,
+    article VARCHAR(100) NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    unit_of_measurement VARCHAR(10) NOT NULL,
+    price NUMERIC(12, 2) NOT NULL,
+    provider VARCHAR(100),
+    manufacturer VARCHAR(100),
+    category VARCHAR(100),
+    discount NUMERIC(5, 2),
+    count INTEGER NOT NULL DEFAULT 0,
+    description TEXT,
+    image VARCHAR(255)
+);
+
+CREATE TABLE IF NOT EXISTS "Order" (
+    id serial PRIMARY KEY,
+    user_id INTEGER REFERENCES "User"(id) ON DELETE SET NULL,
+    pick_up_point_id INTEGER REFERENCES "Order_Pick_Up_Point"(id) ON DELETE SET NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    delivered_at TIMESTAMP,
+    recipient_code VARCHAR(50),
+    status VARCHAR(50)
+);
+
+CREATE TABLE IF NOT EXISTS "Order_Items" (
+    id serial PRIMARY KEY,
+    order_id INTEGER NOT NULL REFERENCES "Order"(id) ON DELETE CASCADE,
+    goods_id INTEGER NOT NULL REFERENCES "Goods"(id) ON DELETE CASCADE,
+    quantity INTEGER NOT NULL CHECK (quantity > 0)
+);
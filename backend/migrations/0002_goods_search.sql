@@ -0,0 +1,19 @@
+-- Полнотекстовый поиск по товарам (взвешенный вектор, GIN) и триграммные
+-- индексы для подсказок в строке поиска. Выражение вектора совпадает
+-- с SEARCH_VECTOR_SQL модели Good
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE "Goods"
+    ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('russian', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(article, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(category, '')), 'B') ||
+        setweight(to_tsvector('russian', coalesce(manufacturer, '')), 'C') ||
+        setweight(to_tsvector('russian', coalesce(provider, '')), 'C') ||
+        setweight(to_tsvector('russian', coalesce(description, '')), 'D')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_goods_search_vector ON "Goods" USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS ix_goods_name_trgm ON "Goods" USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_goods_article_trgm ON "Goods" USING GIN (article gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_goods_manufacturer_trgm ON "Goods" USING GIN (manufacturer gin_trgm_ops);
@@ -0,0 +1,42 @@
+-- Ограничения уникальности: артикул товара, логин пользователя, адрес
+-- пункта выдачи, товар в заказе одной строкой. Ограничение не добавляется,
+-- если по тем же колонкам уже есть уникальный индекс (схема из shop.sql).
+-- При повторяющихся значениях миграция прерывается и не записывается
+-- в schema_version: от этих ограничений зависят запросы ON CONFLICT, поэтому
+-- дубликаты нужно убрать вручную, и миграция повторится при следующем запуске
+CREATE OR REPLACE FUNCTION pg_temp.add_unique_if_missing(tbl regclass, cols text[])
+RETURNS void AS $$
+BEGIN
+    IF EXISTS (
+        SELECT 1
+        FROM pg_index i
+        WHERE i.indrelid = tbl
+          AND i.indisunique
+          AND i.indpred IS NULL
+          AND ARRAY(
+              SELECT a.attname::text
+              FROM unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, n)
+              JOIN pg_attribute a ON a.attrelid = tbl AND a.attnum = k.attnum
+              ORDER BY k.n
+          ) = cols
+    ) THEN
+        RETURN;
+    END IF;
+    EXECUTE format(
+        'ALTER TABLE %s ADD UNIQUE (%s)',
+        tbl,
+        (SELECT string_agg(quote_ident(c), ', ') FROM unnest(cols) AS c)
+    );
+EXCEPTION WHEN unique_violation THEN
+    RAISE EXCEPTION 'Не удалось добавить ограничение уникальности %(%): есть повторяющиеся значения, удалите их и перезапустите приложение',
+        tbl, array_to_string(cols, ', ')
+        USING ERRCODE = 'unique_violation';
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT pg_temp.add_unique_if_missing('"Goods"', ARRAY['article']);
+SELECT pg_temp.add_unique_if_missing('"User"', ARRAY['login']);
+SELECT pg_temp.add_unique_if_missing('"Order_Pick_Up_Point"', ARRAY['full_address']);
+SELECT pg_temp.add_unique_if_missing('"Order_Items"', ARRAY['order_id', 'goods_id']);
+
+DROP FUNCTION pg_temp.add_unique_if_missing(regclass, text[]);
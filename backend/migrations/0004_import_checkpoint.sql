@@ -0,0 +1,8 @@
+-- Контрольные точки импорта данных из Excel (возобновление после сбоя)
+CREATE TABLE IF NOT EXISTS "Import_Checkpoint" (
+    file_name VARCHAR(255) PRIMARY KEY,
+    content_hash VARCHAR(64) NOT NULL,
+    row_offset INTEGER NOT NULL DEFAULT 0,
+    completed BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,16 @@
+-- Временные резервы товара в открытых корзинах
+CREATE TABLE IF NOT EXISTS "Stock_Reservation" (
+    cart_id VARCHAR(36) NOT NULL,
+    goods_id INTEGER NOT NULL REFERENCES "Goods"(id) ON DELETE CASCADE,
+    quantity INTEGER NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (cart_id, goods_id)
+);
+
+-- Доступный остаток: сумма действующих резервов товара читается только
+-- из индекса (index-only scan)
+CREATE INDEX IF NOT EXISTS ix_stock_reservation_goods_expires
+    ON "Stock_Reservation" (goods_id, expires_at) INCLUDE (quantity, cart_id);
+-- Удаление просроченных резервов
+CREATE INDEX IF NOT EXISTS ix_stock_reservation_expires
+    ON "Stock_Reservation" (expires_at);
@@ -0,0 +1,10 @@
+-- Индексы внешних ключей для выборок и каскадных действий. Позиции заказа
+-- (get_order_items, сводки заказов) ищутся по уникальному индексу
+-- (order_id, goods_id) из 0003, отдельный индекс по order_id не нужен
+
+-- Заказы пользователя (get_by_user) и ON DELETE SET NULL при удалении пользователя
+CREATE INDEX IF NOT EXISTS ix_order_user_id ON "Order" (user_id);
+-- ON DELETE SET NULL при удалении пункта выдачи
+CREATE INDEX IF NOT EXISTS ix_order_pick_up_point_id ON "Order" (pick_up_point_id);
+-- Товар в заказах (is_good_in_orders) и ON DELETE CASCADE при удалении товара
+CREATE INDEX IF NOT EXISTS ix_order_items_goods_id ON "Order_Items" (goods_id);
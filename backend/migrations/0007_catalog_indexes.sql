@@ -0,0 +1,10 @@
+-- Индексы каталога товаров. Сортировка по остатку (count, id) в get_page
+-- и filter_and_sort читается из индекса без сортировки, в том числе
+-- в обратном порядке и с фильтром по поставщику
+CREATE INDEX IF NOT EXISTS ix_goods_count_id ON "Goods" (count, id);
+CREATE INDEX IF NOT EXISTS ix_goods_provider_count_id ON "Goods" (provider, count, id);
+
+-- Списки категорий и производителей перебираются по индексу (поставщиков -
+-- по первой колонке ix_goods_provider_count_id)
+CREATE INDEX IF NOT EXISTS ix_goods_category ON "Goods" (category);
+CREATE INDEX IF NOT EXISTS ix_goods_manufacturer ON "Goods" (manufacturer);
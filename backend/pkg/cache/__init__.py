@@ -0,0 +1,13 @@
+"""
+Пакет для кэширования данных в памяти
+"""
+
+from backend.pkg.cache.ttl_cache import TTLCache
+from backend.pkg.cache.data_loader import (
+    DataLoader,
+    forget,
+    request_scope,
+    scoped_loader,
+)
+
+__all__ = ["TTLCache", "DataLoader", "forget", "request_scope", "scoped_loader"]
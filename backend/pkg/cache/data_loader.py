@@ -0,0 +1,149 @@
+"""
+Загрузчик записей по ключу с объединением запросов в пределах запроса GUI
+
+Ключи, запрошенные в одной итерации event loop (например, из asyncio.gather),
+загружаются одним вызовом batch_load. Загруженные значения запоминаются
+до конца запроса: области request_scope(), которую открывает run_async.
+"""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    def __init__(
+        self,
+        batch_load: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        memoize: bool = True,
+    ):
+        self._batch_load = batch_load
+        self._memoize = memoize
+        self._cache: Dict[K, asyncio.Future] = {}
+        self._pending: Dict[K, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> Optional[V]:
+        """Значение по ключу (None, если записи нет)"""
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._cache[key] = future
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            self._pending[key] = future
+        # Отмена одного ожидающего не должна отменять общую загрузку
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        """Значения по ключам одним вызовом batch_load"""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: Optional[V]) -> None:
+        """Запомнить значение (например, после записи в БД)"""
+        if not self._memoize:
+            return
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._cache[key] = future
+
+    def clear(self, key: K) -> None:
+        """Забыть значение ключа"""
+        self._cache.pop(key, None)
+
+    def _dispatch(self):
+        batch, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: Dict[K, asyncio.Future]):
+        try:
+            values = await self._batch_load(list(batch))
+        except Exception as e:
+            for key, future in batch.items():
+                # Ошибка не запоминается: следующий load повторит загрузку
+                if self._cache.get(key) is future:
+                    del self._cache[key]
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in batch.items():
+            if not self._memoize and self._cache.get(key) is future:
+                del self._cache[key]
+            if not future.done():
+                future.set_result(values.get(key))
+
+
+_loaders: ContextVar[Optional[Dict[Hashable, DataLoader]]] = ContextVar(
+    "data_loaders", default=None
+)
+# Загрузчики вне request_scope(): объединяют вызовы, но не запоминают значения
+_unscoped_loaders: Dict[Hashable, DataLoader] = {}
+
+
+@contextmanager
+def request_scope():
+    """Область запроса: загрузчики и запомненные в них значения"""
+    token = _loaders.set({})
+    try:
+        yield
+    finally:
+        _loaders.reset(token)
+
+
+def scoped_loader(
+    key: Hashable, batch_load: Callable[[List[K]], Awaitable[Dict[K, V]]]
+) -> DataLoader[K, V]:
+    """
+    Загрузчик текущего запроса для key. Вне request_scope() вызовы
+    объединяются, но значения не запоминаются
+    """
+    loaders = _loaders.get()
+    if loaders is None:
+        loader = _unscoped_loaders.get(key)
+        if loader is None:
+            loader = _unscoped_loaders[key] = DataLoader(batch_load, memoize=False)
+        return loader
+    loader = loaders.get(key)
+    if loader is None:
+        loader = loaders[key] = DataLoader(batch_load)
+    return loader
+
+
+def forget(key: Hashable, keys: Iterable[Hashable]) -> None:
+    """
+    Забыть значения keys в загрузчике key текущего запроса, если он создан
+    (запись изменена в обход репозитория, которому принадлежит загрузчик)
+    """
+    loaders = _loaders.get()
+    loader = loaders.get(key) if loaders is not None else None
+    if loader is not None:
+        for k in keys:
+            loader.clear(k)
+
+
+def forget_all() -> None:
+    """
+    Забыть все загрузчики текущего запроса (например, после отката
+    транзакции, в которой записи читались, изменялись и записывались)
+    """
+    loaders = _loaders.get()
+    if loaders is not None:
+        loaders.clear()
@@ -0,0 +1,49 @@
+"""
+Асинхронный кэш в памяти с временем жизни записей и явной инвалидацией
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class TTLCache:
+    DEFAULT_TTL = 300.0
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._generations: Dict[str, int] = {}
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Получить значение из кэша или загрузить его через loader.
+        Одновременные запросы одного ключа выполняют только одну загрузку
+        """
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+
+            generation = self._generations.get(key, 0)
+            value = await loader()
+            # Значение, загруженное до инвалидации, считается устаревшим
+            if self._generations.get(key, 0) == generation:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+            return value
+
+    def invalidate(self, *keys: str) -> None:
+        """Удалить записи из кэша"""
+        for key in keys:
+            self._entries.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self) -> None:
+        """Очистить кэш полностью"""
+        self.invalidate(*list(self._entries))
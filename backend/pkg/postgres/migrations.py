@@ -0,0 +1,102 @@
+"""
+Применение миграций схемы БД из упорядоченных SQL файлов
+
+Файл миграции называется NNNN_описание.sql, где NNNN - номер версии.
+Примененные версии записываются в таблицу schema_version. При запуске
+выполняется один запрос последней версии; новые файлы применяются
+по возрастанию версии, каждый в своей транзакции, под advisory-блокировкой:
+второй экземпляр приложения, запущенный одновременно, дождется первого
+и не применит миграции повторно.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+VERSION_TABLE = "schema_version"
+# Ключ advisory-блокировки на время применения миграций
+MIGRATION_LOCK_ID = 5_173_024
+_FILE_NAME = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    path: Path
+
+
+def load_migrations(directory: Path) -> List[Migration]:
+    """Миграции каталога по возрастанию версии"""
+    migrations = []
+    for path in directory.glob("*.sql"):
+        match = _FILE_NAME.match(path.name)
+        if match is None:
+            raise ValueError(f"Некорректное имя файла миграции: {path.name}")
+        migrations.append(Migration(int(match[1]), match[2], path))
+    migrations.sort(key=lambda migration: migration.version)
+    for previous, migration in zip(migrations, migrations[1:]):
+        if previous.version == migration.version:
+            raise ValueError(f"Повторяется версия миграции: {migration.version}")
+    return migrations
+
+
+async def get_version(engine: AsyncEngine) -> int:
+    """Версия схемы БД (0, если миграции еще не применялись)"""
+    async with engine.connect() as conn:
+        try:
+            version = await conn.scalar(
+                text(f"SELECT max(version) FROM {VERSION_TABLE}")
+            )
+        except ProgrammingError:
+            # Таблицы версий еще нет
+            return 0
+        return version or 0
+
+
+async def migrate(engine: AsyncEngine, directory: Path) -> List[Migration]:
+    """Применить новые миграции; возвращает примененные"""
+    migrations = load_migrations(directory)
+    if not migrations or await get_version(engine) >= migrations[-1].version:
+        return []
+
+    applied = []
+    async with engine.connect() as conn:
+        # Файл миграции - несколько команд, поэтому он выполняется напрямую
+        # через asyncpg (простой протокол), а не подготовленным запросом
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        await driver.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_ID)
+        try:
+            await driver.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (
+                    version INTEGER PRIMARY KEY,
+                    name VARCHAR(255) NOT NULL,
+                    applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+                )
+                """
+            )
+            current = await driver.fetchval(
+                f"SELECT coalesce(max(version), 0) FROM {VERSION_TABLE}"
+            )
+            for migration in migrations:
+                if migration.version <= current:
+                    continue
+                sql = migration.path.read_text(encoding="utf-8")
+                async with driver.transaction():
+                    await driver.execute(sql)
+                    await driver.execute(
+                        f"INSERT INTO {VERSION_TABLE} (version, name) VALUES ($1, $2)",
+                        migration.version,
+                        migration.name,
+                    )
+                applied.append(migration)
+        finally:
+            await driver.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_ID)
+    return applied
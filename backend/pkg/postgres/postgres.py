@@ -2,20 +2,82 @@
 Класс для управления подключением к PostgreSQL через SQLAlchemy async
 """
 
+from contextlib import asynccontextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
     AsyncSession,
     AsyncEngine,
 )
-from sqlalchemy import text
+from sqlalchemy import inspect, text, Integer, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import declarative_base
-from typing import Optional
+from typing import AsyncIterator, List, Optional
 from backend.confg.config import config
+from backend.pkg.cache.data_loader import forget_all
+from backend.pkg.postgres.migrations import migrate
+
+# Каталог SQL файлов миграций схемы (backend/migrations)
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
 
 Base = declarative_base()
 
 
+def column_values(entity) -> dict:
+    """
+    Значения колонок ORM объекта для INSERT/UPDATE ... RETURNING.
+    Первичный ключ и вычисляемые колонки не передаются, незаданные
+    колонки со значением по умолчанию на стороне БД - тоже
+    """
+    values = {}
+    for column in inspect(entity).mapper.columns:
+        if column.primary_key or column.computed is not None:
+            continue
+        value = getattr(entity, column.key)
+        if value is None and column.server_default is not None:
+            continue
+        values[column.key] = value
+    return values
+
+
+def ids_any(column, ids: List[int]):
+    """
+    Условие column = ANY(:ids): список передается одним параметром-массивом,
+    поэтому текст запроса не зависит от количества ID
+    """
+    return column == any_(bindparam("ids", list(ids), type_=ARRAY(Integer)))
+
+
+class _JoinedSession:
+    """
+    Сессия открытой единицы работы, выдаваемая репозиториям. Выход из
+    async with не закрывает сессию, commit только отправляет изменения
+    в БД (flush), begin не открывает новую транзакцию: транзакцию
+    фиксирует или откатывает сама единица работы
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def __aenter__(self) -> "_JoinedSession":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    async def commit(self):
+        await self._session.flush()
+
+    def begin(self):
+        return nullcontext(self)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
 class PG:
     def __init__(
         self,
@@ -30,6 +92,10 @@ class PG:
         )
         self.engine: Optional[AsyncEngine] = None
         self.session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+        # Сессия единицы работы текущей задачи asyncio
+        self._current_session: ContextVar[Optional[AsyncSession]] = ContextVar(
+            f"pg_session_{id(self)}", default=None
+        )
 
     async def connect(self) -> bool:
         try:
@@ -59,16 +125,64 @@ class PG:
             return False
 
     def get_session(self) -> AsyncSession:
+        """
+        Сессия для репозитория. Внутри unit_of_work() возвращается общая
+        сессия единицы работы, иначе - новая сессия со своей транзакцией
+        """
         if self.session_factory is None:
             raise RuntimeError("БД не подключена. Вызовите connect() сначала")
+        current = self._current_session.get()
+        if current is not None:
+            return _JoinedSession(current)
         return self.session_factory()
 
-    async def create_tables(self):
+    def in_unit_of_work(self) -> bool:
+        """Открыта ли единица работы в текущей задаче"""
+        return self._current_session.get() is not None
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[AsyncSession]:
+        """
+        Единица работы: все обращения репозиториев внутри блока идут через
+        одну сессию, одно соединение и одну транзакцию, которая фиксируется
+        при выходе из блока и откатывается при исключении (загрузчики
+        текущего запроса при этом сбрасываются). Вложенный вызов
+        присоединяется к внешней единице работы
+        """
+        current = self._current_session.get()
+        if current is not None:
+            yield current
+            return
+        if self.session_factory is None:
+            raise RuntimeError("БД не подключена. Вызовите connect() сначала")
+        async with self.session_factory() as session:
+            token = self._current_session.set(session)
+            try:
+                async with session.begin():
+                    yield session
+            except BaseException:
+                # Записи, запомненные загрузчиками внутри откаченной транзакции
+                # (в том числе измененные, но не записанные), устарели
+                forget_all()
+                raise
+            finally:
+                self._current_session.reset(token)
+
+    async def migrate(self, directory: Path = MIGRATIONS_DIR) -> bool:
+        """
+        Привести схему БД к последней версии миграций. Если схема уже
+        актуальна, выполняется только запрос версии
+        """
         if self.engine is None:
             raise RuntimeError("БД не подключена")
 
-        async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        try:
+            for migration in await migrate(self.engine, directory):
+                print(f"Применена миграция {migration.version:04d} {migration.name}")
+            return True
+        except Exception as e:
+            print(f"Ошибка миграции БД: {e}")
+            return False
 
     async def close(self):
         if self.engine:
@@ -0,0 +1,137 @@
+"""
+Бенчмарк выбора карточки кликом в списке из 5 000 карточек заказов:
+прежняя схема (обход всех карточек через findChildren и setStyleSheet на
+каждой) против общей таблицы стилей приложения и CardSelection, при
+которой клик перекрашивает не более двух карточек.
+
+БД не нужна: карточки строятся по заказам в памяти.
+
+Запуск из корня проекта:
+    python -m frontend.benchmark_card_selection
+"""
+
+from PySide6.QtWidgets import QApplication, QScrollArea, QVBoxLayout, QWidget
+from PySide6.QtCore import QEvent, QPointF, Qt
+from PySide6.QtGui import QMouseEvent
+from backend.internal.entity import Order, OrderPickUpPoint
+from frontend.utils.styles import APP_STYLESHEET
+from frontend.widgets.card_selection import CardSelection
+from frontend.widgets.order_card import OrderCard
+import datetime
+import sys
+import time
+
+CARDS = 5_000
+CLICKS = 200
+# Прежняя схема перекрашивает все карточки на каждый клик - кликов меньше
+LEGACY_CLICKS = 5
+
+# Стили карточки в том виде, в каком они задавались каждой карточке раньше
+LEGACY_CARD_STYLE = """
+    QFrame {
+        background-color: #FFFFFF;
+        border: 1px solid #000000;
+    }
+    QLabel {
+        color: #000000;
+        font-family: "Times New Roman";
+    }
+"""
+LEGACY_SELECTED_STYLE = """
+    QFrame {
+        border: 2px solid #7FFF00;
+    }
+"""
+
+
+def make_orders(count: int) -> list[Order]:
+    created_at = datetime.datetime(2025, 1, 1, 12, 0)
+    orders = []
+    for i in range(count):
+        order = Order(user_id=1, pick_up_point_id=1 + i % 10, status="Новый")
+        order.id = i + 1
+        order.created_at = created_at
+        orders.append(order)
+    return orders
+
+
+def build_list(orders: list[Order], selection=None):
+    """Окно со списком карточек, как в OrdersWindow"""
+    points = {i: OrderPickUpPoint(f"Адрес пункта {i}") for i in range(1, 11)}
+    scroll_area = QScrollArea()
+    scroll_area.setWidgetResizable(True)
+    container = QWidget()
+    layout = QVBoxLayout(container)
+    cards = []
+    for order in orders:
+        card = OrderCard(
+            order, parent=container, pick_up_points_dict=points, selection=selection
+        )
+        layout.addWidget(card)
+        cards.append(card)
+    scroll_area.setWidget(container)
+    scroll_area.resize(900, 700)
+    scroll_area.show()
+    QApplication.processEvents()
+    return scroll_area, cards
+
+
+def legacy_select(card: OrderCard):
+    """Прежний mousePressEvent: обход и перекраска всех карточек"""
+    for child in card.parent().findChildren(OrderCard):
+        if child != card:
+            child.setStyleSheet(LEGACY_CARD_STYLE)
+    card.setStyleSheet(LEGACY_CARD_STYLE + LEGACY_SELECTED_STYLE)
+
+
+def click(card: OrderCard):
+    """Нажатие левой кнопки мыши на карточке"""
+    point = QPointF(5, 5)
+    event = QMouseEvent(
+        QEvent.MouseButtonPress,
+        point,
+        point,
+        Qt.LeftButton,
+        Qt.LeftButton,
+        Qt.NoModifier,
+    )
+    QApplication.sendEvent(card, event)
+
+
+def measure(cards: list, clicks: int, select) -> float:
+    """Кликов в секунду, включая обработку событий и перерисовку"""
+    started = time.perf_counter()
+    for i in range(clicks):
+        select(cards[(i * 7) % 20])
+        QApplication.processEvents()
+    return clicks / (time.perf_counter() - started)
+
+
+def run_benchmark():
+    app = QApplication.instance() or QApplication(sys.argv)
+    orders = make_orders(CARDS)
+
+    app.setStyleSheet("")
+    legacy_window, legacy_cards = build_list(orders)
+    for card in legacy_cards:
+        card.setStyleSheet(LEGACY_CARD_STYLE)
+    legacy = measure(legacy_cards, LEGACY_CLICKS, legacy_select)
+    legacy_window.close()
+    legacy_window.deleteLater()
+    QApplication.processEvents()
+
+    app.setStyleSheet(APP_STYLESHEET)
+    selection = CardSelection()
+    window, cards = build_list(orders, selection)
+    current = measure(cards, CLICKS, click)
+    assert selection.current is cards[((CLICKS - 1) * 7) % 20]
+    window.close()
+
+    print(f"Карточек: {CARDS}")
+    print(f"  findChildren + setStyleSheet  {legacy:10.1f} кликов/с")
+    print(f"  CardSelection + свойство      {current:10.1f} кликов/с")
+    print(f"  Ускорение                     {current / legacy:10.1f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -3,9 +3,13 @@
 """
 
 from backend.internal.usecase.goods_usecase import GoodsUseCase
+from backend.internal.repo.persistent.goods_postgres import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_SUGGESTIONS_LIMIT,
+)
 from backend.internal.entity.good import Good
 from backend.internal.entity.user import User
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 
 class GoodsService:
@@ -24,6 +28,15 @@ class GoodsService:
         """Поиск товаров"""
         return await self.usecase.search(query, user)
 
+    async def suggest_goods(
+        self,
+        query: str,
+        limit: int = DEFAULT_SUGGESTIONS_LIMIT,
+        user: Optional[User] = None,
+    ) -> List[str]:
+        """Подсказки для строки поиска (название, артикул, производитель)"""
+        return await self.usecase.suggest(query, limit, user)
+
     async def create_good(
         self,
         article: str,
@@ -92,7 +105,7 @@ class GoodsService:
             user,
         )
 
-    async def delete_good(self, id: int, user: Optional[User] = None) -> bool:
+    async def delete_good(self, id: int, user: Optional[User] = None) -> Optional[Good]:
         """Удалить товар"""
         return await self.usecase.delete(id, user)
 
@@ -120,6 +133,23 @@ class GoodsService:
             provider, sort_by_count, search_query, user
         )
 
+    async def get_goods_page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[Tuple[float, int]] = None,
+        provider: Optional[str] = None,
+        sort_by_count: Optional[str] = None,
+        search_query: Optional[str] = None,
+        user: Optional[User] = None,
+    ) -> List[Good]:
+        """
+        Получить страницу товаров (keyset-пагинация по курсору (count, id),
+        для результатов поиска без сортировки - (search_rank, id))
+        """
+        return await self.usecase.get_page(
+            limit, after, provider, sort_by_count, search_query, user
+        )
+
     def calculate_price_with_discount(
         self, price: float, discount: Optional[float] = None
     ) -> float:
@@ -4,6 +4,8 @@
 
 from backend.internal.usecase.orders_usecase import OrdersUseCase
 from backend.internal.entity.order import Order
+from backend.internal.entity.order_summary import OrderSummary
+from backend.internal.entity.stock_reservation import StockReservation
 from backend.internal.entity.user import User
 from typing import List, Optional, Dict
 from datetime import datetime
@@ -35,9 +37,38 @@ class OrdersService:
         recipient_code: Optional[str] = None,
         items: List[Dict] = None,
         user: Optional[User] = None,
+        cart_id: Optional[str] = None,
     ) -> Order:
         """Создать заказ"""
-        return await self.usecase.create(pick_up_point_id, recipient_code, items, user)
+        return await self.usecase.create(
+            pick_up_point_id, recipient_code, items, user, cart_id
+        )
+
+    async def reserve_goods(
+        self,
+        cart_id: str,
+        goods_id: int,
+        quantity: int,
+        user: Optional[User] = None,
+    ) -> Optional[StockReservation]:
+        """Зарезервировать товар за корзиной"""
+        return await self.usecase.reserve_goods(cart_id, goods_id, quantity, user)
+
+    async def release_reservation(
+        self, cart_id: str, goods_id: Optional[int] = None
+    ) -> None:
+        """Снять резерв товара или всей корзины"""
+        await self.usecase.release_reservation(cart_id, goods_id)
+
+    async def extend_reservation(self, cart_id: str) -> List[int]:
+        """Продлить резервы корзины; возвращает ID товаров с продленным резервом"""
+        return await self.usecase.extend_reservation(cart_id)
+
+    async def get_available_stock(
+        self, goods_ids: List[int], cart_id: Optional[str] = None
+    ) -> Dict[int, int]:
+        """Доступный остаток товаров с учетом резервов"""
+        return await self.usecase.get_available_stock(goods_ids, cart_id)
 
     async def update_order_status(self, order_id: int, status: str) -> Optional[Order]:
         """Обновить статус заказа"""
@@ -49,7 +80,9 @@ class OrdersService:
         """Обновить заказ"""
         return await self.usecase.update(order, user)
 
-    async def delete_order(self, id: int, user: Optional[User] = None) -> bool:
+    async def delete_order(
+        self, id: int, user: Optional[User] = None
+    ) -> Optional[Order]:
         """Удалить заказ"""
         return await self.usecase.delete(id, user)
 
@@ -97,6 +130,12 @@ class OrdersService:
         """Рассчитать итоговую сумму заказа"""
         return await self.usecase.calculate_order_total(order_id, items)
 
+    async def get_order_summaries(
+        self, order_ids: List[int]
+    ) -> Dict[int, OrderSummary]:
+        """Суммы, количество товаров и артикулы заказов одним запросом"""
+        return await self.usecase.get_order_summaries(order_ids)
+
     async def get_all_pick_up_points(self):
         """Получить все пункты выдачи"""
         return await self.usecase.get_all_pick_up_points()
@@ -1,111 +1,197 @@
 """
 Хелперы для работы с async функциями в Qt
+
+Все корутины backend выполняются в одном долгоживущем потоке со своим
+event loop: пул соединений asyncpg создается и используется только в нем.
+GUI получает результаты через сигналы Qt, которые доставляются в поток
+виджета, поэтому главный поток не блокируется на запросах к БД.
 """
 
 import asyncio
 import threading
-from typing import Coroutine, Any
-from PySide6.QtCore import QObject, Signal, QThread
+from concurrent.futures import Future
+from typing import Any, Callable, Coroutine, Optional
+from PySide6.QtCore import QObject, Signal
+from backend.pkg.cache.data_loader import request_scope
+
 
+class BackendLoop:
+    """Поток с постоянным event loop, в котором выполняются корутины backend"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Запустить поток event loop, если он еще не запущен"""
+        with self._lock:
+            if self._loop is not None and not self._loop.is_closed():
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(
+                target=run, name="backend-loop", daemon=True
+            )
+            self._thread.start()
+            started.wait()
+            self._loop = loop
+            return loop
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Запланировать корутину в потоке backend"""
+        return asyncio.run_coroutine_threadsafe(coro, self.start())
+
+    def stop(self):
+        """Отменить незавершенные задачи и остановить поток event loop"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None or loop.is_closed():
+            return
+
+        async def cancel_pending():
+            pending = [
+                task
+                for task in asyncio.all_tasks()
+                if task is not asyncio.current_task()
+            ]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
-_loop_lock = threading.Lock()
-_loop = None
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_pending(), loop).result()
+        except Exception:
+            pass
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
 
 
-def _get_or_create_loop():
-    """Получить или создать event loop для текущего потока"""
-    global _loop
-    with _loop_lock:
-        if _loop is None or _loop.is_closed():
-            _loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(_loop)
-        return _loop
+_backend = BackendLoop()
+_pending_tasks = set()
 
 
-class AsyncHelper(QObject):
-    """Хелпер для запуска async функций из синхронного Qt кода"""
+class AsyncTask(QObject):
+    """
+    Результат корутины, выполняемой в потоке backend. Обработчики вызываются
+    в потоке, где создана задача; задача, привязанная к owner, удаляется
+    вместе с ним, и ее результат больше не доставляется
+    """
 
     finished = Signal(object)
-    error = Signal(Exception)
+    error = Signal(object)
+
+    def __init__(
+        self,
+        future: Future,
+        on_result: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        owner: Optional[QObject] = None,
+    ):
+        super().__init__(owner)
+        self._future = future
+        self._on_result = on_result
+        self._on_error = on_error
+        self._cancelled = False
+        self.finished.connect(self._handle_result)
+        self.error.connect(self._handle_error)
+        _pending_tasks.add(self)
+        future.add_done_callback(self._emit)
+
+    def cancel(self):
+        """Отменить задачу: корутина прерывается, обработчики не вызываются"""
+        self._cancelled = True
+        self._future.cancel()
+
+    def is_done(self) -> bool:
+        """Завершена ли корутина"""
+        return self._future.done()
+
+    async def wait(self):
+        """
+        Дождаться завершения корутины из другой корутины потока backend
+        (ошибка и отмена задачи не пробрасываются)
+        """
+        await asyncio.wait([asyncio.wrap_future(self._future)])
+
+    def _emit(self, future: Future):
+        """Передать результат из потока backend в поток задачи"""
+        if future.cancelled():
+            _pending_tasks.discard(self)
+            return
+        try:
+            exception = future.exception()
+            if exception is not None:
+                self.error.emit(exception)
+            else:
+                self.finished.emit(future.result())
+        except RuntimeError:
+            # Владелец задачи уже удален
+            _pending_tasks.discard(self)
+
+    def _handle_result(self, result: Any):
+        _pending_tasks.discard(self)
+        if not self._cancelled and self._on_result is not None:
+            self._on_result(result)
+
+    def _handle_error(self, exception: Exception):
+        _pending_tasks.discard(self)
+        if self._cancelled:
+            return
+        if self._on_error is not None:
+            self._on_error(exception)
+        else:
+            print(f"Ошибка фоновой операции: {exception}")
+
+
+def start_loop() -> asyncio.AbstractEventLoop:
+    """Запустить поток backend (вызывается при старте приложения)"""
+    return _backend.start()
+
+
+async def _in_request_scope(coro: Coroutine) -> Any:
+    """
+    Выполнить корутину в своей области запроса: выборки по ID внутри
+    нее объединяются и запоминаются до ее завершения
+    """
+    with request_scope():
+        return await coro
 
-    def __init__(self):
-        super().__init__()
-        self.loop = None
-        self.thread = None
-
-    def run_async(self, coro: Coroutine) -> None:
-        """Запустить async функцию в отдельном потоке"""
-
-        def run_in_thread():
-            """Создать новый event loop в потоке"""
-            self.loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self.loop)
-            try:
-                result = self.loop.run_until_complete(coro)
-                self.finished.emit(result)
-            except Exception as e:
-                self.error.emit(e)
-            finally:
-                try:
-                    pending = asyncio.all_tasks(self.loop)
-                    if pending:
-                        for task in pending:
-                            task.cancel()
-                        self.loop.run_until_complete(
-                            asyncio.gather(*pending, return_exceptions=True)
-                        )
-                except Exception:
-                    pass
-                finally:
-                    self.loop.close()
-
-        self.thread = QThread()
-        self.thread.run = run_in_thread
-        self.thread.start()
+
+def run_async(
+    coro: Coroutine,
+    on_result: Optional[Callable[[Any], None]] = None,
+    on_error: Optional[Callable[[Exception], None]] = None,
+    owner: Optional[QObject] = None,
+) -> AsyncTask:
+    """
+    Запустить async функцию в потоке backend без блокировки GUI.
+    on_result и on_error вызываются в потоке GUI по завершении корутины
+    """
+    return AsyncTask(
+        _backend.submit(_in_request_scope(coro)), on_result, on_error, owner
+    )
 
 
 def run_async_sync(coro: Coroutine) -> Any:
     """
-    Запустить async функцию синхронно (блокирующий вызов)
-    Использует глобальный event loop для всех вызовов
+    Запустить async функцию в потоке backend и дождаться результата
+    (блокирующий вызов - только для запуска и завершения приложения)
     """
-    try:
-        loop = asyncio.get_running_loop()
-        raise RuntimeError(
-            "Cannot run async function synchronously when event loop is already running. "
-            "Use AsyncHelper.run_async() instead."
-        )
-    except RuntimeError as e:
-        if "already running" in str(e):
-            raise
-        loop = _get_or_create_loop()
-        try:
-            return loop.run_until_complete(coro)
-        except Exception as ex:
-            if loop.is_closed():
-                with _loop_lock:
-                    _loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(_loop)
-                    loop = _loop
-                return loop.run_until_complete(coro)
-            raise ex
+    return _backend.submit(coro).result()
 
 
 def close_loop():
-    """Закрыть глобальный event loop (вызывать при выходе из приложения)"""
-    global _loop
-    with _loop_lock:
-        if _loop is not None and not _loop.is_closed():
-            try:
-                pending = asyncio.all_tasks(_loop)
-                if pending:
-                    for task in pending:
-                        task.cancel()
-                    _loop.run_until_complete(
-                        asyncio.gather(*pending, return_exceptions=True)
-                    )
-            except Exception:
-                pass
-            finally:
-                _loop.close()
-                _loop = None
+    """Остановить поток backend (вызывать при выходе из приложения)"""
+    _backend.stop()
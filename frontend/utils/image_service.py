@@ -0,0 +1,196 @@
+"""
+Миниатюры фото товаров
+
+Фото декодируются и уменьшаются в пуле потоков через QImage, готовые
+миниатюры сохраняются на диск (ключ - путь к файлу и время его изменения)
+и держатся в памяти в LRU кэше. Поток GUI только рисует готовые QPixmap.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Optional
+from PySide6.QtCore import QObject, QRunnable, QStandardPaths, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage, QPixmap
+
+PUBLIC_DIR = "frontend/public"
+PLACEHOLDER_IMAGE = "picture.png"
+THUMBNAIL_SIZE = 150
+# Сколько миниатюр держать в памяти (150x150 ARGB - около 90 КБ каждая)
+MEMORY_CACHE_SIZE = 300
+THUMBNAIL_DIR_NAME = "shop_thumbnails"
+
+
+def resolve_image_path(image: Optional[str]) -> Optional[str]:
+    """Путь к файлу изображения товара в frontend/public"""
+    if not image:
+        return None
+    image_path = image
+    if "temp" in image_path:
+        image_path = image_path.replace("temp/", "").replace("temp\\", "")
+    if not os.path.isabs(image_path):
+        image_path = os.path.join(PUBLIC_DIR, image_path)
+    if not os.path.exists(image_path):
+        image_path = os.path.join(PUBLIC_DIR, os.path.basename(image_path))
+    return image_path if os.path.exists(image_path) else None
+
+
+def default_cache_dir() -> str:
+    """Каталог дискового кэша миниатюр"""
+    base = QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation)
+    if not base:
+        import tempfile
+
+        base = tempfile.gettempdir()
+    return os.path.join(base, THUMBNAIL_DIR_NAME)
+
+
+class _ThumbnailSignals(QObject):
+    done = Signal(str, object)
+
+
+class _ThumbnailJob(QRunnable):
+    """Загрузка одной миниатюры в потоке пула"""
+
+    def __init__(self, image: str, size: int, cache_dir: str, signals):
+        super().__init__()
+        self.image = image
+        self.size = size
+        self.cache_dir = cache_dir
+        self.signals = signals
+
+    def run(self):
+        thumbnail = None
+        try:
+            if self.image:
+                path = resolve_image_path(self.image)
+            else:
+                path = os.path.join(PUBLIC_DIR, PLACEHOLDER_IMAGE)
+            # Для товара без файла фото остается None - рисуется заглушка
+            if path is not None and os.path.exists(path):
+                thumbnail = self.load(path)
+        except Exception as e:
+            print(f"Ошибка при загрузке изображения {self.image}: {e}")
+        self.signals.done.emit(self.image, thumbnail)
+
+    def load(self, path: str) -> Optional[QImage]:
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{self.size}"
+        cached_path = os.path.join(
+            self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".png"
+        )
+        if os.path.exists(cached_path):
+            cached = QImage(cached_path)
+            if not cached.isNull():
+                return cached
+
+        image = QImage(path)
+        if image.isNull():
+            return None
+        thumbnail = image.scaled(
+            self.size, self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation
+        )
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Запись во временный файл, чтобы параллельная загрузка
+            # не прочитала недописанную миниатюру
+            temp_path = f"{cached_path}.{os.getpid()}.tmp"
+            if thumbnail.save(temp_path, "PNG"):
+                os.replace(temp_path, cached_path)
+        except OSError as e:
+            print(f"Ошибка при сохранении миниатюры: {e}")
+        return thumbnail
+
+
+class ImageService(QObject):
+    """
+    Кэш миниатюр фото товаров. thumbnail() не обращается к диску: если
+    миниатюры нет в памяти, она загружается в фоне, а по готовности
+    испускается thumbnail_ready с тем же значением image
+    """
+
+    thumbnail_ready = Signal(str)
+
+    def __init__(
+        self,
+        size: int = THUMBNAIL_SIZE,
+        cache_dir: Optional[str] = None,
+        memory_limit: int = MEMORY_CACHE_SIZE,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self.size = size
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.memory_limit = memory_limit
+        self._memory: OrderedDict[str, Optional[QPixmap]] = OrderedDict()
+        self._pending: set[str] = set()
+        self._placeholder: Optional[QPixmap] = None
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(
+            max(2, QThreadPool.globalInstance().maxThreadCount())
+        )
+        self._signals = _ThumbnailSignals(self)
+        self._signals.done.connect(self._on_loaded)
+
+    def thumbnail(self, image: Optional[str]) -> Optional[QPixmap]:
+        """
+        Миниатюра фото товара. Пока фото загружается, возвращается
+        заглушка (или None, если и она еще не загружена)
+        """
+        key = image or ""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key] or self._placeholder
+        self._request(key)
+        if key:
+            self._request("")
+        return self._placeholder
+
+    def loaded_images(self):
+        """Значения image, для которых миниатюра уже в памяти"""
+        return self._memory.keys()
+
+    def invalidate(self, image: Optional[str]):
+        """Забыть миниатюру после замены файла изображения"""
+        self._memory.pop(image or "", None)
+
+    def shutdown(self):
+        """Отменить загрузки из очереди и дождаться выполняемых"""
+        self._pool.clear()
+        self._pool.waitForDone()
+
+    def _request(self, key: str):
+        if key in self._memory or key in self._pending:
+            return
+        self._pending.add(key)
+        self._pool.start(_ThumbnailJob(key, self.size, self.cache_dir, self._signals))
+
+    def _on_loaded(self, image: str, thumbnail: Optional[QImage]):
+        self._pending.discard(image)
+        pixmap = QPixmap.fromImage(thumbnail) if thumbnail is not None else None
+        if not image:
+            self._placeholder = pixmap
+        self._memory[image] = pixmap
+        self._memory.move_to_end(image)
+        while len(self._memory) > self.memory_limit:
+            self._memory.popitem(last=False)
+        self.thumbnail_ready.emit(image)
+
+
+_image_service: Optional[ImageService] = None
+
+
+def image_service() -> ImageService:
+    """Общий кэш миниатюр приложения (создается после QApplication)"""
+    global _image_service
+    if _image_service is None:
+        _image_service = ImageService()
+    return _image_service
+
+
+def close_image_service():
+    """Остановить загрузку миниатюр (вызывать при выходе из приложения)"""
+    global _image_service
+    if _image_service is not None:
+        _image_service.shutdown()
+        _image_service = None
@@ -0,0 +1,89 @@
+"""
+Контроллер поиска: откладывает запрос, пока пользователь печатает,
+и отменяет выполняемый запрос, когда начинается новый
+"""
+
+from typing import Any, Callable, Coroutine, Optional
+from PySide6.QtCore import QObject, QTimer
+from frontend.utils.async_helper import AsyncTask, run_async
+
+# Пауза ввода, после которой выполняется поиск
+SEARCH_DEBOUNCE_MS = 300
+
+
+class SearchController(QObject):
+    """
+    Выполняет search(query) в потоке backend не чаще, чем раз в паузу ввода.
+    Новый запрос отменяет предыдущий (вместе с запросом в PostgreSQL),
+    результат устаревшего запроса никогда не передается в on_result
+    """
+
+    def __init__(
+        self,
+        search: Callable[[str], Coroutine],
+        on_result: Callable[[Any], None],
+        on_error: Optional[Callable[[Exception], None]] = None,
+        delay_ms: int = SEARCH_DEBOUNCE_MS,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self._search = search
+        self._on_result = on_result
+        self._on_error = on_error
+        self._query = ""
+        self._generation = 0
+        self._task: Optional[AsyncTask] = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start)
+
+    def set_query(self, query: str):
+        """Запланировать поиск после паузы ввода"""
+        self._query = query
+        self._timer.start()
+
+    def run_now(self, query: Optional[str] = None):
+        """Выполнить поиск сразу, без паузы"""
+        if query is not None:
+            self._query = query
+        self._timer.stop()
+        self._start()
+
+    def cancel(self):
+        """Отменить запланированный и выполняемый поиск"""
+        self._timer.stop()
+        self._generation += 1
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def is_busy(self) -> bool:
+        """Запланирован или выполняется ли поиск"""
+        return self._timer.isActive() or self._task is not None
+
+    def _start(self):
+        self.cancel()
+        generation = self._generation
+        self._task = run_async(
+            self._search(self._query),
+            lambda result: self._deliver(generation, result),
+            lambda e: self._fail(generation, e),
+            owner=self,
+        )
+
+    def _deliver(self, generation: int, result: Any):
+        if generation != self._generation:
+            return
+        self._task = None
+        self._on_result(result)
+
+    def _fail(self, generation: int, e: Exception):
+        if generation != self._generation:
+            return
+        self._task = None
+        if self._on_error is not None:
+            self._on_error(e)
+        else:
+            print(f"Ошибка при поиске: {e}")
@@ -280,87 +280,22 @@ STYLES = {
             color: #000000;
         }
     """,
-    # Стили для карточки заказа (OrderCard)
-    "ORDER_CARD_STYLE": """
-        QFrame {
+    # Стили карточек заказов. Задаются один раз на уровне приложения:
+    # карточки различаются objectName и динамическим свойством selected,
+    # а не собственными таблицами стилей
+    "CARD_STYLE": """
+        QFrame#OrderCard, QFrame#OrderCard QFrame {
             background-color: #FFFFFF;
             border: 1px solid #000000;
         }
-        QLabel {
-            color: #000000;
-            font-family: "Times New Roman";
-        }
-    """,
-    # Стиль для выбранной карточки заказа
-    "ORDER_CARD_SELECTED_STYLE": """
-        QFrame {
-            border: 2px solid #7FFF00;
-        }
-    """,
-    # Стили для карточки товара (ProductCard)
-    "PRODUCT_CARD_STYLE": """
-        QFrame {
-            background-color: #FFFFFF;
-            border: 1px solid #000000;
-        }
-        QLabel {
-            color: #000000;
-            font-family: "Times New Roman";
-        }
-    """,
-    # Стиль для карточки товара со скидкой > 15%
-    "PRODUCT_CARD_DISCOUNT_STYLE": """
-        QFrame {
-            background-color: #2E8B57;
-            border: 1px solid #000000;
-        }
-        QLabel {
-            color: #FFFFFF;
-            font-family: "Times New Roman";
-        }
-    """,
-    # Стиль для карточки товара без остатка
-    "PRODUCT_CARD_OUT_OF_STOCK_STYLE": """
-        QFrame {
-            background-color: #ADD8E6;
-            border: 1px solid #000000;
-        }
-        QLabel {
+        QFrame#OrderCard QLabel {
             color: #000000;
             font-family: "Times New Roman";
         }
-    """,
-    # Стиль для выбранной карточки товара
-    "PRODUCT_CARD_SELECTED_STYLE": """
-        QFrame {
+        QFrame#OrderCard[selected="true"] {
             border: 2px solid #7FFF00;
         }
     """,
-    # Стили для цены в карточке товара
-    "PRODUCT_CARD_PRICE_DISCOUNTED_STYLE": """
-        QLabel {
-            color: #FF0000;
-        }
-    """,
-    "PRODUCT_CARD_PRICE_NORMAL_STYLE": """
-        QLabel {
-            color: #000000;
-        }
-    """,
-    # Стиль для названия товара в карточке
-    "PRODUCT_CARD_NAME_STYLE": """
-        QLabel {
-            font-weight: bold;
-            font-size: 12px;
-        }
-    """,
-    # Стиль для значения скидки в карточке
-    "PRODUCT_CARD_DISCOUNT_VALUE_STYLE": """
-        QLabel {
-            font-weight: bold;
-            font-size: 14px;
-        }
-    """,
     # Стиль для области прокрутки
     "SCROLL_AREA_STYLE": """
         QScrollArea {
@@ -368,11 +303,12 @@ STYLES = {
             background-color: #FFFFFF;
         }
     """,
-    # Стиль для строки с количеством 0
-    "PRODUCT_CARD_COUNT_ZERO_STYLE": """
-        QLabel {
-            background-color: #ADD8E6;
-            padding: 2px;
+    # Стиль списка карточек товаров
+    "PRODUCT_LIST_STYLE": """
+        QListView {
+            border: 1px solid #000000;
+            background-color: #FFFFFF;
+            padding: 9px;
         }
     """,
     # Стиль для метки ошибки валидации
@@ -407,3 +343,10 @@ STYLES = {
         }
     """,
 }
+
+# Таблица стилей приложения (QApplication.setStyleSheet): фон окон,
+# диалоги и карточки. Стили окон задаются здесь, а не на самих окнах -
+# иначе таблица стилей окна перекрывала бы правила карточек внутри него
+APP_STYLESHEET = (
+    STYLES["WINDOW_STYLE"] + STYLES["MESSAGEBOX_STYLE"] + STYLES["CARD_STYLE"]
+)
@@ -2,7 +2,8 @@
 Виджеты для отображения карточек товаров и заказов
 """
 
-from frontend.widgets.product_card import ProductCard
 from frontend.widgets.order_card import OrderCard
+from frontend.widgets.product_list import ProductListView
+from frontend.widgets.card_selection import CardSelection
 
-__all__ = ["ProductCard", "OrderCard"]
+__all__ = ["OrderCard", "ProductListView", "CardSelection"]
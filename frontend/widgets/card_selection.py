@@ -0,0 +1,50 @@
+"""
+Выбор карточки в списке карточек
+"""
+
+from typing import Optional
+from PySide6.QtWidgets import QWidget
+
+
+def set_card_selected(card: QWidget, selected: bool):
+    """
+    Отметить карточку выбранной через динамическое свойство selected.
+    Правила для него заданы в таблице стилей приложения, поэтому
+    перерисовывается только сама карточка
+    """
+    if card.property("selected") == selected:
+        return
+    card.setProperty("selected", selected)
+    card.style().unpolish(card)
+    card.style().polish(card)
+    card.update()
+
+
+class CardSelection:
+    """
+    Текущая выбранная карточка списка. Список хранит ее сам, поэтому клик
+    снимает выделение с одной карточки и выделяет другую, не обходя
+    остальные карточки
+    """
+
+    def __init__(self):
+        self.current: Optional[QWidget] = None
+
+    def select(self, card: Optional[QWidget]):
+        """Выбрать карточку (None - снять выделение)"""
+        if card is self.current:
+            return
+        if self.current is not None:
+            set_card_selected(self.current, False)
+        self.current = card
+        if card is not None:
+            set_card_selected(card, True)
+
+    def discard(self, card: QWidget):
+        """Забыть карточку, которую убирают из списка"""
+        if card is self.current:
+            self.current = None
+
+    def clear(self):
+        """Забыть выбор при пересоздании карточек"""
+        self.current = None
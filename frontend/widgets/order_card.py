@@ -5,20 +5,30 @@
 from PySide6.QtWidgets import QHBoxLayout, QVBoxLayout, QLabel, QFrame
 from PySide6.QtCore import Qt
 from backend.internal.entity.order import Order
-from frontend.utils.styles import STYLES
+from frontend.widgets.card_selection import CardSelection, set_card_selected
+from backend.internal.entity.order_summary import OrderSummary
+from typing import Optional
 
 
 class OrderCard(QFrame):
     def __init__(
-        self, order: Order, parent=None, on_double_click=None, pick_up_points_dict=None
+        self,
+        order: Order,
+        parent=None,
+        on_double_click=None,
+        pick_up_points_dict=None,
+        selection: Optional[CardSelection] = None,
+        summary: Optional[OrderSummary] = None,
     ):
         super().__init__(parent)
         self.order = order
         self.on_double_click = on_double_click
         self.pick_up_points_dict = pick_up_points_dict or {}
-        self._selected = False
+        self.selection = selection
+        self.summary = summary
+        self.setObjectName("OrderCard")
+        self.setProperty("selected", False)
         self.setup_ui()
-        self.apply_styles()
 
     def mouseDoubleClickEvent(self, event):
         """Обработка двойного клика"""
@@ -28,25 +38,28 @@ class OrderCard(QFrame):
 
     def mousePressEvent(self, event):
         """Обработка клика для выбора карточки"""
-        self._selected = True
-
-        if self.parent():
-            for child in self.parent().findChildren(OrderCard):
-                if child != self:
-                    child._selected = False
-                    child.update_selection_style()
-        self.update_selection_style()
+        if self.selection is not None:
+            self.selection.select(self)
+        else:
+            set_card_selected(self, True)
         super().mousePressEvent(event)
 
-    def update_selection_style(self):
-        """Обновить стиль в зависимости от выбора"""
-        if self._selected:
-            self.setStyleSheet(
-                STYLES.get("ORDER_CARD_STYLE", "")
-                + STYLES.get("ORDER_CARD_SELECTED_STYLE", "")
-            )
-        else:
-            self.apply_styles()
+    def is_selected(self) -> bool:
+        """Выбрана ли карточка"""
+        return bool(self.property("selected"))
+
+    def set_summary(self, summary: Optional[OrderSummary]):
+        """Показать состав и сумму заказа"""
+        self.summary = summary
+        if summary is None:
+            self.articles_label.setText("Состав заказа: загружается...")
+            self.total_label.setText("Сумма заказа: -")
+            return
+        articles = ", ".join(summary.articles) or "нет товаров"
+        self.articles_label.setText(
+            f"Состав заказа: {articles} (товаров: {summary.items_count})"
+        )
+        self.total_label.setText(f"Сумма заказа: {summary.total:.2f} ₽")
 
     def setup_ui(self):
         """Настройка интерфейса карточки"""
@@ -86,6 +99,12 @@ class OrderCard(QFrame):
         date_label = QLabel(f"Дата заказа: {date_text}")
         info_layout.addWidget(date_label)
 
+        self.articles_label = QLabel()
+        info_layout.addWidget(self.articles_label)
+        self.total_label = QLabel()
+        info_layout.addWidget(self.total_label)
+        self.set_summary(self.summary)
+
         info_layout.addStretch()
         main_layout.addWidget(info_panel, stretch=2)
 
@@ -110,7 +129,3 @@ class OrderCard(QFrame):
         main_layout.addWidget(delivery_panel, stretch=1)
         delivery_panel.setMaximumWidth(200)
         delivery_panel.setMinimumWidth(200)
-
-    def apply_styles(self):
-        """Применить стили к карточке"""
-        self.setStyleSheet(STYLES.get("ORDER_CARD_STYLE", ""))
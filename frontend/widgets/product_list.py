@@ -0,0 +1,352 @@
+"""
+Список товаров на основе модели и делегата: карточки по макету
+product_card.png рисуются делегатом только для видимых строк,
+фото подгружаются в фоне через ImageService
+"""
+
+from PySide6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PySide6.QtGui import QColor, QFont, QPen
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QRect,
+    QSize,
+    Qt,
+    Signal,
+)
+from backend.internal.entity.good import Good
+from frontend.services.goods_service import GoodsService
+from frontend.utils.image_service import THUMBNAIL_SIZE, ImageService, image_service
+from typing import Dict, List, Optional
+
+# Роль данных модели, по которой делегат получает товар
+GOOD_ROLE = Qt.UserRole + 1
+
+CARD_HEIGHT = 180
+CARD_SPACING = 10
+DISCOUNT_PANEL_WIDTH = 150
+PANEL_MARGIN = 5
+TEXT_PADDING = 8
+BIG_DISCOUNT = 15
+
+# Цвета соответствуют стилям PRODUCT_CARD_* в styles.py
+CARD_BACKGROUND = QColor("#FFFFFF")
+CARD_DISCOUNT_BACKGROUND = QColor("#2E8B57")
+CARD_BORDER = QColor("#000000")
+CARD_SELECTED_BORDER = QColor("#7FFF00")
+TEXT_COLOR = QColor("#000000")
+DISCOUNT_TEXT_COLOR = QColor("#FFFFFF")
+OLD_PRICE_COLOR = QColor("#FF0000")
+COUNT_ZERO_BACKGROUND = QColor("#ADD8E6")
+FONT_FAMILY = "Times New Roman"
+
+
+class ProductListModel(QAbstractListModel):
+    """Модель списка товаров с индексом строк по ID товара"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._goods: List[Good] = []
+        self._rows: Dict[int, int] = {}
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._goods)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._goods):
+            return None
+        good = self._goods[index.row()]
+        if role == GOOD_ROLE:
+            return good
+        if role == Qt.DisplayRole:
+            return good.name
+        return None
+
+    def goods(self) -> List[Good]:
+        """Товары в порядке строк (список не копируется)"""
+        return self._goods
+
+    def set_goods(self, goods: List[Good]):
+        """Заменить список товаров"""
+        self.beginResetModel()
+        self._goods = list(goods)
+        self._rows = {good.id: row for row, good in enumerate(self._goods)}
+        self.endResetModel()
+
+    def append_goods(self, goods: List[Good]):
+        """Добавить товары в конец списка"""
+        if not goods:
+            return
+        first = len(self._goods)
+        self.beginInsertRows(QModelIndex(), first, first + len(goods) - 1)
+        self._goods.extend(goods)
+        for row, good in enumerate(goods, first):
+            self._rows[good.id] = row
+        self.endInsertRows()
+
+    def good_at(self, row: int) -> Optional[Good]:
+        """Товар в строке row"""
+        if 0 <= row < len(self._goods):
+            return self._goods[row]
+        return None
+
+    def row_of(self, good_id: int) -> Optional[int]:
+        """Строка товара по ID"""
+        return self._rows.get(good_id)
+
+    def put_good(self, good: Good, row: int):
+        """
+        Показать товар в строке row: заменить его на месте, перенести
+        или вставить. Выделение и прокрутка представления сохраняются
+        """
+        old_row = self._rows.get(good.id)
+        if old_row is None:
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._goods.insert(row, good)
+            self.endInsertRows()
+            self._reindex(row, len(self._goods) - 1)
+            return
+
+        if old_row != row:
+            # beginMoveRows принимает позицию назначения до удаления строки
+            destination = row + 1 if row > old_row else row
+            self.beginMoveRows(
+                QModelIndex(), old_row, old_row, QModelIndex(), destination
+            )
+            self._goods.insert(row, self._goods.pop(old_row))
+            self.endMoveRows()
+            self._reindex(min(old_row, row), max(old_row, row))
+
+        self._goods[row] = good
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def remove_good(self, good_id: int) -> bool:
+        """Убрать товар из списка; False, если его там нет"""
+        row = self._rows.pop(good_id, None)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._goods[row]
+        self.endRemoveRows()
+        self._reindex(row, len(self._goods) - 1)
+        return True
+
+    def _reindex(self, first: int, last: int):
+        for row in range(first, last + 1):
+            self._rows[self._goods[row].id] = row
+
+
+class ProductCardDelegate(QStyledItemDelegate):
+    """Рисует карточку товара: фото, описание и действующую скидку"""
+
+    def __init__(
+        self,
+        goods_service: Optional[GoodsService] = None,
+        images: Optional[ImageService] = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.goods_service = goods_service
+        self.images = images or image_service()
+        self._font = QFont(FONT_FAMILY)
+        self._bold_font = QFont(FONT_FAMILY)
+        self._bold_font.setBold(True)
+        self._discount_font = QFont(FONT_FAMILY)
+        self._discount_font.setBold(True)
+        self._discount_font.setPointSize(14)
+        self._strike_font = QFont(FONT_FAMILY)
+        self._strike_font.setStrikeOut(True)
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(option.rect.width(), CARD_HEIGHT + CARD_SPACING)
+
+    def final_price(self, good: Good) -> float:
+        """Цена с учетом скидки"""
+        price = float(good.price)
+        if not self.goods_service:
+            return price
+        return self.goods_service.calculate_price_with_discount(price, good.discount)
+
+    def paint(self, painter, option, index):
+        good = index.data(GOOD_ROLE)
+        if good is None:
+            return
+
+        discount = float(good.discount) if good.discount else 0.0
+        big_discount = discount > BIG_DISCOUNT
+        text_color = DISCOUNT_TEXT_COLOR if big_discount else TEXT_COLOR
+        selected = bool(option.state & QStyle.State_Selected)
+
+        painter.save()
+        card = option.rect.adjusted(0, 0, -1, -CARD_SPACING - 1)
+        painter.fillRect(
+            card, CARD_DISCOUNT_BACKGROUND if big_discount else CARD_BACKGROUND
+        )
+
+        photo_rect = QRect(
+            card.left() + PANEL_MARGIN,
+            card.top() + PANEL_MARGIN,
+            THUMBNAIL_SIZE + 2 * TEXT_PADDING,
+            card.height() - 2 * PANEL_MARGIN,
+        )
+        discount_rect = QRect(
+            card.right() - PANEL_MARGIN - DISCOUNT_PANEL_WIDTH,
+            photo_rect.top(),
+            DISCOUNT_PANEL_WIDTH,
+            photo_rect.height(),
+        )
+        info_rect = QRect(
+            photo_rect.right() + PANEL_MARGIN,
+            photo_rect.top(),
+            discount_rect.left() - photo_rect.right() - 2 * PANEL_MARGIN,
+            photo_rect.height(),
+        )
+
+        painter.setPen(QPen(CARD_BORDER, 2))
+        painter.drawRect(photo_rect)
+        painter.drawRect(discount_rect)
+        painter.setPen(QPen(CARD_BORDER, 1))
+        painter.drawRect(info_rect)
+
+        pixmap = self.images.thumbnail(good.image)
+        if pixmap is not None:
+            painter.drawPixmap(
+                photo_rect.center().x() - pixmap.width() // 2,
+                photo_rect.center().y() - pixmap.height() // 2,
+                pixmap,
+            )
+        else:
+            painter.setPen(text_color)
+            painter.drawText(photo_rect, Qt.AlignCenter, "Фото")
+
+        self._paint_info(painter, info_rect, good, discount, text_color)
+        self._paint_discount(painter, discount_rect, discount, text_color)
+
+        border = QPen(CARD_SELECTED_BORDER if selected else CARD_BORDER)
+        border.setWidth(2 if selected else 1)
+        painter.setPen(border)
+        painter.drawRect(card)
+        painter.restore()
+
+    def _paint_info(self, painter, rect: QRect, good: Good, discount, text_color):
+        """Текстовая часть карточки"""
+        painter.setFont(self._font)
+        line_height = painter.fontMetrics().height() + 2
+        x = rect.left() + TEXT_PADDING
+        width = rect.width() - 2 * TEXT_PADDING
+        y = rect.top() + TEXT_PADDING
+
+        def draw_line(text: str, font: QFont, color: QColor = text_color):
+            nonlocal y
+            painter.setFont(font)
+            painter.setPen(color)
+            elided = painter.fontMetrics().elidedText(text, Qt.ElideRight, width)
+            painter.drawText(
+                QRect(x, y, width, line_height), Qt.AlignLeft | Qt.AlignVCenter, elided
+            )
+            y += line_height
+
+        draw_line(f"{good.category or ''} | {good.name}", self._bold_font)
+        if good.description:
+            draw_line(f"Описание товара: {good.description}", self._font)
+        if good.manufacturer:
+            draw_line(f"Производитель: {good.manufacturer}", self._font)
+        if good.provider:
+            draw_line(f"Поставщик: {good.provider}", self._font)
+
+        price = float(good.price)
+        final_price = self.final_price(good)
+        painter.setFont(self._font)
+        painter.setPen(text_color)
+        label = "Цена: "
+        painter.drawText(QRect(x, y, width, line_height), Qt.AlignVCenter, label)
+        price_x = x + painter.fontMetrics().horizontalAdvance(label)
+        if discount > 0:
+            old_price = f"{price:.2f}"
+            painter.setFont(self._strike_font)
+            painter.setPen(OLD_PRICE_COLOR)
+            painter.drawText(
+                QRect(price_x, y, width, line_height), Qt.AlignVCenter, old_price
+            )
+            price_x += painter.fontMetrics().horizontalAdvance(old_price + " ")
+            painter.setFont(self._font)
+            painter.setPen(text_color)
+            painter.drawText(
+                QRect(price_x, y, width, line_height),
+                Qt.AlignVCenter,
+                f"{final_price:.2f}",
+            )
+        else:
+            painter.drawText(
+                QRect(price_x, y, width, line_height),
+                Qt.AlignVCenter,
+                str(final_price),
+            )
+        y += line_height
+
+        draw_line(f"Единица измерения: {good.unit_of_measurement}", self._font)
+
+        count_text = f"Количество на складе: {good.count}"
+        if good.count == 0:
+            painter.setFont(self._font)
+            count_width = painter.fontMetrics().horizontalAdvance(count_text) + 4
+            painter.fillRect(
+                QRect(x, y, min(count_width, width), line_height),
+                COUNT_ZERO_BACKGROUND,
+            )
+            draw_line(count_text, self._font, TEXT_COLOR)
+        else:
+            draw_line(count_text, self._font)
+
+    def _paint_discount(self, painter, rect: QRect, discount, text_color):
+        """Панель действующей скидки"""
+        painter.setPen(text_color)
+        painter.setFont(self._font)
+        title_rect = QRect(rect.left(), rect.top() + TEXT_PADDING, rect.width(), 20)
+        painter.drawText(title_rect, Qt.AlignCenter, "Действующая скидка")
+
+        value_rect = QRect(rect.left(), title_rect.bottom() + 4, rect.width(), 24)
+        if discount > 0:
+            painter.setFont(self._discount_font)
+            painter.drawText(value_rect, Qt.AlignCenter, f"{discount}%")
+        else:
+            painter.drawText(value_rect, Qt.AlignCenter, "Нет")
+
+
+class ProductListView(QListView):
+    """Список карточек товаров; виджеты для строк не создаются"""
+
+    good_double_clicked = Signal(object)
+
+    def __init__(self, goods_service: Optional[GoodsService] = None, parent=None):
+        super().__init__(parent)
+        self.product_model = ProductListModel(self)
+        self.setModel(self.product_model)
+        self.images = image_service()
+        self.images.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self.setItemDelegate(ProductCardDelegate(goods_service, self.images, self))
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.doubleClicked.connect(self._on_double_clicked)
+
+    def _on_double_clicked(self, index: QModelIndex):
+        good = self.product_model.good_at(index.row())
+        if good is not None:
+            self.good_double_clicked.emit(good)
+
+    def _on_thumbnail_ready(self, image: str):
+        # Перерисовать видимые карточки: загрузка запрашивается только
+        # из paint, то есть для строк в видимой области
+        self.viewport().update()
+
+    def selected_good(self) -> Optional[Good]:
+        """Выбранный товар"""
+        indexes = self.selectionModel().selectedIndexes()
+        if not indexes:
+            return None
+        return self.product_model.good_at(indexes[0].row())
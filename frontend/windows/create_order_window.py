@@ -17,16 +17,19 @@ from PySide6.QtWidgets import (
     QHeaderView,
     QGroupBox,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QIcon
 import os
+import uuid
 from frontend.widgets.custom_combo import CustomComboBox
 from frontend.services.orders_service import OrdersService
 from frontend.services.goods_service import GoodsService
-from frontend.utils.async_helper import run_async_sync
+from frontend.utils.async_helper import AsyncTask, run_async
+from frontend.utils.search_controller import SearchController
 from frontend.utils.styles import STYLES
 from backend.internal.entity.user import User
 from backend.internal.entity.good import Good
+from backend.internal.usecase.orders_usecase import RESERVATION_REFRESH_INTERVAL
 from typing import Dict, List
 
 
@@ -44,6 +47,27 @@ class CreateOrderWindow(QMainWindow):
         self.user = user
         self.cart: List[Dict] = []
         self.goods: List[Good] = []
+        # Резерв товаров корзины действует RESERVATION_TTL и продлевается
+        # таймером, пока окно открыто
+        self.cart_id = str(uuid.uuid4())
+        self.available: Dict[int, int] = {}
+        # Количество в корзине меняется сразу по нажатию; резерв товара
+        # догоняет его одним запросом за раз: подтвержденное количество
+        # и выполняемые запросы резерва по товарам
+        self._reserved: Dict[int, int] = {}
+        self._reserving: Dict[int, AsyncTask] = {}
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(
+            int(RESERVATION_REFRESH_INTERVAL.total_seconds() * 1000)
+        )
+        self._refresh_timer.timeout.connect(self.refresh_reservation)
+        self._refresh_timer.start()
+        self._order_created = False
+        self._closed = False
+        self._total_task = None
+        self.search_controller = SearchController(
+            self.fetch_goods, self.on_goods_loaded, self.on_goods_error, parent=self
+        )
         self.setup_ui()
         self.apply_styles()
         self.load_goods()
@@ -142,10 +166,10 @@ class CreateOrderWindow(QMainWindow):
 
         buttons_layout = QHBoxLayout()
 
-        create_button = QPushButton("Создать заказ")
-        create_button.setStyleSheet(STYLES["BUTTON_STYLE"])
-        create_button.clicked.connect(self.create_order)
-        buttons_layout.addWidget(create_button)
+        self.create_button = QPushButton("Создать заказ")
+        self.create_button.setStyleSheet(STYLES["BUTTON_STYLE"])
+        self.create_button.clicked.connect(self.create_order)
+        buttons_layout.addWidget(self.create_button)
 
         cancel_button = QPushButton("Отмена")
         cancel_button.setStyleSheet(STYLES["BUTTON_STYLE"])
@@ -157,7 +181,6 @@ class CreateOrderWindow(QMainWindow):
 
     def apply_styles(self):
         """Применить стили"""
-        self.setStyleSheet(STYLES["WINDOW_STYLE"])
         for button in self.findChildren(QPushButton):
             button.setStyleSheet(STYLES["BUTTON_STYLE"])
         for input_widget in self.findChildren(QLineEdit):
@@ -167,10 +190,34 @@ class CreateOrderWindow(QMainWindow):
 
     def load_goods(self):
         """Загрузить товары"""
-        try:
-            self.goods = run_async_sync(self.goods_service.get_all_goods())
-            self.update_goods_table()
-        except Exception as e:
+        self.search_controller.run_now(self.search_input.text())
+
+    async def fetch_goods(self, text: str):
+        """
+        Запрос товаров (все товары или результаты поиска) и их доступного
+        остатка с учетом резервов других корзин
+        """
+        if not text.strip():
+            goods = await self.goods_service.get_all_goods()
+        else:
+            goods = await self.goods_service.search_goods(text, self.user)
+        available = await self.orders_service.get_available_stock(
+            [good.id for good in goods], self.cart_id
+        )
+        return goods, available
+
+    def on_goods_loaded(self, result):
+        """Показать загруженные товары"""
+        self.goods, self.available = result
+        self.update_goods_table()
+
+    def on_goods_error(self, e: Exception):
+        """Обработка ошибки загрузки или поиска товаров"""
+        from backend.internal.usecase.authorization_usecase import PermissionError
+
+        if isinstance(e, PermissionError):
+            QMessageBox.warning(self, "Ошибка доступа", str(e))
+        else:
             QMessageBox.critical(
                 self, "Ошибка", f"Ошибка при загрузке товаров: {str(e)}"
             )
@@ -189,7 +236,8 @@ class CreateOrderWindow(QMainWindow):
 
             quantity_spin = QSpinBox()
             quantity_spin.setMinimum(1)
-            quantity_spin.setMaximum(good.count if good.count > 0 else 999)
+            available = self.available.get(good.id, good.count)
+            quantity_spin.setMaximum(available if available > 0 else 999)
             quantity_spin.setValue(1)
             self.goods_table.setCellWidget(row, 4, quantity_spin)
 
@@ -200,23 +248,8 @@ class CreateOrderWindow(QMainWindow):
             self.goods_table.setCellWidget(row, 5, add_button)
 
     def on_search_changed(self, text):
-        """Обработка изменения поискового запроса"""
-        if not text.strip():
-            self.load_goods()
-            return
-
-        try:
-            self.goods = run_async_sync(
-                self.goods_service.search_goods(text, self.user)
-            )
-            self.update_goods_table()
-        except Exception as e:
-            from backend.internal.usecase.authorization_usecase import PermissionError
-
-            if isinstance(e, PermissionError):
-                QMessageBox.warning(self, "Ошибка доступа", str(e))
-            else:
-                QMessageBox.critical(self, "Ошибка", f"Ошибка при поиске: {str(e)}")
+        """Обработка изменения поискового запроса: поиск после паузы ввода"""
+        self.search_controller.set_query(text)
 
     def add_to_cart(self, good: Good, quantity: int):
         """Добавить товар в корзину"""
@@ -224,21 +257,90 @@ class CreateOrderWindow(QMainWindow):
             QMessageBox.warning(self, "Ошибка", "Количество должно быть больше 0")
             return
 
-        if good.count < quantity:
-            QMessageBox.warning(
-                self, "Ошибка", f"Недостаточно товара. В наличии: {good.count}"
-            )
-            return
+        self._set_cart_quantity(good, self._cart_quantity(good.id) + quantity)
+        self._sync_reservation(good)
 
+    def _cart_quantity(self, goods_id: int) -> int:
+        """Количество товара в корзине"""
         for item in self.cart:
-            if item["good"].id == good.id:
-                item["quantity"] += quantity
-                self.update_cart_table()
-                return
+            if item["good"].id == goods_id:
+                return item["quantity"]
+        return 0
 
-        self.cart.append({"good": good, "quantity": quantity})
+    def _set_cart_quantity(self, good: Good, quantity: int):
+        """Задать количество товара в корзине (0 убирает товар)"""
+        for row, item in enumerate(self.cart):
+            if item["good"].id == good.id:
+                if quantity > 0:
+                    item["quantity"] = quantity
+                else:
+                    del self.cart[row]
+                break
+        else:
+            if quantity > 0:
+                self.cart.append({"good": good, "quantity": quantity})
         self.update_cart_table()
 
+    def _sync_reservation(self, good: Good):
+        """
+        Привести резерв товара к количеству в корзине. Пока выполняется
+        предыдущий запрос по этому товару, новый не отправляется: ответы
+        не могут прийти не по порядку
+        """
+        if self._closed or good.id in self._reserving:
+            return
+        quantity = self._cart_quantity(good.id)
+        if quantity == self._reserved.get(good.id, 0):
+            return
+        self._reserving[good.id] = run_async(
+            self.orders_service.reserve_goods(
+                self.cart_id, good.id, quantity, self.user
+            ),
+            lambda reservation: self.on_goods_reserved(good, quantity),
+            lambda e: self.on_reserve_error(good, e),
+            owner=self,
+        )
+
+    def on_goods_reserved(self, good: Good, quantity: int):
+        """Резерв подтвержден: догнать изменения, сделанные за время запроса"""
+        self._reserving.pop(good.id, None)
+        if quantity > 0:
+            self._reserved[good.id] = quantity
+        else:
+            self._reserved.pop(good.id, None)
+        self._sync_reservation(good)
+
+    def on_reserve_error(self, good: Good, e: Exception):
+        """Резерв не удался: вернуть в корзине подтвержденное количество"""
+        self._reserving.pop(good.id, None)
+        if self._closed:
+            return
+        self._set_cart_quantity(good, self._reserved.get(good.id, 0))
+        QMessageBox.warning(self, "Ошибка", str(e))
+
+    def refresh_reservation(self):
+        """Продлить резерв корзины, пока окно открыто"""
+        if not self._reserved:
+            return
+        run_async(
+            self.orders_service.extend_reservation(self.cart_id),
+            self.on_reservation_extended,
+            lambda e: QMessageBox.warning(
+                self, "Ошибка", f"Ошибка при продлении резерва: {str(e)}"
+            ),
+            owner=self,
+        )
+
+    def on_reservation_extended(self, goods_ids: List[int]):
+        """Зарезервировать заново товары, резерв которых успел истечь"""
+        extended = set(goods_ids)
+        for item in list(self.cart):
+            good = item["good"]
+            if good.id in self._reserving or good.id in extended:
+                continue
+            self._reserved.pop(good.id, None)
+            self._sync_reservation(good)
+
     def update_cart_table(self):
         """Обновить таблицу корзины"""
         self.cart_table.setRowCount(len(self.cart))
@@ -247,15 +349,14 @@ class CreateOrderWindow(QMainWindow):
             for item in self.cart
         ]
 
-        try:
-            total = run_async_sync(
-                self.orders_service.calculate_order_total(order_id=None, items=items)
-            )
-        except Exception as e:
-            total = 0.0
-            QMessageBox.warning(
-                self, "Ошибка расчета", f"Ошибка при расчете суммы: {str(e)}"
-            )
+        if self._total_task is not None:
+            self._total_task.cancel()
+        self._total_task = run_async(
+            self.orders_service.calculate_order_total(order_id=None, items=items),
+            self.on_total_calculated,
+            self.on_total_error,
+            owner=self,
+        )
 
         for row, item in enumerate(self.cart):
             good = item["good"]
@@ -281,28 +382,43 @@ class CreateOrderWindow(QMainWindow):
             )
             self.cart_table.setCellWidget(row, 5, remove_button)
 
+    def on_total_calculated(self, total: float):
+        """Показать сумму заказа"""
+        self._total_task = None
         self.total_label.setText(f"Итого: {total:.2f} ₽")
 
+    def on_total_error(self, e: Exception):
+        """Обработка ошибки расчета суммы заказа"""
+        self._total_task = None
+        self.total_label.setText("Итого: 0.00 ₽")
+        QMessageBox.warning(
+            self, "Ошибка расчета", f"Ошибка при расчете суммы: {str(e)}"
+        )
+
     def remove_from_cart(self, row: int):
         """Удалить товар из корзины"""
         if 0 <= row < len(self.cart):
-            self.cart.pop(row)
-            self.update_cart_table()
+            good = self.cart[row]["good"]
+            self._set_cart_quantity(good, 0)
+            self._sync_reservation(good)
 
     def load_pick_up_points(self):
         """Загрузить пункты выдачи"""
-        try:
-            pick_up_points = run_async_sync(
-                self.orders_service.get_all_pick_up_points()
-            )
-            self.pick_up_combo.clear()
-            self.pick_up_combo.addItem("Выберите пункт выдачи", None)
-            for point in pick_up_points:
-                self.pick_up_combo.addItem(point.full_address, point.id)
-        except Exception as e:
-            QMessageBox.critical(
+        self.pick_up_combo.clear()
+        self.pick_up_combo.addItem("Выберите пункт выдачи", None)
+        run_async(
+            self.orders_service.get_all_pick_up_points(),
+            self.on_pick_up_points_loaded,
+            lambda e: QMessageBox.critical(
                 self, "Ошибка", f"Ошибка при загрузке пунктов выдачи: {str(e)}"
-            )
+            ),
+            owner=self,
+        )
+
+    def on_pick_up_points_loaded(self, pick_up_points):
+        """Заполнить список пунктов выдачи"""
+        for point in pick_up_points:
+            self.pick_up_combo.addItem(point.full_address, point.id)
 
     def create_order(self):
         """Создать заказ"""
@@ -315,26 +431,63 @@ class CreateOrderWindow(QMainWindow):
             QMessageBox.warning(self, "Ошибка", "Выберите пункт выдачи")
             return
 
-        try:
-            items = [
-                {"goods_id": item["good"].id, "quantity": item["quantity"]}
-                for item in self.cart
-            ]
-
-            order = run_async_sync(
-                self.orders_service.create_order(
-                    user=self.user,
-                    pick_up_point_id=pick_up_point_id,
-                    recipient_code=self.code_input.text().strip() or None,
-                    items=items,
-                )
+        if self._reserving:
+            QMessageBox.warning(
+                self, "Ошибка", "Дождитесь резервирования товаров в корзине"
             )
+            return
 
-            QMessageBox.information(self, "Успех", f"Заказ #{order.id} создан успешно!")
-            self.close()
-            if self.parent():
-                self.parent().load_orders()
-        except Exception as e:
-            QMessageBox.critical(
-                self, "Ошибка", f"Ошибка при создании заказа: {str(e)}"
+        items = [
+            {"goods_id": item["good"].id, "quantity": item["quantity"]}
+            for item in self.cart
+        ]
+
+        self.create_button.setEnabled(False)
+        run_async(
+            self.orders_service.create_order(
+                user=self.user,
+                pick_up_point_id=pick_up_point_id,
+                recipient_code=self.code_input.text().strip() or None,
+                items=items,
+                cart_id=self.cart_id,
+            ),
+            self.on_order_created,
+            self.on_create_error,
+            owner=self,
+        )
+
+    def on_order_created(self, order):
+        """Закрыть окно и показать созданный заказ в списке"""
+        self._order_created = True
+        QMessageBox.information(self, "Успех", f"Заказ #{order.id} создан успешно!")
+        self.close()
+        if self.parent() and hasattr(self.parent(), "apply_saved_order"):
+            self.parent().apply_saved_order(order)
+
+    def on_create_error(self, e: Exception):
+        """Обработка ошибки создания заказа"""
+        self.create_button.setEnabled(True)
+        QMessageBox.critical(self, "Ошибка", f"Ошибка при создании заказа: {str(e)}")
+
+    async def _release_reservation(self, pending: List[AsyncTask]):
+        """
+        Снять резерв корзины после выполняемых запросов резерва: иначе
+        запрос, завершившийся позже, оставил бы резерв до истечения срока
+        """
+        for task in pending:
+            await task.wait()
+        await self.orders_service.release_reservation(self.cart_id)
+
+    def closeEvent(self, event):
+        """Снять резерв товаров, если заказ не оформлен"""
+        self._refresh_timer.stop()
+        self._closed = True
+        if (self._reserved or self._reserving) and not self._order_created:
+            run_async(
+                self._release_reservation(list(self._reserving.values())),
+                on_error=lambda e: QMessageBox.warning(
+                    self, "Ошибка", f"Ошибка при снятии резерва: {str(e)}"
+                ),
+                owner=self,
             )
+        super().closeEvent(event)
@@ -20,7 +20,8 @@ from frontend.widgets.custom_combo import CustomComboBox
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QPixmap, QIcon
 from frontend.services.goods_service import GoodsService
-from frontend.utils.async_helper import run_async_sync
+from frontend.utils.image_service import image_service
+from frontend.utils.async_helper import run_async
 from frontend.utils.styles import STYLES
 from backend.internal.entity.good import Good
 from backend.internal.entity.user import User
@@ -185,10 +186,10 @@ class GoodFormWindow(QMainWindow):
 
         buttons_layout = QHBoxLayout()
 
-        save_button = QPushButton("Сохранить")
-        save_button.setStyleSheet(STYLES["BUTTON_STYLE"])
-        save_button.clicked.connect(self.save_good)
-        buttons_layout.addWidget(save_button)
+        self.save_button = QPushButton("Сохранить")
+        self.save_button.setStyleSheet(STYLES["BUTTON_STYLE"])
+        self.save_button.clicked.connect(self.save_good)
+        buttons_layout.addWidget(self.save_button)
 
         cancel_button = QPushButton("Отмена")
         cancel_button.setStyleSheet(STYLES["BUTTON_STYLE"])
@@ -200,27 +201,39 @@ class GoodFormWindow(QMainWindow):
 
     def load_categories_and_manufacturers(self):
         """Загрузить списки категорий и производителей"""
-        from frontend.utils.async_helper import run_async_sync
-
-        try:
-            self.categories = run_async_sync(self.goods_service.get_all_categories())
-            self.manufacturers = run_async_sync(
-                self.goods_service.get_all_manufacturers()
-            )
-
-            self.category_combo.clear()
-            for category in sorted(self.categories):
-                self.category_combo.addItem(category)
+        run_async(
+            self.fetch_categories_and_manufacturers(),
+            self.on_categories_and_manufacturers_loaded,
+            lambda e: print(f"Ошибка при загрузке категорий и производителей: {e}"),
+            owner=self,
+        )
 
-            self.manufacturer_combo.clear()
-            for manufacturer in sorted(self.manufacturers):
-                self.manufacturer_combo.addItem(manufacturer)
-        except Exception as e:
-            print(f"Ошибка при загрузке категорий и производителей: {e}")
+    async def fetch_categories_and_manufacturers(self):
+        """Категории и производители товаров"""
+        categories = await self.goods_service.get_all_categories()
+        manufacturers = await self.goods_service.get_all_manufacturers()
+        return categories, manufacturers
+
+    def on_categories_and_manufacturers_loaded(self, result):
+        """Заполнить списки, сохранив уже введенные значения"""
+        self.categories, self.manufacturers = result
+
+        for combo, values in (
+            (self.category_combo, self.categories),
+            (self.manufacturer_combo, self.manufacturers),
+        ):
+            current_text = combo.currentText()
+            combo.clear()
+            for value in sorted(values):
+                combo.addItem(value)
+            index = combo.findText(current_text)
+            if index >= 0:
+                combo.setCurrentIndex(index)
+            else:
+                combo.setCurrentText(current_text)
 
     def apply_styles(self):
         """Применить стили"""
-        self.setStyleSheet(STYLES["WINDOW_STYLE"])
         for button in self.findChildren(QPushButton):
             button.setStyleSheet(STYLES["BUTTON_STYLE"])
 
@@ -370,6 +383,8 @@ class GoodFormWindow(QMainWindow):
                                 os.remove(self.image_path)
                             except Exception as e:
                                 print(f"Ошибка при удалении временного файла: {e}")
+                    # Файл мог быть заменен под тем же именем
+                    image_service().invalidate(final_image_path)
             if self.is_edit_mode:
                 if (
                     final_image_path
@@ -382,55 +397,70 @@ class GoodFormWindow(QMainWindow):
                             os.remove(old_full_path)
                         except Exception as e:
                             print(f"Ошибка при удалении старого изображения: {e}")
-                run_async_sync(
-                    self.goods_service.update_good_data(
-                        self.good.id,
-                        article,
-                        name,
-                        unit,
-                        price,
-                        provider,
-                        manufacturer,
-                        category,
-                        discount,
-                        count,
-                        description,
-                        final_image_path,
-                        self.user,
-                    )
+                coro = self.goods_service.update_good_data(
+                    self.good.id,
+                    article,
+                    name,
+                    unit,
+                    price,
+                    provider,
+                    manufacturer,
+                    category,
+                    discount,
+                    count,
+                    description,
+                    final_image_path,
+                    self.user,
                 )
-                QMessageBox.information(self, "Успех", "Товар обновлен")
+                message = "Товар обновлен"
             else:
-                run_async_sync(
-                    self.goods_service.create_good(
-                        article,
-                        name,
-                        unit,
-                        price,
-                        provider,
-                        manufacturer,
-                        category,
-                        discount,
-                        count,
-                        description,
-                        final_image_path,
-                        self.user,
-                    )
+                coro = self.goods_service.create_good(
+                    article,
+                    name,
+                    unit,
+                    price,
+                    provider,
+                    manufacturer,
+                    category,
+                    discount,
+                    count,
+                    description,
+                    final_image_path,
+                    self.user,
                 )
-                QMessageBox.information(self, "Успех", "Товар добавлен")
+                message = "Товар добавлен"
+        except Exception as e:
+            self.on_save_error(e)
+            return
 
-            self.close()
-            if self.parent():
-                self.parent().load_goods()
-        except ValueError as e:
+        self.save_button.setEnabled(False)
+        run_async(
+            coro,
+            lambda good: self.on_saved(good, message),
+            self.on_save_error,
+            owner=self,
+        )
+
+    def on_saved(self, good: Good, message: str):
+        """Закрыть форму и показать сохраненный товар в списке"""
+        QMessageBox.information(self, "Успех", message)
+        self.close()
+        if self.parent() and hasattr(self.parent(), "apply_saved_good"):
+            self.parent().apply_saved_good(good)
+
+    def on_save_error(self, e: Exception):
+        """Обработка ошибки сохранения товара"""
+        self.save_button.setEnabled(True)
+        if isinstance(e, ValueError):
             QMessageBox.warning(self, "Ошибка", str(e))
-        except Exception as e:
-            from backend.internal.usecase.authorization_usecase import PermissionError
+            return
 
-            if isinstance(e, PermissionError) or type(e).__name__ == "PermissionError":
-                QMessageBox.warning(self, "Ошибка доступа", str(e))
-            else:
-                error_msg = (
-                    f"Ошибка при сохранении: {str(e)}\nТип ошибки: {type(e).__name__}"
-                )
-                QMessageBox.critical(self, "Ошибка", error_msg)
+        from backend.internal.usecase.authorization_usecase import PermissionError
+
+        if isinstance(e, PermissionError) or type(e).__name__ == "PermissionError":
+            QMessageBox.warning(self, "Ошибка доступа", str(e))
+        else:
+            error_msg = (
+                f"Ошибка при сохранении: {str(e)}\nТип ошибки: {type(e).__name__}"
+            )
+            QMessageBox.critical(self, "Ошибка", error_msg)
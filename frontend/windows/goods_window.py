@@ -10,40 +10,57 @@ from PySide6.QtWidgets import (
     QLineEdit,
     QLabel,
     QMessageBox,
-    QScrollArea,
-    QApplication,
+    QCompleter,
 )
 from frontend.widgets.custom_combo import CustomComboBox
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import QTimer, QStringListModel, Qt
 from frontend.services.goods_service import GoodsService
-from frontend.utils.async_helper import run_async_sync
+from frontend.utils.async_helper import run_async
+from frontend.utils.search_controller import SearchController
 from frontend.utils.styles import STYLES
 from frontend.windows.good_form_window import GoodFormWindow
-from frontend.widgets.product_card import ProductCard
+from frontend.widgets.product_list import ProductListView
 from backend.internal.entity.user import User
-from backend.internal.entity.good import Good
+from backend.internal.entity.good import Good, SEARCH_FIELDS
 from typing import Optional
+import bisect
 
 
 class GoodsWindow(QWidget):
+    PAGE_SIZE = 50
+    SCROLL_THRESHOLD = 300
+
     def __init__(self, goods_service: GoodsService, user: Optional[User] = None):
         super().__init__()
         self.goods_service = goods_service
         self.user = user
-        self.goods: list[Good] = []
         self.providers: list[str] = []
         self.current_provider: Optional[str] = None
         self.current_sort: Optional[str] = None
         self.current_search: str = ""
         self._edit_window = None
+        self._has_more = False
+        self._page_task = None
+        self.search_controller = SearchController(
+            self.fetch_first_page,
+            self.on_first_page_loaded,
+            self.on_page_error,
+            parent=self,
+        )
+        self.suggest_controller = SearchController(
+            lambda text: self.goods_service.suggest_goods(text, user=self.user),
+            self.on_suggestions_loaded,
+            lambda e: print(f"Ошибка при загрузке подсказок: {e}"),
+            parent=self,
+        )
         self.setup_ui()
-        try:
-            self.load_providers()
-            self.load_goods()
-        except Exception as e:
-            QMessageBox.critical(
-                self, "Ошибка", f"Ошибка при загрузке товаров: {str(e)}"
-            )
+        self.load_providers()
+        self.load_goods()
+
+    @property
+    def goods(self) -> list[Good]:
+        """Загруженные товары в порядке списка"""
+        return self.product_view.product_model.goods()
 
     def setup_ui(self):
         """Настройка интерфейса"""
@@ -66,10 +83,19 @@ class GoodsWindow(QWidget):
 
             self.search_input = QLineEdit()
             self.search_input.setPlaceholderText("Введите текст для поиска")
-            self.search_input.textChanged.connect(self.on_filter_changed)
+            self.search_input.textChanged.connect(self.on_search_changed)
             self.search_input.setStyleSheet(STYLES["INPUT_STYLE"])
             search_layout.addWidget(self.search_input)
 
+            self.search_completer = QCompleter(self)
+            self.search_completer.setModel(QStringListModel(self.search_completer))
+            self.search_completer.setCaseSensitivity(Qt.CaseInsensitive)
+            self.search_completer.setCompletionMode(
+                QCompleter.UnfilteredPopupCompletion
+            )
+            self.search_input.setCompleter(self.search_completer)
+            self.search_input.textEdited.connect(self.update_suggestions)
+
             provider_label = QLabel("Поставщик:")
             provider_label.setStyleSheet(STYLES.get("LABEL_STYLE", ""))
             search_layout.addWidget(provider_label)
@@ -94,19 +120,12 @@ class GoodsWindow(QWidget):
 
             layout.addLayout(search_layout)
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet(STYLES["SCROLL_AREA_STYLE"])
-
-        self.cards_container = QWidget()
-        self.cards_layout = QVBoxLayout()
-        self.cards_layout.setSpacing(10)
-        self.cards_container.setLayout(self.cards_layout)
-
-        self.scroll_area.setWidget(self.cards_container)
-        layout.addWidget(self.scroll_area)
-
-        self.product_cards = []
+        self.product_view = ProductListView(self.goods_service)
+        self.product_view.setStyleSheet(STYLES["PRODUCT_LIST_STYLE"])
+        if self.user and self.user.role == "Администратор":
+            self.product_view.good_double_clicked.connect(self.on_card_double_clicked)
+        layout.addWidget(self.product_view)
+        self.product_view.verticalScrollBar().valueChanged.connect(self.on_scroll)
 
         buttons_layout = QHBoxLayout()
 
@@ -131,99 +150,180 @@ class GoodsWindow(QWidget):
 
     def load_providers(self):
         """Загрузить список поставщиков"""
-        try:
-            self.providers = run_async_sync(self.goods_service.get_all_providers())
-            if hasattr(self, "provider_combo"):
-                current_index = self.provider_combo.currentIndex()
-                self.provider_combo.clear()
-                self.provider_combo.addItem("Все поставщики", None)
-                for provider in sorted(self.providers):
-                    self.provider_combo.addItem(provider, provider)
-
-                if current_index >= 0 and current_index < self.provider_combo.count():
-                    self.provider_combo.setCurrentIndex(current_index)
-        except Exception as e:
-            print(f"Ошибка при загрузке поставщиков: {e}")
+        run_async(
+            self.goods_service.get_all_providers(),
+            self.on_providers_loaded,
+            lambda e: print(f"Ошибка при загрузке поставщиков: {e}"),
+            owner=self,
+        )
 
-    def load_goods(self):
-        """Загрузить товары с учетом фильтров"""
-        try:
-            has_search = self.current_search and self.current_search.strip()
-            has_provider = self.current_provider is not None
-            has_sort = self.current_sort is not None
-
-            has_filters = has_search or has_provider or has_sort
-
-            if has_filters:
-                self.goods = run_async_sync(
-                    self.goods_service.filter_and_sort(
-                        provider=self.current_provider,
-                        sort_by_count=self.current_sort,
-                        search_query=self.current_search if has_search else None,
-                        user=self.user,
-                    )
-                )
-            else:
-                self.goods = run_async_sync(self.goods_service.get_all_goods(self.user))
+    def on_providers_loaded(self, providers: list[str]):
+        """Заполнить список поставщиков"""
+        self.providers = providers
+        if hasattr(self, "provider_combo"):
+            current_provider = self.provider_combo.currentData()
+            self.provider_combo.blockSignals(True)
+            self.provider_combo.clear()
+            self.provider_combo.addItem("Все поставщики", None)
+            for provider in sorted(self.providers):
+                self.provider_combo.addItem(provider, provider)
 
-            self.update_table()
-        except Exception as e:
-            from backend.internal.usecase.authorization_usecase import PermissionError
+            current_index = self.provider_combo.findData(current_provider)
+            if current_index >= 0:
+                self.provider_combo.setCurrentIndex(current_index)
+            self.provider_combo.blockSignals(False)
 
-            if isinstance(e, PermissionError):
-                QMessageBox.warning(self, "Ошибка доступа", str(e))
-            else:
-                QMessageBox.critical(
-                    self, "Ошибка", f"Ошибка при загрузке товаров: {str(e)}"
-                )
-
-    def update_table(self):
-        """Обновить карточки товаров"""
-        while self.cards_layout.count():
-            item = self.cards_layout.takeAt(0)
-            if item:
-                widget = item.widget()
-                if widget:
-                    widget.setParent(None)
-                elif item.spacerItem():
-                    del item
-
-        self.product_cards = []
-
-        for good in self.goods:
-            on_double_click = None
-            if self.user and self.user.role == "Администратор":
-
-                def make_handler(g):
-                    return lambda: self.on_card_double_clicked(g)
-
-                on_double_click = make_handler(good)
-
-            card = ProductCard(
-                good,
-                goods_service=self.goods_service,
-                parent=self.cards_container,
-                on_double_click=on_double_click,
-            )
-            self.product_cards.append(card)
-            self.cards_layout.addWidget(card)
+    def update_suggestions(self, text: str):
+        """Обновить подсказки для строки поиска после паузы ввода"""
+        self.suggest_controller.set_query(text)
 
-        self.cards_layout.addStretch()
+    def on_suggestions_loaded(self, suggestions: list[str]):
+        """Показать подсказки для строки поиска"""
+        self.search_completer.model().setStringList(suggestions)
+        if suggestions:
+            self.search_completer.complete()
 
-        self.cards_container.update()
-        self.scroll_area.update()
-        QApplication.processEvents()
+    def load_goods(self):
+        """Загрузить первую страницу товаров с учетом фильтров"""
+        if self._page_task is not None:
+            self._page_task.cancel()
+            self._page_task = None
+        self.search_controller.run_now(self.current_search)
+
+    def fetch_first_page(self, search: str):
+        """Запрос первой страницы товаров с текущими фильтрами"""
+        return self.goods_service.get_goods_page(
+            limit=self.PAGE_SIZE,
+            after=None,
+            provider=self.current_provider,
+            sort_by_count=self.current_sort,
+            search_query=search if search.strip() else None,
+            user=self.user,
+        )
 
-        if hasattr(self, "scroll_area"):
+    def on_first_page_loaded(self, page: list[Good]):
+        """Показать первую страницу товаров вместо прежнего списка"""
+        self._has_more = len(page) == self.PAGE_SIZE
+        self.product_view.product_model.set_goods(page)
+        self.product_view.scrollToTop()
+        QTimer.singleShot(0, self.fill_viewport)
+
+    def load_next_page(self):
+        """Догрузить следующую страницу товаров"""
+        if (
+            self._page_task is not None
+            or self.search_controller.is_busy()
+            or not self._has_more
+        ):
+            return
 
-            def scroll_to_top():
-                scroll_bar = self.scroll_area.verticalScrollBar()
-                scroll_bar.setValue(0)
+        has_search = self.current_search and self.current_search.strip()
+        after = self._cursor(self.goods[-1]) if self.goods else None
+
+        self._page_task = run_async(
+            self.goods_service.get_goods_page(
+                limit=self.PAGE_SIZE,
+                after=after,
+                provider=self.current_provider,
+                sort_by_count=self.current_sort,
+                search_query=self.current_search if has_search else None,
+                user=self.user,
+            ),
+            self.on_page_loaded,
+            self.on_page_error,
+            owner=self,
+        )
 
-                if self.product_cards:
-                    self.scroll_area.ensureWidgetVisible(self.product_cards[0], 0, 0)
+    def on_page_loaded(self, page: list[Good]):
+        """Добавить загруженную страницу товаров"""
+        self._page_task = None
+        self._has_more = len(page) == self.PAGE_SIZE
+        self.product_view.product_model.append_goods(page)
+        QTimer.singleShot(0, self.fill_viewport)
+
+    def on_page_error(self, e: Exception):
+        """Обработка ошибки загрузки страницы товаров"""
+        self._page_task = None
+        self._has_more = False
+        from backend.internal.usecase.authorization_usecase import PermissionError
+
+        if isinstance(e, PermissionError):
+            QMessageBox.warning(self, "Ошибка доступа", str(e))
+        else:
+            QMessageBox.critical(
+                self, "Ошибка", f"Ошибка при загрузке товаров: {str(e)}"
+            )
 
-            QTimer.singleShot(50, scroll_to_top)
+    def on_scroll(self, value: int):
+        """Догрузка товаров при приближении к концу списка"""
+        scroll_bar = self.product_view.verticalScrollBar()
+        if value >= scroll_bar.maximum() - self.SCROLL_THRESHOLD:
+            self.load_next_page()
+
+    def fill_viewport(self):
+        """Догрузить страницы, пока список не заполнит видимую область"""
+        if self._has_more and self.product_view.verticalScrollBar().maximum() == 0:
+            self.load_next_page()
+
+    def _ranked(self) -> bool:
+        """Список упорядочен по рангу совпадения с поисковым запросом"""
+        return not self.current_sort and bool(self.current_search.strip())
+
+    def _cursor(self, good: Good):
+        """Курсор страницы, следующей за товаром (как ждет get_page)"""
+        if self._ranked():
+            return (good.search_rank, good.id)
+        return (good.count, good.id)
+
+    def _order_key(self, good: Good):
+        """Ключ порядка товаров в списке (как в запросе страницы)"""
+        if self.current_sort == "asc":
+            return (good.count, good.id)
+        if self.current_sort == "desc":
+            return (-good.count, -good.id)
+        if self._ranked():
+            # Поиск только по словам "муж"/"жен" идет без ранга, по id
+            return (-(good.search_rank or 0), good.id)
+        return good.id
+
+    def apply_saved_good(self, good: Good):
+        """
+        Показать созданный или измененный товар без перезагрузки списка:
+        строка товара вставляется, переносится или убирается с учетом
+        фильтра по поставщику и порядка сортировки
+        """
+        model = self.product_view.product_model
+        if good.provider and good.provider not in self.providers:
+            self.load_providers()
+
+        old_row = model.row_of(good.id)
+        if self.current_provider and good.provider != self.current_provider:
+            model.remove_good(good.id)
+        elif old_row is None and self.current_search.strip():
+            # Подходит ли новый товар под полнотекстовый запрос, знает только БД
+            self.load_goods()
+            return
+        elif self._ranked() and any(
+            getattr(model.good_at(old_row), field) != getattr(good, field)
+            for field in SEARCH_FIELDS
+        ):
+            # Ранг товара с измененным текстом тоже знает только БД
+            self.load_goods()
+            return
+        else:
+            if self._ranked():
+                good.search_rank = model.good_at(old_row).search_rank
+            goods = model.goods()
+            row = bisect.bisect_left(goods, self._order_key(good), key=self._order_key)
+            if old_row is not None and old_row < row:
+                row -= 1
+            loaded = len(goods) - (old_row is not None)
+            if row >= loaded and self._has_more:
+                # Место товара за последней загруженной страницей - он придет с ней
+                model.remove_good(good.id)
+            else:
+                model.put_good(good, row)
+        QTimer.singleShot(0, self.fill_viewport)
 
     def on_sort_changed(self, index: int):
         """Обработка изменения сортировки в выпадающем списке"""
@@ -248,6 +348,14 @@ class GoodsWindow(QWidget):
             self.sort_combo.blockSignals(False)
         self.load_goods()
 
+    def on_search_changed(self, text: str):
+        """Поиск по мере ввода: запрос выполняется после паузы ввода"""
+        self.current_search = text
+        if self._page_task is not None:
+            self._page_task.cancel()
+            self._page_task = None
+        self.search_controller.set_query(text)
+
     def on_filter_changed(self):
         """Обработка изменения фильтров (поиск, поставщик, сортировка)"""
         self.current_search = (
@@ -284,11 +392,7 @@ class GoodsWindow(QWidget):
             )
             return
 
-        selected_good = None
-        for card in self.product_cards:
-            if hasattr(card, "_selected") and card._selected:
-                selected_good = card.good
-                break
+        selected_good = self.product_view.selected_good()
         if not selected_good:
             QMessageBox.warning(self, "Ошибка", "Выберите товар для редактирования")
             return
@@ -305,11 +409,21 @@ class GoodsWindow(QWidget):
             )
             return
 
+        run_async(
+            self.goods_service.get_good_by_id(good_id),
+            self.open_edit_window,
+            self.on_edit_error,
+            owner=self,
+        )
+
+    def open_edit_window(self, good: Optional[Good]):
+        """Открыть форму редактирования загруженного товара"""
+        if self._edit_window is not None and self._edit_window.isVisible():
+            return
+        if not good:
+            QMessageBox.warning(self, "Ошибка", "Товар не найден")
+            return
         try:
-            good = run_async_sync(self.goods_service.get_good_by_id(good_id))
-            if not good:
-                QMessageBox.warning(self, "Ошибка", "Товар не найден")
-                return
             form_window = GoodFormWindow(
                 self.goods_service, good=good, parent=self, user=self.user
             )
@@ -317,24 +431,24 @@ class GoodsWindow(QWidget):
             form_window.destroyed.connect(lambda: setattr(self, "_edit_window", None))
             form_window.show()
         except Exception as e:
-            from backend.internal.usecase.authorization_usecase import PermissionError
+            self.on_edit_error(e)
 
-            if isinstance(e, PermissionError):
-                QMessageBox.warning(self, "Ошибка доступа", str(e))
-            else:
-                QMessageBox.critical(
-                    self,
-                    "Ошибка",
-                    f"Ошибка при открытии формы редактирования: {str(e)}",
-                )
+    def on_edit_error(self, e: Exception):
+        """Обработка ошибки открытия формы редактирования"""
+        from backend.internal.usecase.authorization_usecase import PermissionError
+
+        if isinstance(e, PermissionError):
+            QMessageBox.warning(self, "Ошибка доступа", str(e))
+        else:
+            QMessageBox.critical(
+                self,
+                "Ошибка",
+                f"Ошибка при открытии формы редактирования: {str(e)}",
+            )
 
     def delete_good(self):
         """Удалить товар"""
-        selected_good = None
-        for card in self.product_cards:
-            if hasattr(card, "_selected") and card._selected:
-                selected_good = card.good
-                break
+        selected_good = self.product_view.selected_good()
         if not selected_good:
             QMessageBox.warning(self, "Ошибка", "Выберите товар для удаления")
             return
@@ -348,18 +462,28 @@ class GoodsWindow(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            try:
-                run_async_sync(self.goods_service.delete_good(good.id, self.user))
-                QMessageBox.information(self, "Успех", "Товар удален")
-                self.load_goods()
-            except Exception as e:
-                from backend.internal.usecase.authorization_usecase import (
-                    PermissionError,
-                )
-
-                if isinstance(e, PermissionError):
-                    QMessageBox.warning(self, "Ошибка доступа", str(e))
-                else:
-                    QMessageBox.critical(
-                        self, "Ошибка", f"Ошибка при удалении: {str(e)}"
-                    )
+            run_async(
+                self.goods_service.delete_good(good.id, self.user),
+                self.on_good_deleted,
+                self.on_delete_error,
+                owner=self,
+            )
+
+    def on_good_deleted(self, good: Optional[Good]):
+        """Убрать удаленный товар из списка"""
+        QMessageBox.information(self, "Успех", "Товар удален")
+        if good is None:
+            # Товар уже удален в другом месте - список устарел
+            self.load_goods()
+            return
+        self.product_view.product_model.remove_good(good.id)
+        QTimer.singleShot(0, self.fill_viewport)
+
+    def on_delete_error(self, e: Exception):
+        """Обработка ошибки удаления товара"""
+        from backend.internal.usecase.authorization_usecase import PermissionError
+
+        if isinstance(e, PermissionError):
+            QMessageBox.warning(self, "Ошибка доступа", str(e))
+        else:
+            QMessageBox.critical(self, "Ошибка", f"Ошибка при удалении: {str(e)}")
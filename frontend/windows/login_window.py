@@ -15,9 +15,10 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QIcon
 from frontend.services.auth_service import AuthService
-from frontend.utils.async_helper import run_async_sync
+from frontend.utils.async_helper import run_async
 from frontend.utils.styles import STYLES
 from backend.internal.entity.user import User
+from typing import Optional
 import os
 
 
@@ -87,8 +88,6 @@ class LoginWindow(QMainWindow):
 
         layout.addStretch()
 
-        self.setStyleSheet(STYLES["WINDOW_STYLE"])
-
     def handle_login(self):
         """Обработка входа"""
         login = self.login_input.text().strip()
@@ -98,23 +97,35 @@ class LoginWindow(QMainWindow):
             QMessageBox.warning(self, "Ошибка", "Заполните все поля")
             return
 
-        try:
-            user = run_async_sync(self.auth_service.login(login, password))
-            if user:
-                self.current_user = user
-                QMessageBox.information(
-                    self, "Успех", f"Добро пожаловать, {user.full_name}!"
-                )
-                if self.on_success:
-                    main_window = self.on_success(user)
-                    if main_window:
-                        self.hide()
-                    else:
-                        pass
-            else:
-                QMessageBox.warning(self, "Ошибка", "Неверный логин или пароль")
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при входе: {str(e)}")
+        self.login_button.setEnabled(False)
+        run_async(
+            self.auth_service.login(login, password),
+            self.on_login_finished,
+            self.on_login_error,
+            owner=self,
+        )
+
+    def on_login_finished(self, user: Optional[User]):
+        """Обработка результата входа"""
+        self.login_button.setEnabled(True)
+        if user:
+            self.current_user = user
+            QMessageBox.information(
+                self, "Успех", f"Добро пожаловать, {user.full_name}!"
+            )
+            if self.on_success:
+                main_window = self.on_success(user)
+                if main_window:
+                    self.hide()
+                else:
+                    pass
+        else:
+            QMessageBox.warning(self, "Ошибка", "Неверный логин или пароль")
+
+    def on_login_error(self, e: Exception):
+        """Обработка ошибки входа"""
+        self.login_button.setEnabled(True)
+        QMessageBox.critical(self, "Ошибка", f"Ошибка при входе: {str(e)}")
 
     def handle_register(self):
         """Обработка регистрации"""
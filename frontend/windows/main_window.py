@@ -96,8 +96,6 @@ class MainWindow(QMainWindow):
 
         layout.addLayout(header_container)
 
-        self.setStyleSheet(STYLES["WINDOW_STYLE"])
-
         self.tabs = QTabWidget()
         self.tabs.setStyleSheet(STYLES.get("TAB_STYLE", ""))
 
@@ -20,7 +20,7 @@ import os
 from frontend.services.orders_service import OrdersService
 from frontend.services.goods_service import GoodsService
 from frontend.services.auth_service import AuthService
-from frontend.utils.async_helper import run_async_sync
+from frontend.utils.async_helper import run_async
 from frontend.utils.styles import STYLES
 from backend.internal.entity.order import Order
 from backend.internal.entity.user import User
@@ -147,40 +147,60 @@ class OrderFormWindow(QMainWindow):
 
     def apply_styles(self):
         """Применить стили"""
-        self.setStyleSheet(STYLES["WINDOW_STYLE"])
 
     def load_users(self):
         """Загрузить список пользователей"""
         if not self.auth_service:
             return
-        try:
-            users = run_async_sync(self.auth_service.get_all_users())
-            self.user_combo.clear()
-            self.user_combo.addItem("Выберите пользователя", None)
-            for user in users:
-                self.user_combo.addItem(f"{user.full_name} ({user.role})", user.id)
-        except Exception as e:
-            QMessageBox.critical(
+        run_async(
+            self.auth_service.get_all_users(),
+            self.on_users_loaded,
+            lambda e: QMessageBox.critical(
                 self, "Ошибка", f"Ошибка при загрузке пользователей: {str(e)}"
-            )
+            ),
+            owner=self,
+        )
+
+    def on_users_loaded(self, users):
+        """Заполнить список пользователей и выбрать пользователя заказа"""
+        self.user_combo.clear()
+        self.user_combo.addItem("Выберите пользователя", None)
+        for user in users:
+            self.user_combo.addItem(f"{user.full_name} ({user.role})", user.id)
+
+        if self.order and self.order.user_id:
+            index = self.user_combo.findData(self.order.user_id)
+            if index >= 0:
+                self.user_combo.setCurrentIndex(index)
 
     def load_pick_up_points(self):
         """Загрузить пункты выдачи"""
-        try:
-            pick_up_points = run_async_sync(
-                self.orders_service.get_all_pick_up_points()
-            )
-            self.pick_up_combo.clear()
-            self.pick_up_combo.addItem("Выберите пункт выдачи", None)
-            for point in pick_up_points:
-                self.pick_up_combo.addItem(point.full_address, point.id)
-        except Exception as e:
-            QMessageBox.critical(
+        run_async(
+            self.orders_service.get_all_pick_up_points(),
+            self.on_pick_up_points_loaded,
+            lambda e: QMessageBox.critical(
                 self, "Ошибка", f"Ошибка при загрузке пунктов выдачи: {str(e)}"
-            )
+            ),
+            owner=self,
+        )
+
+    def on_pick_up_points_loaded(self, pick_up_points):
+        """Заполнить список пунктов выдачи и выбрать пункт заказа"""
+        self.pick_up_combo.clear()
+        self.pick_up_combo.addItem("Выберите пункт выдачи", None)
+        for point in pick_up_points:
+            self.pick_up_combo.addItem(point.full_address, point.id)
+
+        if self.order and self.order.pick_up_point_id:
+            index = self.pick_up_combo.findData(self.order.pick_up_point_id)
+            if index >= 0:
+                self.pick_up_combo.setCurrentIndex(index)
 
     def load_order_data(self):
-        """Загрузить данные заказа для редактирования"""
+        """
+        Загрузить данные заказа для редактирования (пользователь и пункт выдачи
+        выбираются после загрузки списков)
+        """
         if not self.order:
             return
 
@@ -189,16 +209,6 @@ class OrderFormWindow(QMainWindow):
             if index >= 0:
                 self.status_combo.setCurrentIndex(index)
 
-        if self.order.user_id:
-            index = self.user_combo.findData(self.order.user_id)
-            if index >= 0:
-                self.user_combo.setCurrentIndex(index)
-
-        if self.order.pick_up_point_id:
-            index = self.pick_up_combo.findData(self.order.pick_up_point_id)
-            if index >= 0:
-                self.pick_up_combo.setCurrentIndex(index)
-
         if self.order.created_at:
             self.date_order_input.setDate(
                 QDate.fromString(
@@ -272,51 +282,59 @@ class OrderFormWindow(QMainWindow):
                 return
 
             if self.order:
-                updated_order = run_async_sync(
-                    self.orders_service.update_order_data(
-                        self.order.id,
-                        status=status,
-                        user_id=user_id,
-                        pick_up_point_id=pick_up_point_id,
-                        created_at=created_at,
-                        delivered_at=delivered_at,
-                        items=None,
-                        user=self.user,
-                    )
+                coro = self.orders_service.update_order_data(
+                    self.order.id,
+                    status=status,
+                    user_id=user_id,
+                    pick_up_point_id=pick_up_point_id,
+                    created_at=created_at,
+                    delivered_at=delivered_at,
+                    items=None,
+                    user=self.user,
                 )
-                if updated_order:
-                    QMessageBox.information(self, "Успех", "Заказ успешно обновлен")
-                    self.close()
-
-                    if self.parent():
-                        if hasattr(self.parent(), "load_orders"):
-                            self.parent().load_orders()
+                message = "Заказ успешно обновлен"
             else:
-                created_order = run_async_sync(
-                    self.orders_service.create_order_for_admin(
-                        status=status,
-                        user_id=user_id,
-                        pick_up_point_id=pick_up_point_id,
-                        created_at=created_at,
-                        delivered_at=delivered_at,
-                        items=None,
-                        user=self.user,
-                    )
+                coro = self.orders_service.create_order_for_admin(
+                    status=status,
+                    user_id=user_id,
+                    pick_up_point_id=pick_up_point_id,
+                    created_at=created_at,
+                    delivered_at=delivered_at,
+                    items=None,
+                    user=self.user,
                 )
+                message = "Заказ успешно создан"
+        except Exception as e:
+            self.on_save_error(e)
+            return
 
-                if created_order:
-                    QMessageBox.information(self, "Успех", "Заказ успешно создан")
-                    self.close()
+        self.save_button.setEnabled(False)
+        run_async(
+            coro,
+            lambda order: self.on_saved(order, message),
+            self.on_save_error,
+            owner=self,
+        )
 
-                    if self.parent():
-                        if hasattr(self.parent(), "load_orders"):
-                            self.parent().load_orders()
-        except Exception as e:
-            from backend.internal.usecase.authorization_usecase import PermissionError
+    def on_saved(self, order: Optional[Order], message: str):
+        """Закрыть форму и показать сохраненный заказ в списке"""
+        self.save_button.setEnabled(True)
+        if not order:
+            return
+        QMessageBox.information(self, "Успех", message)
+        self.close()
 
-            if isinstance(e, PermissionError):
-                QMessageBox.warning(self, "Ошибка доступа", str(e))
-            else:
-                QMessageBox.critical(
-                    self, "Ошибка", f"Ошибка при сохранении заказа: {str(e)}"
-                )
+        if self.parent() and hasattr(self.parent(), "apply_saved_order"):
+            self.parent().apply_saved_order(order)
+
+    def on_save_error(self, e: Exception):
+        """Обработка ошибки сохранения заказа"""
+        self.save_button.setEnabled(True)
+        from backend.internal.usecase.authorization_usecase import PermissionError
+
+        if isinstance(e, PermissionError):
+            QMessageBox.warning(self, "Ошибка доступа", str(e))
+        else:
+            QMessageBox.critical(
+                self, "Ошибка", f"Ошибка при сохранении заказа: {str(e)}"
+            )
@@ -15,13 +15,17 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import QTimer
 from frontend.services.orders_service import OrdersService
 from frontend.services.goods_service import GoodsService
-from frontend.utils.async_helper import run_async_sync
+from frontend.utils.async_helper import run_async
 from frontend.utils.styles import STYLES
 from frontend.windows.create_order_window import CreateOrderWindow
 from frontend.windows.order_form_window import OrderFormWindow
 from frontend.widgets.order_card import OrderCard
+from frontend.widgets.card_selection import CardSelection
 from backend.internal.entity.user import User
 from backend.internal.entity.order import Order
+from backend.internal.entity.order_summary import OrderSummary
+from backend.internal.usecase.authorization_usecase import AuthorizationUseCase
+from typing import Optional
 
 
 class OrdersWindow(QWidget):
@@ -38,13 +42,12 @@ class OrdersWindow(QWidget):
         self.auth_service = auth_service
         self.user = user
         self.orders: list[Order] = []
+        self.pick_up_points_dict = {}
+        self.order_summaries: dict[int, OrderSummary] = {}
+        self._orders_task = None
+        self.selection = CardSelection()
         self.setup_ui()
-        try:
-            self.load_orders()
-        except Exception as e:
-            QMessageBox.critical(
-                self, "Ошибка", f"Ошибка при загрузке заказов: {str(e)}"
-            )
+        self.load_orders()
 
     def setup_ui(self):
         """Настройка интерфейса"""
@@ -88,24 +91,48 @@ class OrdersWindow(QWidget):
         self.scroll_area.setWidget(self.cards_container)
         layout.addWidget(self.scroll_area)
 
-        self.order_cards = []
+        self.order_cards: dict[int, OrderCard] = {}
 
     def load_orders(self):
         """Загрузить заказы"""
-        try:
-            self.orders = run_async_sync(
-                self.orders_service.get_orders_for_user(self.user)
-            )
-            self.update_table()
-        except Exception as e:
-            from backend.internal.usecase.authorization_usecase import PermissionError
+        if self._orders_task is not None:
+            self._orders_task.cancel()
+        self._orders_task = run_async(
+            self.fetch_orders(), self.on_orders_loaded, self.on_orders_error, owner=self
+        )
 
-            if isinstance(e, PermissionError):
-                QMessageBox.warning(self, "Ошибка доступа", str(e))
-            else:
-                QMessageBox.critical(
-                    self, "Ошибка", f"Ошибка при загрузке заказов: {str(e)}"
-                )
+    async def fetch_orders(self):
+        """Заказы пользователя, пункты выдачи и суммы заказов для их карточек"""
+        orders = await self.orders_service.get_orders_for_user(self.user)
+        pick_up_points = await self.orders_service.get_all_pick_up_points()
+        summaries = await self.orders_service.get_order_summaries(
+            [order.id for order in orders]
+        )
+        return orders, pick_up_points, summaries
+
+    def on_orders_loaded(self, result):
+        """Показать загруженные заказы"""
+        self._orders_task = None
+        self.orders, pick_up_points, summaries = result
+        # У заказа без товаров нет строки в сводке
+        self.order_summaries = {
+            order.id: summaries.get(order.id, OrderSummary(order.id))
+            for order in self.orders
+        }
+        self.pick_up_points_dict = {point.id: point for point in pick_up_points}
+        self.update_table()
+
+    def on_orders_error(self, e: Exception):
+        """Обработка ошибки загрузки заказов"""
+        self._orders_task = None
+        from backend.internal.usecase.authorization_usecase import PermissionError
+
+        if isinstance(e, PermissionError):
+            QMessageBox.warning(self, "Ошибка доступа", str(e))
+        else:
+            QMessageBox.critical(
+                self, "Ошибка", f"Ошибка при загрузке заказов: {str(e)}"
+            )
 
     def update_table(self):
         """Обновить карточки заказов"""
@@ -118,27 +145,12 @@ class OrdersWindow(QWidget):
                 elif item.spacerItem():
                     del item
 
-        self.order_cards = []
-
-        pick_up_points = run_async_sync(self.orders_service.get_all_pick_up_points())
-        pick_up_points_dict = {point.id: point for point in pick_up_points}
+        self.order_cards = {}
+        self.selection.clear()
 
         for order in self.orders:
-            on_double_click = None
-            if self.user.role == "Администратор":
-
-                def make_handler(o):
-                    return lambda: self.on_card_double_clicked(o)
-
-                on_double_click = make_handler(order)
-            card = OrderCard(
-                order,
-                parent=self.cards_container,
-                pick_up_points_dict=pick_up_points_dict,
-            )
-            if on_double_click:
-                card.on_double_click = on_double_click
-            self.order_cards.append(card)
+            card = self.create_card(order)
+            self.order_cards[order.id] = card
             self.cards_layout.addWidget(card)
 
         self.cards_layout.addStretch()
@@ -152,10 +164,80 @@ class OrdersWindow(QWidget):
                 scroll_bar.setValue(0)
 
                 if self.order_cards:
-                    self.scroll_area.ensureWidgetVisible(self.order_cards[0], 0, 0)
+                    first_card = next(iter(self.order_cards.values()))
+                    self.scroll_area.ensureWidgetVisible(first_card, 0, 0)
 
             QTimer.singleShot(50, scroll_to_top)
 
+    def create_card(self, order: Order) -> OrderCard:
+        """Карточка заказа"""
+        card = OrderCard(
+            order,
+            parent=self.cards_container,
+            pick_up_points_dict=self.pick_up_points_dict,
+            selection=self.selection,
+            summary=self.order_summaries.get(order.id),
+        )
+        if self.user.role == "Администратор":
+            card.on_double_click = self.on_card_double_clicked
+        return card
+
+    def apply_saved_order(self, order: Order):
+        """
+        Показать созданный или измененный заказ без перезагрузки списка:
+        заменяется только его карточка, прокрутка и выделение сохраняются
+        """
+        if not (
+            AuthorizationUseCase.can_view_all_orders(self.user)
+            or order.user_id == self.user.id
+        ):
+            self.remove_order(order.id)
+            return
+
+        card = self.create_card(order)
+        old_card = self.order_cards.get(order.id)
+        if old_card is not None:
+            if self.selection.current is old_card:
+                self.selection.clear()
+                self.selection.select(card)
+            self.cards_layout.replaceWidget(old_card, card)
+            old_card.setParent(None)
+            old_card.deleteLater()
+            self.orders = [order if o.id == order.id else o for o in self.orders]
+        else:
+            # Новый заказ - в конец списка, перед растягивающим элементом
+            self.cards_layout.insertWidget(self.cards_layout.count() - 1, card)
+            self.orders.append(order)
+        self.order_cards[order.id] = card
+
+        # Состав заказа мог измениться - пересчитать только его сумму
+        run_async(
+            self.orders_service.get_order_summaries([order.id]),
+            lambda summaries: self.on_summary_loaded(order.id, summaries),
+            lambda e: print(f"Ошибка при загрузке суммы заказа: {e}"),
+            owner=self,
+        )
+
+    def on_summary_loaded(self, order_id: int, summaries: dict):
+        """Обновить сумму заказа на его карточке"""
+        summary = summaries.get(order_id, OrderSummary(order_id))
+        self.order_summaries[order_id] = summary
+        card = self.order_cards.get(order_id)
+        if card is not None:
+            card.set_summary(summary)
+
+    def remove_order(self, order_id: int):
+        """Убрать карточку заказа из списка"""
+        card = self.order_cards.pop(order_id, None)
+        if card is None:
+            return
+        self.selection.discard(card)
+        self.cards_layout.removeWidget(card)
+        card.setParent(None)
+        card.deleteLater()
+        self.orders = [o for o in self.orders if o.id != order_id]
+        self.order_summaries.pop(order_id, None)
+
     def create_order(self):
         """Создать заказ (для клиента)"""
         create_window = CreateOrderWindow(
@@ -183,11 +265,8 @@ class OrdersWindow(QWidget):
     def edit_order(self):
         """Редактировать заказ (по выбранной карточке)"""
 
-        selected_order = None
-        for card in self.order_cards:
-            if hasattr(card, "_selected") and card._selected:
-                selected_order = card.order
-                break
+        card = self.selection.current
+        selected_order = card.order if card is not None else None
 
         if not selected_order:
             QMessageBox.warning(self, "Ошибка", "Выберите заказ для редактирования")
@@ -198,12 +277,19 @@ class OrdersWindow(QWidget):
     def edit_order_by_id(self, order_id: int):
         """Редактировать заказ по ID"""
 
-        try:
-            order = run_async_sync(self.orders_service.get_order_by_id(order_id))
-            if not order:
-                QMessageBox.warning(self, "Ошибка", "Заказ не найден")
-                return
+        run_async(
+            self.orders_service.get_order_by_id(order_id),
+            self.open_edit_window,
+            self.on_edit_error,
+            owner=self,
+        )
 
+    def open_edit_window(self, order: Order):
+        """Открыть форму редактирования загруженного заказа"""
+        if not order:
+            QMessageBox.warning(self, "Ошибка", "Заказ не найден")
+            return
+        try:
             form_window = OrderFormWindow(
                 self.orders_service,
                 self.goods_service,
@@ -214,22 +300,23 @@ class OrdersWindow(QWidget):
             )
             form_window.show()
         except Exception as e:
-            from backend.internal.usecase.authorization_usecase import PermissionError
+            self.on_edit_error(e)
+
+    def on_edit_error(self, e: Exception):
+        """Обработка ошибки загрузки заказа"""
+        from backend.internal.usecase.authorization_usecase import PermissionError
 
-            if isinstance(e, PermissionError):
-                QMessageBox.warning(self, "Ошибка доступа", str(e))
-            else:
-                QMessageBox.critical(
-                    self, "Ошибка", f"Ошибка при загрузке заказа: {str(e)}"
-                )
+        if isinstance(e, PermissionError):
+            QMessageBox.warning(self, "Ошибка доступа", str(e))
+        else:
+            QMessageBox.critical(
+                self, "Ошибка", f"Ошибка при загрузке заказа: {str(e)}"
+            )
 
     def delete_order(self):
         """Удалить заказ (для администратора)"""
-        selected_order = None
-        for card in self.order_cards:
-            if hasattr(card, "_selected") and card._selected:
-                selected_order = card.order
-                break
+        card = self.selection.current
+        selected_order = card.order if card is not None else None
 
         if not selected_order:
             QMessageBox.warning(self, "Ошибка", "Выберите заказ для удаления")
@@ -244,21 +331,32 @@ class OrdersWindow(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            try:
-                run_async_sync(self.orders_service.delete_order(order.id, self.user))
-                QMessageBox.information(self, "Успех", "Заказ удален")
-                self.load_orders()
-            except Exception as e:
-                from backend.internal.usecase.authorization_usecase import (
-                    PermissionError,
-                )
-
-                if isinstance(e, PermissionError):
-                    QMessageBox.warning(self, "Ошибка доступа", str(e))
-                else:
-                    QMessageBox.critical(
-                        self, "Ошибка", f"Ошибка при удалении заказа: {str(e)}"
-                    )
+            run_async(
+                self.orders_service.delete_order(order.id, self.user),
+                self.on_order_deleted,
+                self.on_delete_error,
+                owner=self,
+            )
+
+    def on_order_deleted(self, order: Optional[Order]):
+        """Убрать удаленный заказ из списка"""
+        QMessageBox.information(self, "Успех", "Заказ удален")
+        if order is None:
+            # Заказ уже удален в другом месте - список устарел
+            self.load_orders()
+            return
+        self.remove_order(order.id)
+
+    def on_delete_error(self, e: Exception):
+        """Обработка ошибки удаления заказа"""
+        from backend.internal.usecase.authorization_usecase import PermissionError
+
+        if isinstance(e, PermissionError):
+            QMessageBox.warning(self, "Ошибка доступа", str(e))
+        else:
+            QMessageBox.critical(
+                self, "Ошибка", f"Ошибка при удалении заказа: {str(e)}"
+            )
 
     def on_item_double_clicked(self, item):
         """Обработка двойного клика на элемент таблицы"""
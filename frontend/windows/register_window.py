@@ -15,7 +15,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QIcon
 from frontend.services.auth_service import AuthService
-from frontend.utils.async_helper import run_async_sync
+from frontend.utils.async_helper import run_async
 from frontend.utils.styles import STYLES
 from backend.pkg.validator.email_validator import EmailValidator
 from backend.pkg.validator.full_name_validator import FullNameValidator
@@ -100,8 +100,6 @@ class RegisterWindow(QMainWindow):
         layout.addLayout(buttons_layout)
         layout.addStretch()
 
-        self.setStyleSheet(STYLES["WINDOW_STYLE"])
-
     def handle_register(self):
         """Обработка регистрации"""
         full_name = self.name_input.text().strip()
@@ -134,11 +132,23 @@ class RegisterWindow(QMainWindow):
             self.confirm_input.setFocus()
             return
 
-        try:
-            run_async_sync(self.auth_service.register(login, password, full_name, role))
-            QMessageBox.information(self, "Успех", "Регистрация успешна!")
-            self.close()
-        except ValueError as e:
+        self.register_button.setEnabled(False)
+        run_async(
+            self.auth_service.register(login, password, full_name, role),
+            self.on_registered,
+            self.on_register_error,
+            owner=self,
+        )
+
+    def on_registered(self, _):
+        """Закрыть окно после успешной регистрации"""
+        QMessageBox.information(self, "Успех", "Регистрация успешна!")
+        self.close()
+
+    def on_register_error(self, e: Exception):
+        """Обработка ошибки регистрации"""
+        self.register_button.setEnabled(True)
+        if isinstance(e, ValueError):
             QMessageBox.warning(self, "Ошибка регистрации", str(e))
-        except Exception as e:
+        else:
             QMessageBox.critical(self, "Ошибка", f"Ошибка при регистрации: {str(e)}")
@@ -4,9 +4,12 @@
 
 from backend.confg.config import config
 from backend.pkg.postgres.postgres import PG
+from backend.pkg.cache.ttl_cache import TTLCache
 from PySide6.QtWidgets import QApplication
+import asyncio
 import sys
 from frontend.utils.async_helper import close_loop, run_async_sync
+from frontend.utils.image_service import close_image_service
 
 # Backend: Repositories
 from backend.internal.repo.persistent import (
@@ -14,6 +17,7 @@ from backend.internal.repo.persistent import (
     UserPostgres,
     OrderPostgres,
     PickUpPointPostgres,
+    ReservationPostgres,
 )
 
 # Backend: Use Cases
@@ -42,7 +46,9 @@ async def init_backend():
         print("Не удалось подключиться к БД")
         sys.exit(1)
 
-    await db.create_tables()
+    if not await db.migrate():
+        print("Не удалось обновить схему БД")
+        sys.exit(1)
 
     # Импорт данных из Excel файлов
     try:
@@ -57,11 +63,22 @@ async def init_backend():
     user_repo = UserPostgres(db)
     order_repo = OrderPostgres(db)
     pick_up_repo = PickUpPointPostgres(db)
+    reservation_repo = ReservationPostgres(db)
+
+    # Общий кэш справочников (поставщики, категории, пункты выдачи)
+    cache = TTLCache()
 
     # Создаем Use Cases
     auth_usecase = AuthUseCase(user_repo)
-    goods_usecase = GoodsUseCase(goods_repo, order_repo)
-    orders_usecase = OrdersUseCase(order_repo, goods_repo, pick_up_repo)
+    goods_usecase = GoodsUseCase(goods_repo, order_repo, cache)
+    orders_usecase = OrdersUseCase(
+        order_repo, goods_repo, pick_up_repo, cache, reservation_repo
+    )
+
+    # Фоновое удаление просроченных резервов корзин
+    reservation_sweeper = asyncio.get_running_loop().create_task(
+        orders_usecase.run_reservation_sweeper()
+    )
 
     # Создаем Services
     auth_service = AuthService(auth_usecase)
@@ -73,9 +90,20 @@ async def init_backend():
         "auth_service": auth_service,
         "goods_service": goods_service,
         "orders_service": orders_service,
+        "reservation_sweeper": reservation_sweeper,
     }
 
 
+async def close_backend(services):
+    """Остановить фоновые задачи backend и закрыть соединения с БД"""
+    sweeper = services.get("reservation_sweeper")
+    if sweeper is not None:
+        sweeper.cancel()
+        await asyncio.gather(sweeper, return_exceptions=True)
+    if "db" in services:
+        await services["db"].close()
+
+
 # Глобальная переменная для хранения главного окна
 _main_window = None
 
@@ -108,16 +136,18 @@ def show_main_window(user, services, login_window=None):
 
 def main():
     """Главная функция приложения"""
+    # Backend инициализируется в потоке backend: пул соединений принадлежит
+    # его event loop, окна обращаются к нему через run_async
     services = run_async_sync(init_backend())
 
     # Создание Qt приложения
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
 
-    # Применяем глобальные стили для всех диалогов
-    from frontend.utils.styles import STYLES
+    # Общая таблица стилей: окна, диалоги и карточки
+    from frontend.utils.styles import APP_STYLESHEET
 
-    app.setStyleSheet(STYLES.get("MESSAGEBOX_STYLE", ""))
+    app.setStyleSheet(APP_STYLESHEET)
 
     # Окно авторизации
     login_window = LoginWindow(
@@ -129,10 +159,12 @@ def main():
     # Запуск приложения
     exit_code = app.exec()
 
+    # Останавливаем фоновую загрузку фото
+    close_image_service()
+
     # Закрываем соединения с БД перед выходом
     try:
-        if "db" in services:
-            run_async_sync(services["db"].close())
+        run_async_sync(close_backend(services))
     except Exception as e:
         print(f"Ошибка при закрытии БД: {e}")
 
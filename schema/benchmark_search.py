@@ -0,0 +1,143 @@
+"""
+Бенчмарк поиска товаров: старый поиск через ILIKE против полнотекстового
+индекса (tsvector + GIN) на каталоге из 100 000 товаров.
+
+Тестовые данные вставляются в таблицу Goods внутри транзакции, которая
+откатывается по завершении, поэтому рабочие данные не изменяются.
+
+Запуск из корня проекта:
+    python -m schema.benchmark_search
+"""
+
+from backend.internal.entity.good import Good
+from backend.internal.repo.persistent.goods_postgres import GoodsPostgres
+from backend.confg.config import config
+from backend.pkg.postgres.postgres import PG
+from sqlalchemy import select, or_, and_, func, text
+from statistics import median
+import asyncio
+import time
+
+CATALOG_SIZE = 100_000
+REPEATS = 20
+QUERIES = ["ботинки", "кроссовки жен", "rieker", "сапоги муж", "модель 4242"]
+
+SEED_SQL = f"""
+INSERT INTO "Goods" (
+    article, name, unit_of_measurement, price, provider, manufacturer,
+    category, discount, count, description
+)
+SELECT
+    'BENCH-' || g,
+    (ARRAY['Ботинки', 'Полуботинки', 'Кроссовки', 'Туфли', 'Сапоги',
+           'Тапочки', 'Кеды'])[1 + g % 7] || ' модель ' || g,
+    'шт',
+    1000 + g % 5000,
+    (ARRAY['Kari', 'Обувь для вас'])[1 + g % 2],
+    (ARRAY['Rieker', 'Alessio Nesca', 'CROSBY', 'Marco Tozzi', 'Kari',
+           'Рос'])[1 + g % 6],
+    (ARRAY['Женская обувь', 'Мужская обувь'])[1 + g % 2],
+    g % 30,
+    g % 50,
+    'Описание товара ' || md5(g::text)
+FROM generate_series(1, {CATALOG_SIZE}) AS g
+"""
+
+
+def legacy_search(query: str):
+    """Запрос поиска в прежнем виде: ILIKE по всем текстовым полям"""
+    return select(Good).filter(
+        or_(
+            Good.name.ilike(f"%{query}%"),
+            Good.article.ilike(f"%{query}%"),
+            Good.description.ilike(f"%{query}%"),
+            Good.category.ilike(f"%{query}%"),
+            Good.manufacturer.ilike(f"%{query}%"),
+            Good.provider.ilike(f"%{query}%"),
+        )
+    )
+
+
+def legacy_filter(query: str):
+    """Запрос фильтрации в прежнем виде: ILIKE по названию и категории"""
+    conditions = []
+    for w in query.strip().lower().split():
+        if w.startswith("муж") or w.startswith("жен"):
+            conditions.append(func.lower(Good.category).ilike(f"%{w[:3]}%"))
+        else:
+            conditions.append(
+                or_(
+                    func.lower(Good.name).ilike(f"%{w}%"),
+                    func.lower(Good.category).ilike(f"%{w}%"),
+                )
+            )
+    return select(Good).filter(and_(*conditions))
+
+
+async def measure(conn, statement) -> tuple[float, int]:
+    """Медианное время выполнения запроса в миллисекундах и число строк"""
+    timings = []
+    rows = 0
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = await conn.execute(statement)
+        rows = len(result.all())
+        timings.append((time.perf_counter() - start) * 1000)
+    return median(timings), rows
+
+
+async def run_benchmark():
+    pg = PG(
+        host=config.database.host,
+        port=config.database.port,
+        database=config.database.database,
+        user=config.database.user,
+        password=config.database.password,
+    )
+
+    if not await pg.connect():
+        print("Не удалось подключиться к БД")
+        return
+
+    await pg.migrate()
+    goods_repo = GoodsPostgres(pg)
+
+    async with pg.engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            print(f"Генерация каталога из {CATALOG_SIZE} товаров...")
+            await conn.execute(text(SEED_SQL))
+            await conn.execute(text('ANALYZE "Goods"'))
+
+            print(f"{'запрос':<16}{'ILIKE, мс':>12}{'FTS, мс':>12}{'строк':>14}")
+            for query in QUERIES:
+                legacy_ms, legacy_rows = await measure(conn, legacy_search(query))
+                fts_ms, fts_rows = await measure(
+                    conn,
+                    goods_repo._apply_filters(
+                        select(Good), search_query=query, order_by_rank=True
+                    ),
+                )
+                print(
+                    f"{query:<16}{legacy_ms:>12.2f}{fts_ms:>12.2f}"
+                    f"{f'{legacy_rows}/{fts_rows}':>14}"
+                )
+
+            print("\nФильтрация (filter_and_sort), первая страница:")
+            for query in QUERIES:
+                legacy_ms, _ = await measure(conn, legacy_filter(query).limit(50))
+                fts_ms, _ = await measure(
+                    conn,
+                    goods_repo._apply_filters(select(Good), search_query=query).limit(
+                        50
+                    ),
+                )
+                print(f"{query:<16}{legacy_ms:>12.2f}{fts_ms:>12.2f}")
+        finally:
+            await transaction.rollback()
+
+    await pg.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
@@ -0,0 +1,149 @@
+"""
+Проверка параллельного оформления заказов: сотни заказов одновременно
+разбирают небольшой остаток нескольких товаров. Каждый заказ содержит
+несколько товаров в случайном порядке, поэтому без блокировки строк
+в порядке ID возможны и перепродажа, и взаимоблокировки.
+
+Проверяется, что ни один остаток не ушел в минус, списано ровно столько,
+сколько заказано в созданных заказах, и все отказы - из-за нехватки товара.
+Тестовые товары и заказы удаляются по завершении.
+
+Запуск из корня проекта:
+    python -m schema.check_order_concurrency
+"""
+
+from backend.internal.entity.good import Good
+from backend.internal.entity.order import Order
+from backend.internal.entity.order_item import OrderItem
+from backend.internal.repo.persistent.goods_postgres import GoodsPostgres
+from backend.internal.repo.persistent.order_postgres import OrderPostgres
+from backend.internal.usecase.orders_usecase import OrdersUseCase
+from backend.confg.config import config
+from backend.pkg.postgres.postgres import PG
+from sqlalchemy import select, insert, delete, func
+import asyncio
+import random
+import sys
+import time
+import uuid
+
+GOODS = 5
+STOCK = 40
+ORDERS = 500
+SEED = 42
+
+
+async def create_goods(pg: PG, prefix: str) -> list[int]:
+    """Тестовые товары с остатком STOCK"""
+    async with pg.get_session() as session:
+        result = await session.execute(
+            insert(Good)
+            .values(
+                [
+                    {
+                        "article": f"{prefix}-{i}",
+                        "name": f"Проверка параллельных заказов {i}",
+                        "unit_of_measurement": "шт",
+                        "price": 1000,
+                        "count": STOCK,
+                    }
+                    for i in range(GOODS)
+                ]
+            )
+            .returning(Good.id)
+        )
+        await session.commit()
+        return list(result.scalars())
+
+
+def random_items(rng: random.Random, goods_ids: list[int]) -> list[dict]:
+    """Позиции заказа в случайном порядке"""
+    chosen = rng.sample(goods_ids, rng.randint(1, min(3, len(goods_ids))))
+    return [{"goods_id": i, "quantity": rng.randint(1, 3)} for i in chosen]
+
+
+async def run_check() -> bool:
+    pg = PG(
+        host=config.database.host,
+        port=config.database.port,
+        database=config.database.database,
+        user=config.database.user,
+        password=config.database.password,
+    )
+
+    if not await pg.connect():
+        print("Не удалось подключиться к БД")
+        return False
+
+    await pg.migrate()
+    usecase = OrdersUseCase(OrderPostgres(pg), GoodsPostgres(pg))
+    rng = random.Random(SEED)
+    prefix = f"CONCURRENCY-{uuid.uuid4().hex[:8]}"
+    goods_ids = await create_goods(pg, prefix)
+    created: list[Order] = []
+
+    try:
+        requests = [random_items(rng, goods_ids) for _ in range(ORDERS)]
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(usecase.create(items=items) for items in requests),
+            return_exceptions=True,
+        )
+        elapsed = time.perf_counter() - start
+
+        created = [r for r in results if isinstance(r, Order)]
+        rejected = [
+            r
+            for r in results
+            if isinstance(r, ValueError) and str(r).startswith("Недостаточно")
+        ]
+        errors = [
+            r
+            for r in results
+            if isinstance(r, Exception) and not any(r is x for x in rejected)
+        ]
+
+        async with pg.get_session() as session:
+            stock = dict(
+                (
+                    await session.execute(
+                        select(Good.id, Good.count).filter(Good.id.in_(goods_ids))
+                    )
+                ).all()
+            )
+            ordered = dict(
+                (
+                    await session.execute(
+                        select(OrderItem.goods_id, func.sum(OrderItem.quantity))
+                        .filter(OrderItem.goods_id.in_(goods_ids))
+                        .group_by(OrderItem.goods_id)
+                    )
+                ).all()
+            )
+
+        print(f"Заказов: {ORDERS} за {elapsed:.2f} с")
+        print(f"  создано {len(created)}, отказов по остатку {len(rejected)}")
+        print(f"{'товар':>8}{'остаток':>10}{'заказано':>10}")
+        ok = not errors
+        for goods_id in goods_ids:
+            remaining = stock[goods_id]
+            sold = ordered.get(goods_id, 0)
+            print(f"{goods_id:>8}{remaining:>10}{sold:>10}")
+            if remaining < 0 or remaining + sold != STOCK:
+                ok = False
+        for e in errors[:5]:
+            print(f"Ошибка при создании заказа: {type(e).__name__}: {e}")
+        print("OK" if ok else "ОШИБКА: перепродажа или сбой транзакций")
+        return ok
+    finally:
+        async with pg.get_session() as session:
+            await session.execute(
+                delete(Order).filter(Order.id.in_([o.id for o in created]))
+            )
+            await session.execute(delete(Good).filter(Good.article.like(f"{prefix}-%")))
+            await session.commit()
+        await pg.close()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_check()) else 1)
@@ -0,0 +1,187 @@
+"""
+Проверка числа запросов к БД на операцию записи в репозиториях.
+
+Каждая операция create/update/delete должна выполняться одним запросом
+(INSERT/UPDATE/DELETE ... RETURNING), оформление заказа - фиксированным
+числом запросов независимо от количества товаров. Выборки get по ID
+в одной итерации event loop объединяются в один запрос, повторные
+в пределах запроса берутся из памяти. Операции выполняются
+в одной единице работы, которая откатывается по завершении, поэтому
+рабочие данные не изменяются.
+
+Запуск из корня проекта:
+    python -m schema.check_query_counts
+"""
+
+from backend.internal.entity.good import Good
+from backend.internal.entity.order import Order
+from backend.internal.entity.order_item import OrderItem
+from backend.internal.entity.order_pick_up_point import OrderPickUpPoint
+from backend.internal.entity.user import User
+from backend.internal.repo.persistent import (
+    GoodsPostgres,
+    OrderPostgres,
+    PickUpPointPostgres,
+    UserPostgres,
+)
+from backend.confg.config import config
+from backend.pkg.postgres.postgres import PG
+from backend.pkg.cache.data_loader import request_scope
+from sqlalchemy import event
+import asyncio
+import sys
+import uuid
+
+
+class QueryCounter:
+    """Счетчик запросов, отправленных через движок"""
+
+    def __init__(self, pg: PG):
+        self.count = 0
+        event.listen(pg.engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def reset(self) -> int:
+        count, self.count = self.count, 0
+        return count
+
+
+class _Rollback(Exception):
+    """Откатить единицу работы проверки"""
+
+
+async def run_operations(pg: PG, counter: QueryCounter, results: list):
+    """Операции записи с ожидаемым числом запросов"""
+    goods_repo = GoodsPostgres(pg)
+    order_repo = OrderPostgres(pg)
+    user_repo = UserPostgres(pg)
+    pick_up_repo = PickUpPointPostgres(pg)
+    suffix = uuid.uuid4().hex[:8]
+
+    async def check(name: str, expected: int, coro):
+        counter.reset()
+        result = await coro
+        results.append((name, expected, counter.reset()))
+        return result
+
+    goods = []
+    for i in range(3):
+        goods.append(
+            await check(
+                "goods.create",
+                1,
+                goods_repo.create(
+                    Good(f"QC-{suffix}-{i}", "Проверка", "шт.", 100, count=10)
+                ),
+            )
+        )
+    goods[0].count = 5
+    await check("goods.update", 1, goods_repo.update(goods[0]))
+    # Только что записанный объект уже известен запросу
+    await check("goods.get (после записи)", 0, goods_repo.get(goods[0].id))
+
+    user = await check(
+        "users.create",
+        1,
+        user_repo.create(User("Клиент", "Проверка", f"qc-{suffix}@test", "pass")),
+    )
+    user.full_name = "Проверка изменена"
+    await check("users.update", 1, user_repo.update(user))
+
+    point = await check(
+        "pick_up_points.create",
+        1,
+        pick_up_repo.create(OrderPickUpPoint(f"Адрес проверки {suffix}")),
+    )
+    point.full_address = f"Адрес проверки {suffix} (изменен)"
+    await check("pick_up_points.update", 1, pick_up_repo.update(point))
+
+    order = await check(
+        "orders.create",
+        1,
+        order_repo.create(Order(user_id=user.id, pick_up_point_id=point.id)),
+    )
+    order.status = "Завершен"
+    await check("orders.update", 1, order_repo.update(order))
+    await check(
+        "orders.add_order_item",
+        1,
+        order_repo.add_order_item(OrderItem(order.id, goods[0].id, 1)),
+    )
+    # Сверка состава: новые, измененные и лишние строки одним запросом
+    await check(
+        "orders.replace_order_items",
+        1,
+        order_repo.replace_order_items(order.id, {goods[1].id: 2, goods[2].id: 1}),
+    )
+    # Блокировка и проверка товаров, заказ, позиции, списание остатка
+    placed = await check(
+        "orders.create_with_items",
+        4,
+        order_repo.create_with_items(
+            Order(user_id=user.id), {good.id: 1 for good in goods}
+        ),
+    )
+
+    # Списанный остаток перечитывается из БД
+    await check("goods.get (после списания)", 1, goods_repo.get(goods[0].id))
+    with request_scope():
+        await check(
+            "goods.get x3 (gather)",
+            1,
+            asyncio.gather(*(goods_repo.get(good.id) for good in goods)),
+        )
+        await check("goods.get (повторно)", 0, goods_repo.get(goods[1].id))
+        await check(
+            "users.get + points.get",
+            2,
+            asyncio.gather(user_repo.get(user.id), pick_up_repo.get(point.id)),
+        )
+
+    await check("orders.delete", 1, order_repo.delete(placed.id))
+    await check("orders.delete", 1, order_repo.delete(order.id))
+    await check("goods.delete", 1, goods_repo.delete(goods[2].id))
+    await check("pick_up_points.delete", 1, pick_up_repo.delete(point.id))
+    await check("users.delete", 1, user_repo.delete(user.id))
+
+
+async def run_check() -> bool:
+    pg = PG(
+        host=config.database.host,
+        port=config.database.port,
+        database=config.database.database,
+        user=config.database.user,
+        password=config.database.password,
+    )
+
+    if not await pg.connect():
+        print("Не удалось подключиться к БД")
+        return False
+
+    await pg.migrate()
+    counter = QueryCounter(pg)
+    results = []
+    try:
+        async with pg.unit_of_work():
+            with request_scope():
+                await run_operations(pg, counter, results)
+            raise _Rollback()
+    except _Rollback:
+        pass
+    finally:
+        await pg.close()
+
+    ok = True
+    print(f"{'операция':<28}{'ожидается':>10}{'запросов':>10}")
+    for name, expected, actual in results:
+        mark = "" if actual == expected else "  <- ОШИБКА"
+        ok = ok and actual == expected
+        print(f"{name:<28}{expected:>10}{actual:>10}{mark}")
+    print("OK" if ok else "ОШИБКА: число запросов изменилось")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_check()) else 1)
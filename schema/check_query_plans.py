@@ -0,0 +1,197 @@
+"""
+Проверка планов горячих запросов каталога товаров: EXPLAIN (ANALYZE, BUFFERS)
+на каталоге из 100 000 товаров.
+
+Запросы берутся из репозитория в том виде, в каком их отправляет
+приложение (с теми же параметрами), и выполняются повторно под EXPLAIN.
+Проверка не проходит, если какой-либо из них читает таблицу Goods
+последовательным сканированием (Seq Scan) - например, после удаления
+или изменения индекса, либо изменения запроса.
+
+Тестовые данные вставляются внутри единицы работы, которая откатывается
+по завершении, поэтому рабочие данные не изменяются; оставшиеся после
+отката строки убираются VACUUM.
+
+Запуск из корня проекта:
+    python -m schema.check_query_plans
+"""
+
+from backend.internal.repo.persistent.goods_postgres import GoodsPostgres
+from backend.confg.config import config
+from backend.pkg.postgres.postgres import PG
+from sqlalchemy import event, text
+import asyncio
+import json
+import sys
+
+CATALOG_SIZE = 100_000
+PROVIDERS = 20
+PROVIDER = "Поставщик 7"
+SEARCH = "планов 4242"
+
+SEED_SQL = f"""
+INSERT INTO "Goods" (
+    article, name, unit_of_measurement, price, provider, manufacturer,
+    category, discount, count, description
+)
+SELECT
+    'PLAN-' || g,
+    'Товар проверки планов ' || g,
+    'шт',
+    1000 + g % 5000,
+    'Поставщик ' || g % {PROVIDERS},
+    'Производитель ' || g % 60,
+    'Категория ' || g % 12,
+    g % 30,
+    g % 50,
+    'Описание товара ' || md5(g::text)
+FROM generate_series(1, {CATALOG_SIZE}) AS g
+"""
+
+# Запросы каталога: окно товаров, страницы поиска, с фильтром и сортировкой
+# по остатку, списки для фильтров и форм
+CASES = [
+    ("get_page", lambda repo: repo.get_page()),
+    ("get_page по остатку ↑", lambda repo: repo.get_page(sort_by_count="asc")),
+    ("get_page по остатку ↓", lambda repo: repo.get_page(sort_by_count="desc")),
+    (
+        "get_page по остатку ↑, курсор",
+        lambda repo: repo.get_page(sort_by_count="asc", after=(25, 50_000)),
+    ),
+    ("get_page поиск по рангу", lambda repo: repo.get_page(search_query=SEARCH)),
+    (
+        "get_page поиск по рангу, курсор",
+        lambda repo: repo.get_page(search_query=SEARCH, after=(0.1, 50_000)),
+    ),
+    ("get_page поставщик", lambda repo: repo.get_page(provider=PROVIDER)),
+    (
+        "get_page поставщик, остаток ↑",
+        lambda repo: repo.get_page(provider=PROVIDER, sort_by_count="asc"),
+    ),
+    (
+        "get_page поставщик, остаток ↓, курсор",
+        lambda repo: repo.get_page(
+            provider=PROVIDER, sort_by_count="desc", after=(25, 50_000)
+        ),
+    ),
+    (
+        "filter_and_sort поставщик, остаток ↑",
+        lambda repo: repo.filter_and_sort(provider=PROVIDER, sort_by_count="asc"),
+    ),
+    ("get_all_providers", lambda repo: repo.get_all_providers()),
+    ("get_all_categories", lambda repo: repo.get_all_categories()),
+    ("get_all_manufacturers", lambda repo: repo.get_all_manufacturers()),
+]
+
+
+class StatementCapture:
+    """Запоминает последний запрос, отправленный через движок, с параметрами"""
+
+    def __init__(self, pg: PG):
+        self.statement = None
+        self.parameters = ()
+        event.listen(pg.engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statement = statement
+        self.parameters = parameters
+
+
+def plan_nodes(node: dict):
+    """Все узлы плана (обход дерева)"""
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def explain(driver, statement: str, parameters) -> dict:
+    """План запроса с фактическим временем и буферами"""
+    result = await driver.fetchval(
+        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", *parameters
+    )
+    # SQLAlchemy регистрирует для asyncpg кодек json, без него - строка
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]
+
+
+async def vacuum_goods(pg: PG):
+    """Убрать из таблицы и индексов строки откатанного каталога"""
+    async with pg.engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text('VACUUM ANALYZE "Goods"'))
+
+
+class _Rollback(Exception):
+    """Откатить единицу работы проверки"""
+
+
+async def run_cases(pg: PG, capture: StatementCapture, results: list):
+    """Засеять каталог и получить планы всех запросов"""
+    repo = GoodsPostgres(pg)
+    async with pg.unit_of_work() as session:
+        await session.execute(text(SEED_SQL))
+        await session.execute(text('ANALYZE "Goods"'))
+        conn = await session.connection()
+        driver = (await conn.get_raw_connection()).driver_connection
+
+        for name, call in CASES:
+            await call(repo)
+            plan = await explain(driver, capture.statement, capture.parameters)
+            results.append((name, plan))
+        raise _Rollback()
+
+
+async def run_check() -> bool:
+    pg = PG(
+        host=config.database.host,
+        port=config.database.port,
+        database=config.database.database,
+        user=config.database.user,
+        password=config.database.password,
+    )
+
+    if not await pg.connect():
+        print("Не удалось подключиться к БД")
+        return False
+
+    if not await pg.migrate():
+        await pg.close()
+        return False
+
+    capture = StatementCapture(pg)
+    results = []
+    try:
+        await run_cases(pg, capture, results)
+    except _Rollback:
+        pass
+    finally:
+        await vacuum_goods(pg)
+        await pg.close()
+
+    ok = True
+    print(f"Каталог: {CATALOG_SIZE} товаров")
+    print(f"{'запрос':<40}{'мс':>8}{'буферов':>9}  индексы")
+    for name, plan in results:
+        nodes = list(plan_nodes(plan["Plan"]))
+        seq_scans = [
+            node
+            for node in nodes
+            if node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "Goods"
+        ]
+        indexes = sorted({node["Index Name"] for node in nodes if "Index Name" in node})
+        buffers = plan["Plan"].get("Shared Hit Blocks", 0) + plan["Plan"].get(
+            "Shared Read Blocks", 0
+        )
+        mark = "  <- Seq Scan" if seq_scans else ""
+        ok = ok and not seq_scans
+        print(
+            f"{name:<40}{plan['Execution Time']:>8.2f}{buffers:>9}  "
+            f"{', '.join(indexes) or '-'}{mark}"
+        )
+    print("OK" if ok else "ОШИБКА: запрос каталога читает всю таблицу Goods")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_check()) else 1)
@@ -1,143 +1,648 @@
 """
 Скрипт для импорта данных из Excel файлов в базу данных
 Проверяет наличие данных и импортирует только если таблицы пустые
+или импорт файла в них был прерван
+
+Строки файлов загружаются через COPY частями по BATCH_SIZE строк (с --stream -
+по STREAM_CHUNK_SIZE), каждая часть - своей транзакцией вместе с контрольной
+точкой в таблице Import_Checkpoint. Прерванный импорт при следующем запуске
+продолжается с последней зафиксированной части, если файл не изменился.
+Если пакетная загрузка не удалась, оставшиеся строки загружаются построчно
+с выводом ошибочных строк.
+Флаг --row-by-row включает построчную загрузку сразу, флаг --stream -
+потоковое чтение больших файлов частями с постоянным расходом памяти.
+
+Флаг --sync синхронизирует пользователей, товары и пункты выдачи с файлами
+и в непустых таблицах: строки добавляются или обновляются по естественному
+ключу (логин, артикул, адрес), неизмененные строки пропускаются.
 """
 
 from backend.internal.entity.order_pick_up_point import OrderPickUpPoint
 from backend.internal.entity.order import Order
+from backend.internal.entity.order_item import OrderItem
 from backend.internal.entity.good import Good
+from backend.internal.entity.import_checkpoint import ImportCheckpoint
 from backend.internal.entity.user import User
 from backend.confg.config import config
 from backend.pkg.postgres.postgres import PG
+from sqlalchemy import (
+    Table,
+    Text,
+    cast,
+    func,
+    insert,
+    literal_column,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 import pandas as pd
 from datetime import datetime, timedelta
+from concurrent.futures import Executor, ProcessPoolExecutor
+from openpyxl import load_workbook
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+import asyncio
+import hashlib
+import multiprocessing
+import os
 import sys
+import time
 from pathlib import Path
 
 
 root_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(root_dir))
 
+EXCEL_EPOCH = pd.Timestamp(1899, 12, 30)
+DATE_FORMATS = ["%d.%m.%Y", "%m/%d/%y", "%d/%m/%Y", "%Y-%m-%d", "%m/%d/%Y"]
+INVALID_DATES = ("30.02.2025", "30/02/2025")
+INVALID_DATES_REPLACEMENT = pd.Timestamp(2025, 2, 28)
+# Начиная с этого суммарного размера файлов чтение Excel выносится в пул
+# процессов (если ядер больше одного); на маленьких файлах запуск процессов
+# дороже самого чтения
+PROCESS_POOL_MIN_BYTES = 1_000_000
+# Размер части при потоковом чтении (флаг --stream)
+STREAM_CHUNK_SIZE = 5_000
+# Число строк, фиксируемых одной транзакцией вместе с контрольной точкой,
+# при чтении всего листа
+BATCH_SIZE = 5_000
+
+
+def excel_column_to_dates(df: pd.DataFrame, column: str) -> List[Optional[datetime]]:
+    """
+    Конвертирует колонку дат Excel (даты, serial number или строки) в datetime
+    векторными операциями pandas; нераспознанные значения становятся None
+    """
+    if column not in df.columns:
+        return [None] * len(df)
+
+    values = df[column]
+    if pd.api.types.is_datetime64_any_dtype(values):
+        dates = values
+    else:
+        is_date = values.map(lambda value: isinstance(value, datetime))
+        is_number = values.map(
+            lambda value: (
+                isinstance(value, (int, float)) and not isinstance(value, bool)
+            )
+        )
+        is_text = values.map(lambda value: isinstance(value, str))
 
-def excel_serial_to_date(serial_number):
-    """Конвертирует Excel serial number в дату"""
-    if pd.isna(serial_number):
-        return None
-    try:
-        if isinstance(serial_number, datetime):
-            return serial_number
+        dates = pd.to_datetime(values.where(is_date), errors="coerce")
 
-        if isinstance(serial_number, pd.Timestamp):
-            return serial_number.to_pydatetime()
+        serials = pd.to_numeric(values.where(is_number), errors="coerce")
+        dates = dates.fillna(EXCEL_EPOCH + pd.to_timedelta(serials // 1, unit="D"))
 
-        if isinstance(serial_number, str):
-            if "30.02.2025" in serial_number or "30/02/2025" in serial_number:
-                return datetime(2025, 2, 28)
+        texts = values.where(is_text).astype("string").str.strip()
+        invalid = texts.str.contains(
+            INVALID_DATES[0], regex=False
+        ) | texts.str.contains(INVALID_DATES[1], regex=False)
+        dates = dates.mask(invalid.fillna(False), INVALID_DATES_REPLACEMENT)
+        for date_format in DATE_FORMATS:
+            dates = dates.fillna(
+                pd.to_datetime(texts, format=date_format, errors="coerce")
+            )
 
-            for fmt in ["%d.%m.%Y", "%m/%d/%y", "%d/%m/%Y", "%Y-%m-%d", "%m/%d/%Y"]:
-                try:
-                    return datetime.strptime(serial_number, fmt)
-                except ValueError:
-                    continue
-            return None
+    return [None if pd.isna(date) else date.to_pydatetime() for date in dates]
 
-        if isinstance(serial_number, (int, float)):
-            excel_epoch = datetime(1899, 12, 30)
-            return excel_epoch + timedelta(days=int(float(serial_number)))
-        return None
-    except (ValueError, TypeError):
-        return None
+
+def excel_header(values) -> List[str]:
+    """Имена колонок из строки заголовка (как у pandas.read_excel)"""
+    columns = []
+    seen: Dict[str, int] = {}
+    for index, value in enumerate(values):
+        name = f"Unnamed: {index}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def read_excel_header(excel_file: str) -> Tuple[List[str], Optional[int]]:
+    """
+    Читает строку заголовка первого листа и оценку числа строк данных
+    по размерам листа, записанным в файле (None, если размеры не указаны).
+    Оценка бывает завышенной: max_row учитывает и оформленные пустые строки
+    """
+    workbook = load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        header = next(sheet.iter_rows(max_row=1, values_only=True), ())
+        total_rows = sheet.max_row - 1 if sheet.max_row else None
+        return excel_header(header), total_rows
+    finally:
+        workbook.close()
+
+
+def iter_excel_chunks(
+    excel_file: str, chunk_size: int, start: int = 0
+) -> Iterator[pd.DataFrame]:
+    """
+    Потоково читает первый лист (openpyxl read_only) частями по chunk_size строк,
+    начиная со строки данных start. Индекс частей - номер строки данных,
+    как у DataFrame всего листа
+    """
+    workbook = load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        columns = excel_header(next(rows, ()))
+        width = len(columns)
+        values = []
+        positions = []
+        for position, row in enumerate(rows):
+            if position < start or all(value is None for value in row):
+                continue
+            values.append((tuple(row) + (None,) * width)[:width])
+            positions.append(position)
+            if len(values) == chunk_size:
+                yield pd.DataFrame(values, columns=columns, index=positions)
+                values = []
+                positions = []
+        if values:
+            yield pd.DataFrame(values, columns=columns, index=positions)
+    finally:
+        workbook.close()
+
+
+class ExcelSource:
+    """
+    Строки Excel файла частями: весь лист читается через pandas и делится
+    на части по BATCH_SIZE строк или, если задан chunk_size, читается потоково
+    частями по chunk_size строк без загрузки всей книги в память
+    """
+
+    def __init__(
+        self,
+        excel_file: str,
+        executor: Optional[Executor] = None,
+        chunk_size: Optional[int] = None,
+    ):
+        self.excel_file = excel_file
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self.columns: List[str] = []
+        # Число строк данных; в потоковом режиме - оценка по размерам листа,
+        # уточняемая перед выдачей последней части
+        self.total_rows: Optional[int] = None
+        # Номер строки данных, следующей за последней прочитанной частью
+        self.offset = 0
+        self._df: Optional[pd.DataFrame] = None
+
+    async def open(self):
+        """Читает заголовок, а без потокового режима - весь лист"""
+        loop = asyncio.get_running_loop()
+        if self.chunk_size:
+            self.columns, self.total_rows = await loop.run_in_executor(
+                None, read_excel_header, self.excel_file
+            )
+        else:
+            self._df = await loop.run_in_executor(
+                self.executor, pd.read_excel, self.excel_file
+            )
+            self.columns = list(self._df.columns)
+            self.total_rows = len(self._df)
+
+    async def chunks(self, start: int = 0) -> AsyncIterator[pd.DataFrame]:
+        """
+        Строки файла частями, начиная со строки данных start;
+        в потоковом режиме файл читается заново
+        """
+        self.offset = start
+        if not self.chunk_size:
+            rows = self._df.iloc[start:]
+            for begin in range(0, len(rows), BATCH_SIZE):
+                chunk = rows.iloc[begin : begin + BATCH_SIZE]
+                self.offset = int(chunk.index[-1]) + 1
+                yield chunk
+            return
+
+        loop = asyncio.get_running_loop()
+        iterator = iter_excel_chunks(self.excel_file, self.chunk_size, start)
+        try:
+            # Следующая часть читается заранее, чтобы к выдаче последней
+            # части число строк было известно точно
+            chunk = await loop.run_in_executor(None, next, iterator, None)
+            while chunk is not None:
+                following = await loop.run_in_executor(None, next, iterator, None)
+                self.offset = int(chunk.index[-1]) + 1
+                if following is None:
+                    self.total_rows = self.offset
+                yield chunk
+                chunk = following
+        finally:
+            iterator.close()
+
+
+def find_column(columns: List[str], keywords: List[str]) -> Optional[str]:
+    """Находит первую колонку, название которой содержит одно из ключевых слов"""
+    for col in columns:
+        col_lower = str(col).lower()
+        for keyword in keywords:
+            if keyword.lower() in col_lower:
+                return col
+    return None
 
 
 async def check_table_empty(pg: PG, table_name: str) -> bool:
     """Проверяет, пуста ли таблица"""
-    from sqlalchemy import text
-
     async with pg.get_session() as session:
         result = await session.execute(text(f'SELECT COUNT(*) FROM "{table_name}"'))
         count = result.scalar()
         return count == 0
 
 
-async def import_users(pg: PG, excel_file: str):
-    """Импортирует пользователей из Excel"""
-    if not await check_table_empty(pg, "User"):
-        print("Таблица User уже содержит данные, пропускаем импорт")
-        return
-
-    print(f"Импорт пользователей из {excel_file}...")
-    df = pd.read_excel(excel_file)
+def file_hash(path: str) -> str:
+    """SHA-256 содержимого файла"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """
+    Контрольная точка импорта файла: сколько строк данных уже зафиксировано.
+    Сохраняется в той же транзакции, что и загруженная часть файла
+    """
+
+    def __init__(self, excel_file: str, content_hash: str, row_offset: int = 0):
+        self.file_name = Path(excel_file).name
+        self.content_hash = content_hash
+        self.row_offset = row_offset
+
+    async def save(self, session, row_offset: int, completed: bool = False):
+        """Записывает смещение в транзакции сессии"""
+        statement = pg_insert(ImportCheckpoint.__table__).values(
+            file_name=self.file_name,
+            content_hash=self.content_hash,
+            row_offset=row_offset,
+            completed=completed,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["file_name"],
+            set_={
+                "content_hash": statement.excluded.content_hash,
+                "row_offset": statement.excluded.row_offset,
+                "completed": statement.excluded.completed,
+                "updated_at": func.current_timestamp(),
+            },
+        )
+        await session.execute(statement)
 
-    role_col = None
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if "роль" in col_lower:
-            role_col = col
-            break
+    async def commit(self, pg: PG, row_offset: int, completed: bool = False):
+        """Фиксирует смещение отдельной транзакцией"""
+        async with pg.get_session() as session:
+            await self.save(session, row_offset, completed)
+            await session.commit()
+        self.row_offset = row_offset
+
+
+async def start_checkpoint(
+    pg: PG, excel_file: str, table_name: str
+) -> Optional[Checkpoint]:
+    """
+    Определяет, с какой строки импортировать файл: прерванный импорт того же
+    файла продолжается с контрольной точки, иначе файл импортируется в пустую
+    таблицу с начала. None - импорт не нужен
+    """
+    content_hash = await asyncio.to_thread(file_hash, excel_file)
+    async with pg.get_session() as session:
+        saved = await session.get(ImportCheckpoint, Path(excel_file).name)
 
-    fio_col = None
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if "фио" in col_lower or "полное имя" in col_lower or "имя" in col_lower:
-            fio_col = col
-            break
+    if saved and saved.content_hash == content_hash and not saved.completed:
+        print(f"Продолжение импорта {saved.file_name} со строки {saved.row_offset + 2}")
+        return Checkpoint(excel_file, content_hash, saved.row_offset)
 
-    login_col = None
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if (
-            "логин" in col_lower
-            or "login" in col_lower
-            or "почта" in col_lower
-            or "email" in col_lower
-        ):
-            login_col = col
-            break
+    if not await check_table_empty(pg, table_name):
+        print(f"Таблица {table_name} уже содержит данные, пропускаем импорт")
+        return None
+    return Checkpoint(excel_file, content_hash)
+
+
+class ImportProgress:
+    """Прогресс импорта файла: обработанные строки, скорость и оставшееся время"""
+
+    def __init__(
+        self,
+        title: str,
+        total_rows: Optional[int],
+        start_offset: int = 0,
+        callback: Optional[Callable[["ImportProgress"], None]] = None,
+    ):
+        self.title = title
+        self.total_rows = total_rows
+        self.start_offset = start_offset
+        self.row_offset = start_offset
+        self.rows_per_second = 0.0
+        self.eta_seconds: Optional[float] = None
+        self.callback = callback
+        self._started = time.perf_counter()
+
+    def update(self, row_offset: int, total_rows: Optional[int] = None):
+        """
+        Обновляет число обработанных строк (и уточненное число строк файла,
+        если оно передано) и сообщает прогресс обработчику
+        """
+        self.row_offset = row_offset
+        if total_rows is not None:
+            self.total_rows = total_rows
+        elapsed = time.perf_counter() - self._started
+        processed = row_offset - self.start_offset
+        self.rows_per_second = processed / elapsed if elapsed > 0 else 0.0
+        if self.total_rows is not None and self.rows_per_second > 0:
+            remaining = max(self.total_rows - row_offset, 0)
+            self.eta_seconds = remaining / self.rows_per_second
+        if self.callback is not None:
+            self.callback(self)
+
+
+def print_progress(progress: ImportProgress):
+    """Выводит прогресс импорта в консоль"""
+    total = f"/{progress.total_rows}" if progress.total_rows is not None else ""
+    eta = (
+        f", осталось ~{progress.eta_seconds:.0f} с"
+        if progress.eta_seconds is not None
+        else ""
+    )
+    print(
+        f"{progress.title}: {progress.row_offset}{total} строк, "
+        f"{progress.rows_per_second:.0f} строк/с{eta}"
+    )
 
-    password_col = None
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if "пароль" in col_lower or "password" in col_lower:
-            password_col = col
-            break
 
-    from backend.internal.repo.persistent.user_postgres import UserPostgres
+async def copy_rows(session, table: Table, rows: List[Dict[str, Any]]) -> None:
+    """
+    Загружает строки в таблицу через COPY в транзакции сессии.
+    Блокировка таблицы открывает транзакцию сессии до COPY, который выполняется
+    напрямую драйвером и иначе был бы зафиксирован сразу
+    """
+    columns = list(rows[0].keys())
+    await session.execute(
+        text(f'LOCK TABLE "{table.name}" IN SHARE ROW EXCLUSIVE MODE')
+    )
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table.name,
+        records=[tuple(row[column] for column in columns) for row in rows],
+        columns=columns,
+    )
 
-    user_repo = UserPostgres(pg)
 
+async def load_chunks(
+    pg: PG,
+    table: Table,
+    entity_name: str,
+    source: ExcelSource,
+    read_chunks: Callable[[int], AsyncIterator[Tuple[List[Dict[str, Any]], List[int]]]],
+    checkpoint: Checkpoint,
+    progress: ImportProgress,
+    bulk: bool = True,
+) -> int:
+    """
+    Загружает файл частями через COPY, начиная с контрольной точки: каждая часть
+    фиксируется своей транзакцией вместе с контрольной точкой. Если часть
+    не загрузилась, оставшиеся строки загружаются построчно
+    """
     imported = 0
-    for idx, row in df.iterrows():
+    if bulk:
         try:
-            role = (
-                str(row[role_col])
-                if role_col and pd.notna(row.get(role_col))
-                else "Авторизированный клиент"
-            )
-            full_name = (
-                str(row[fio_col]) if fio_col and pd.notna(row.get(fio_col)) else ""
-            )
-            login = (
-                str(row[login_col])
-                if login_col and pd.notna(row.get(login_col))
-                else ""
-            )
-            password = (
-                str(row[password_col])
-                if password_col and pd.notna(row.get(password_col))
-                else ""
+            async for rows, _ in read_chunks(checkpoint.row_offset):
+                async with pg.get_session() as session:
+                    if rows:
+                        await copy_rows(session, table, rows)
+                    await checkpoint.save(session, source.offset)
+                    await session.commit()
+                checkpoint.row_offset = source.offset
+                imported += len(rows)
+                progress.update(source.offset, source.total_rows)
+            await checkpoint.commit(pg, checkpoint.row_offset, completed=True)
+            return imported
+        except Exception as e:
+            print(f"Ошибка пакетной загрузки {table.name}, загрузка построчно: {e}")
+
+    async for rows, row_numbers in read_chunks(checkpoint.row_offset):
+        for row, row_number in zip(rows, row_numbers):
+            try:
+                async with pg.get_session() as session:
+                    await session.execute(insert(table).values(**row))
+                    await checkpoint.save(session, row_number - 1)
+                    await session.commit()
+                imported += 1
+            except Exception as e:
+                print(f"Ошибка при импорте {entity_name} (строка {row_number}): {e}")
+        await checkpoint.commit(pg, source.offset)
+        progress.update(source.offset, source.total_rows)
+    await checkpoint.commit(pg, checkpoint.row_offset, completed=True)
+    return imported
+
+
+def row_hash(columns) -> Any:
+    """SQL-выражение хэша строки по значениям колонок"""
+    return func.md5(cast(tuple_(*columns), Text))
+
+
+async def sync_chunks(
+    pg: PG,
+    table: Table,
+    key: str,
+    source: ExcelSource,
+    read_chunks: Callable[[int], AsyncIterator[Tuple[List[Dict[str, Any]], List[int]]]],
+    progress: ImportProgress,
+) -> Tuple[int, int, int]:
+    """
+    Синхронизирует части файла с таблицей одной транзакцией через
+    INSERT ... ON CONFLICT по естественному ключу key. Существующая строка
+    обновляется, только если хэш её значений отличается от хэша новых.
+    Возвращает число добавленных, обновленных и неизмененных строк
+    """
+    inserted = 0
+    updated = 0
+    unchanged = 0
+    async with pg.get_session() as session:
+        async for rows, _ in read_chunks(0):
+            progress.update(source.offset, source.total_rows)
+            if not rows:
+                continue
+            statement = pg_insert(table)
+            update_columns = [column for column in rows[0] if column != key]
+            if update_columns:
+                statement = statement.on_conflict_do_update(
+                    index_elements=[key],
+                    set_={
+                        column: statement.excluded[column] for column in update_columns
+                    },
+                    where=row_hash([table.c[column] for column in update_columns])
+                    != row_hash(
+                        [statement.excluded[column] for column in update_columns]
+                    ),
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=[key])
+            # xmax = 0 только у строк, вставленных этим оператором
+            result = await session.execute(
+                statement.returning(literal_column("xmax = 0")), rows
             )
+            changed = result.scalars().all()
+            inserted += sum(changed)
+            updated += len(changed) - sum(changed)
+            unchanged += len(rows) - len(changed)
+        await session.commit()
+    return inserted, updated, unchanged
+
+
+def report_synced(
+    title: str, inserted: int, updated: int, unchanged: int, started: float
+):
+    """Выводит итог синхронизации и скорость обработки строк"""
+    elapsed = time.perf_counter() - started
+    total = inserted + updated + unchanged
+    rate = total / elapsed if elapsed > 0 else 0
+    print(
+        f"Синхронизировано {title}: добавлено {inserted}, обновлено {updated}, "
+        f"без изменений {unchanged} за {elapsed:.2f} с ({rate:.0f} строк/с)"
+    )
 
-            if not full_name or not login:
-                print(f"Пропуск строки {idx + 2}: отсутствуют обязательные поля")
-                continue
 
-            user = User(role=role, full_name=full_name, login=login, password=password)
-            await user_repo.create(user)
-            imported += 1
-        except Exception as e:
-            print(f"Ошибка при импорте пользователя (строка {idx + 2}): {e}")
+def report_imported(title: str, imported: int, started: float):
+    """Выводит число импортированных строк и скорость импорта"""
+    elapsed = time.perf_counter() - started
+    rate = imported / elapsed if elapsed > 0 else 0
+    print(f"Импортировано {title}: {imported} за {elapsed:.2f} с ({rate:.0f} строк/с)")
+
+
+def detect_user_columns(columns: List[str]) -> Dict[str, Optional[str]]:
+    """Определяет колонки файла пользователей по строке заголовка"""
+    return {
+        "role": find_column(columns, ["роль"]),
+        "full_name": find_column(columns, ["фио", "полное имя", "имя"]),
+        "login": find_column(columns, ["логин", "login", "почта", "email"]),
+        "password": find_column(columns, ["пароль", "password"]),
+    }
+
+
+async def user_chunks(
+    source: ExcelSource, columns: Dict[str, Optional[str]], start: int = 0
+):
+    """Разбирает пользователей по частям: строки для вставки и их номера в Excel"""
+    role_col = columns["role"]
+    fio_col = columns["full_name"]
+    login_col = columns["login"]
+    password_col = columns["password"]
+
+    logins = set()
+    async for df in source.chunks(start):
+        rows = []
+        row_numbers = []
+        for idx, row in zip(df.index, df.to_dict("records")):
+            try:
+                role = (
+                    str(row[role_col])
+                    if role_col and pd.notna(row.get(role_col))
+                    else "Авторизированный клиент"
+                )
+                full_name = (
+                    str(row[fio_col]) if fio_col and pd.notna(row.get(fio_col)) else ""
+                )
+                login = (
+                    str(row[login_col])
+                    if login_col and pd.notna(row.get(login_col))
+                    else ""
+                )
+                password = (
+                    str(row[password_col])
+                    if password_col and pd.notna(row.get(password_col))
+                    else ""
+                )
 
-    print(f"Импортировано пользователей: {imported}")
+                if not full_name or not login:
+                    print(f"Пропуск строки {idx + 2}: отсутствуют обязательные поля")
+                    continue
+
+                if login in logins:
+                    print(f"Пропуск строки {idx + 2}: повторяющийся логин '{login}'")
+                    continue
+                logins.add(login)
+
+                rows.append(
+                    {
+                        "role": role,
+                        "full_name": full_name,
+                        "login": login,
+                        "password": password,
+                    }
+                )
+                row_numbers.append(idx + 2)
+            except Exception as e:
+                print(f"Ошибка при импорте пользователя (строка {idx + 2}): {e}")
+        yield rows, row_numbers
+
+
+async def import_users(
+    pg: PG,
+    excel_file: str,
+    bulk: bool = True,
+    executor: Optional[Executor] = None,
+    chunk_size: Optional[int] = None,
+    sync: bool = False,
+    progress: Optional[Callable[[ImportProgress], None]] = print_progress,
+):
+    """Импортирует пользователей из Excel (с sync - синхронизирует по логину)"""
+    checkpoint = None
+    if not sync:
+        checkpoint = await start_checkpoint(pg, excel_file, "User")
+        if checkpoint is None:
+            return
+
+    print(f"Импорт пользователей из {excel_file}...")
+    started = time.perf_counter()
+    source = ExcelSource(excel_file, executor, chunk_size)
+    await source.open()
+    columns = detect_user_columns(source.columns)
+
+    def read_chunks(start: int):
+        return user_chunks(source, columns, start)
+
+    if sync:
+        counts = await sync_chunks(
+            pg,
+            User.__table__,
+            "login",
+            source,
+            read_chunks,
+            ImportProgress("Пользователи", source.total_rows, callback=progress),
+        )
+        report_synced("пользователей", *counts, started)
+        return
+
+    imported = await load_chunks(
+        pg,
+        User.__table__,
+        "пользователя",
+        source,
+        read_chunks,
+        checkpoint,
+        ImportProgress(
+            "Пользователи", source.total_rows, checkpoint.row_offset, progress
+        ),
+        bulk,
+    )
+    report_imported("пользователей", imported, started)
 
 
 def _parse_count(row, count_col, idx):
@@ -159,338 +664,597 @@ def _parse_count(row, count_col, idx):
         return 0
 
 
-async def import_goods(pg: PG, excel_file: str):
-    """Импортирует товары из Excel"""
-    if not await check_table_empty(pg, "Goods"):
-        print("Таблица Goods уже содержит данные, пропускаем импорт")
-        return
+def detect_goods_columns(columns: List[str]) -> Dict[str, Optional[str]]:
+    """Определяет колонки файла товаров по строке заголовка"""
+    return {
+        "article": find_column(columns, ["артикул", "article"]),
+        "name": find_column(
+            columns, ["наименование", "название", "name", "имя", "товар"]
+        ),
+        "unit": find_column(columns, ["единица", "unit", "измерения"]),
+        "price": find_column(columns, ["цена", "price"]),
+        "provider": find_column(columns, ["поставщик", "provider"]),
+        "manufacturer": find_column(columns, ["производитель", "manufacturer"]),
+        "category": find_column(columns, ["категория", "category"]),
+        "discount": find_column(columns, ["скидка", "discount"]),
+        "count": find_column(
+            columns, ["количество", "count", "quantity", "кол-во", "склад", "на складе"]
+        ),
+        "description": find_column(columns, ["описание", "description"]),
+        "image": find_column(columns, ["изображение", "image", "фото", "photo"]),
+    }
+
+
+async def goods_chunks(
+    source: ExcelSource, columns: Dict[str, Optional[str]], start: int = 0
+):
+    """Разбирает товары по частям: строки для вставки и их номера в Excel"""
+    article_col = columns["article"]
+    name_col = columns["name"]
+    unit_col = columns["unit"]
+    price_col = columns["price"]
+    provider_col = columns["provider"]
+    manufacturer_col = columns["manufacturer"]
+    category_col = columns["category"]
+    discount_col = columns["discount"]
+    count_col = columns["count"]
+    description_col = columns["description"]
+    image_col = columns["image"]
+
+    articles = set()
+    async for df in source.chunks(start):
+        rows = []
+        row_numbers = []
+        for idx, row in zip(df.index, df.to_dict("records")):
+            try:
+                article = (
+                    str(row[article_col])
+                    if article_col and pd.notna(row.get(article_col))
+                    else ""
+                )
+                name = (
+                    str(row[name_col])
+                    if name_col and pd.notna(row.get(name_col))
+                    else ""
+                )
+                unit = (
+                    str(row[unit_col])
+                    if unit_col and pd.notna(row.get(unit_col))
+                    else "шт"
+                )
+                price = (
+                    float(row[price_col])
+                    if price_col and pd.notna(row.get(price_col))
+                    else 0.0
+                )
 
-    print(f"Импорт товаров из {excel_file}...")
-    df = pd.read_excel(excel_file)
-
-    def find_column(keywords):
-        for col in df.columns:
-            col_lower = str(col).lower()
-            for keyword in keywords:
-                if keyword.lower() in col_lower:
-                    return col
-        return None
+                if not article:
+                    print(f"Пропуск строки {idx + 2}: отсутствует артикул")
+                    continue
 
-    article_col = find_column(["артикул", "article"])
-    name_col = find_column(["наименование", "название", "name", "имя", "товар"])
-    unit_col = find_column(["единица", "unit", "измерения"])
-    price_col = find_column(["цена", "price"])
-    provider_col = find_column(["поставщик", "provider"])
-    manufacturer_col = find_column(["производитель", "manufacturer"])
-    category_col = find_column(["категория", "category"])
-    discount_col = find_column(["скидка", "discount"])
-    count_col = find_column(
-        ["количество", "count", "quantity", "кол-во", "склад", "на складе"]
-    )
-    description_col = find_column(["описание", "description"])
-    image_col = find_column(["изображение", "image", "фото", "photo"])
+                if article in articles:
+                    print(
+                        f"Пропуск строки {idx + 2}: повторяющийся артикул '{article}'"
+                    )
+                    continue
 
-    if not name_col:
+                count_value = _parse_count(row, count_col, idx)
+
+                rows.append(
+                    {
+                        "article": article,
+                        "name": name if name else f"Товар {article}",
+                        "unit_of_measurement": unit,
+                        "price": price,
+                        "provider": str(row[provider_col])
+                        if provider_col and pd.notna(row.get(provider_col))
+                        else None,
+                        "manufacturer": str(row[manufacturer_col])
+                        if manufacturer_col and pd.notna(row.get(manufacturer_col))
+                        else None,
+                        "category": str(row[category_col])
+                        if category_col and pd.notna(row.get(category_col))
+                        else None,
+                        "discount": float(row[discount_col])
+                        if discount_col and pd.notna(row.get(discount_col))
+                        else None,
+                        "count": count_value,
+                        "description": str(row[description_col])
+                        if description_col and pd.notna(row.get(description_col))
+                        else None,
+                        "image": str(row[image_col])
+                        if image_col and pd.notna(row.get(image_col))
+                        else None,
+                    }
+                )
+                row_numbers.append(idx + 2)
+                articles.add(article)
+            except Exception as e:
+                print(f"Ошибка при импорте товара (строка {idx + 2}): {e}")
+        yield rows, row_numbers
+
+
+async def import_goods(
+    pg: PG,
+    excel_file: str,
+    bulk: bool = True,
+    executor: Optional[Executor] = None,
+    chunk_size: Optional[int] = None,
+    sync: bool = False,
+    progress: Optional[Callable[[ImportProgress], None]] = print_progress,
+):
+    """Импортирует товары из Excel (с sync - синхронизирует по артикулу)"""
+    checkpoint = None
+    if not sync:
+        checkpoint = await start_checkpoint(pg, excel_file, "Goods")
+        if checkpoint is None:
+            return
+
+    print(f"Импорт товаров из {excel_file}...")
+    started = time.perf_counter()
+    source = ExcelSource(excel_file, executor, chunk_size)
+    await source.open()
+    columns = detect_goods_columns(source.columns)
+
+    if not columns["name"]:
         print(
             "ВНИМАНИЕ: Колонка с названием товара не найдена! Проверьте названия колонок в Excel."
         )
 
-    from backend.internal.repo.persistent.goods_postgres import GoodsPostgres
-
-    goods_repo = GoodsPostgres(pg)
-
-    imported = 0
-    for idx, row in df.iterrows():
-        try:
-            article = (
-                str(row[article_col])
-                if article_col and pd.notna(row.get(article_col))
-                else ""
-            )
-            name = (
-                str(row[name_col]) if name_col and pd.notna(row.get(name_col)) else ""
-            )
-            unit = (
-                str(row[unit_col]) if unit_col and pd.notna(row.get(unit_col)) else "шт"
-            )
-            price = (
-                float(row[price_col])
-                if price_col and pd.notna(row.get(price_col))
-                else 0.0
-            )
-
-            if not article:
-                print(f"Пропуск строки {idx + 2}: отсутствует артикул")
-                continue
-
-            count_value = _parse_count(row, count_col, idx)
-
-            good = Good(
-                article=article,
-                name=name if name else f"Товар {article}",
-                unit_of_measurement=unit,
-                price=price,
-                provider=str(row[provider_col])
-                if provider_col and pd.notna(row.get(provider_col))
-                else None,
-                manufacturer=str(row[manufacturer_col])
-                if manufacturer_col and pd.notna(row.get(manufacturer_col))
-                else None,
-                category=str(row[category_col])
-                if category_col and pd.notna(row.get(category_col))
-                else None,
-                discount=float(row[discount_col])
-                if discount_col and pd.notna(row.get(discount_col))
-                else None,
-                count=count_value,
-                description=str(row[description_col])
-                if description_col and pd.notna(row.get(description_col))
-                else None,
-                image=str(row[image_col])
-                if image_col and pd.notna(row.get(image_col))
-                else None,
-            )
-            await goods_repo.create(good)
-            imported += 1
-        except Exception as e:
-            print(f"Ошибка при импорте товара (строка {idx + 2}): {e}")
+    def read_chunks(start: int):
+        return goods_chunks(source, columns, start)
+
+    if sync:
+        counts = await sync_chunks(
+            pg,
+            Good.__table__,
+            "article",
+            source,
+            read_chunks,
+            ImportProgress("Товары", source.total_rows, callback=progress),
+        )
+        report_synced("товаров", *counts, started)
+        return
 
-    print(f"Импортировано товаров: {imported}")
+    imported = await load_chunks(
+        pg,
+        Good.__table__,
+        "товара",
+        source,
+        read_chunks,
+        checkpoint,
+        ImportProgress("Товары", source.total_rows, checkpoint.row_offset, progress),
+        bulk,
+    )
+    report_imported("товаров", imported, started)
 
 
-async def import_pick_up_points(pg: PG, excel_file: str):
-    """Импортирует пункты выдачи из Excel"""
-    if not await check_table_empty(pg, "Order_Pick_Up_Point"):
-        print("Таблица Order_Pick_Up_Point уже содержит данные, пропускаем импорт")
-        return
+def detect_pick_up_address_column(columns: List[str]) -> Optional[str]:
+    """Определяет колонку адреса в файле пунктов выдачи по строке заголовка"""
+    address_col = find_column(
+        columns, ["адрес", "address", "полный адрес", "full_address"]
+    )
+    if not address_col and columns:
+        if "id" in columns or "ID" in columns or "Id" in columns:
+            if len(columns) > 1:
+                address_col = columns[1]
+        else:
+            address_col = columns[0]
+    return address_col
+
+
+async def pick_up_point_chunks(
+    source: ExcelSource, address_col: Optional[str], start: int = 0
+):
+    """Разбирает пункты выдачи по частям: строки для вставки и их номера в Excel"""
+    addresses = set()
+    async for df in source.chunks(start):
+        rows = []
+        row_numbers = []
+        for idx, row in zip(df.index, df.to_dict("records")):
+            try:
+                address = (
+                    str(row[address_col])
+                    if address_col and pd.notna(row.get(address_col))
+                    else ""
+                )
+                if not address or address.strip() == "":
+                    print(f"Пропуск строки {idx + 2}: пустой адрес")
+                    continue
+                if address in addresses:
+                    print(f"Пропуск строки {idx + 2}: повторяющийся адрес '{address}'")
+                    continue
+                addresses.add(address)
+
+                rows.append({"full_address": address})
+                row_numbers.append(idx + 2)
+            except Exception as e:
+                print(f"Ошибка при импорте пункта выдачи (строка {idx + 2}): {e}")
+        yield rows, row_numbers
+
+
+async def import_pick_up_points(
+    pg: PG,
+    excel_file: str,
+    bulk: bool = True,
+    executor: Optional[Executor] = None,
+    chunk_size: Optional[int] = None,
+    sync: bool = False,
+    progress: Optional[Callable[[ImportProgress], None]] = print_progress,
+):
+    """Импортирует пункты выдачи из Excel (с sync - синхронизирует по адресу)"""
+    checkpoint = None
+    if not sync:
+        checkpoint = await start_checkpoint(pg, excel_file, "Order_Pick_Up_Point")
+        if checkpoint is None:
+            return
 
     print(f"Импорт пунктов выдачи из {excel_file}...")
-    df = pd.read_excel(excel_file)
-
-    address_col = None
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if (
-            "адрес" in col_lower
-            or "address" in col_lower
-            or "полный адрес" in col_lower
-            or "full_address" in col_lower
-        ):
-            address_col = col
-            break
-    if not address_col:
-        if "id" in df.columns or "ID" in df.columns or "Id" in df.columns:
-            cols = list(df.columns)
-            if len(cols) > 1:
-                address_col = cols[1]
-        else:
-            address_col = df.columns[0]
+    started = time.perf_counter()
+    source = ExcelSource(excel_file, executor, chunk_size)
+    await source.open()
+    address_col = detect_pick_up_address_column(source.columns)
+
+    def read_chunks(start: int):
+        return pick_up_point_chunks(source, address_col, start)
+
+    if sync:
+        counts = await sync_chunks(
+            pg,
+            OrderPickUpPoint.__table__,
+            "full_address",
+            source,
+            read_chunks,
+            ImportProgress("Пункты выдачи", source.total_rows, callback=progress),
+        )
+        report_synced("пунктов выдачи", *counts, started)
+        return
 
-    from backend.internal.repo.persistent.pick_up_point_postgres import (
-        PickUpPointPostgres,
+    imported = await load_chunks(
+        pg,
+        OrderPickUpPoint.__table__,
+        "пункта выдачи",
+        source,
+        read_chunks,
+        checkpoint,
+        ImportProgress(
+            "Пункты выдачи", source.total_rows, checkpoint.row_offset, progress
+        ),
+        bulk,
+    )
+    report_imported("пунктов выдачи", imported, started)
+
+
+async def load_order_chunks(
+    pg: PG,
+    source: ExcelSource,
+    read_chunks: Callable,
+    checkpoint: Checkpoint,
+    progress: ImportProgress,
+    bulk: bool = True,
+) -> int:
+    """
+    Загружает заказы вместе с их позициями частями, начиная с контрольной
+    точки: каждая часть фиксируется своей транзакцией вместе с контрольной
+    точкой. Если часть не загрузилась, оставшиеся заказы загружаются по одному
+    """
+    order_table = Order.__table__
+    statement = insert(order_table).returning(
+        order_table.c.id, sort_by_parameter_order=True
     )
-
-    pick_up_repo = PickUpPointPostgres(pg)
 
     imported = 0
-    for idx, row in df.iterrows():
+    if bulk:
         try:
-            address = (
-                str(row[address_col])
-                if address_col and pd.notna(row.get(address_col))
-                else ""
-            )
-            if not address or address.strip() == "":
-                print(f"Пропуск строки {idx + 2}: пустой адрес")
-                continue
-            point = OrderPickUpPoint(full_address=address)
-            await pick_up_repo.create(point)
-            imported += 1
+            async for orders, order_items, _ in read_chunks(checkpoint.row_offset):
+                async with pg.get_session() as session:
+                    if orders:
+                        result = await session.execute(statement, orders)
+                        order_ids = result.scalars().all()
+                        item_rows = [
+                            {
+                                "order_id": order_id,
+                                "goods_id": goods_id,
+                                "quantity": quantity,
+                            }
+                            for order_id, items in zip(order_ids, order_items)
+                            for goods_id, quantity in items.items()
+                        ]
+                        if item_rows:
+                            await copy_rows(session, OrderItem.__table__, item_rows)
+                    await checkpoint.save(session, source.offset)
+                    await session.commit()
+                checkpoint.row_offset = source.offset
+                imported += len(orders)
+                progress.update(source.offset, source.total_rows)
+            await checkpoint.commit(pg, checkpoint.row_offset, completed=True)
+            return imported
         except Exception as e:
-            print(f"Ошибка при импорте пункта выдачи (строка {idx + 2}): {e}")
-
-    print(f"Импортировано пунктов выдачи: {imported}")
-
-
-async def import_orders(pg: PG, excel_file: str):
-    """Импортирует заказы из Excel"""
-    if not await check_table_empty(pg, "Order"):
-        print("Таблица Order уже содержит данные, пропускаем импорт")
-        return
-
-    if not await check_table_empty(pg, "Order_Items"):
-        print("Очистка таблицы Order_Items...")
-        from sqlalchemy import text
-
-        async with pg.get_session() as session:
-            await session.execute(text('DELETE FROM "Order_Items"'))
-            await session.commit()
-
-    print(f"Импорт заказов из {excel_file}...")
-    df = pd.read_excel(excel_file)
-
-    from backend.internal.repo.persistent.order_postgres import OrderPostgres
-    from backend.internal.repo.persistent.user_postgres import UserPostgres
-    from backend.internal.repo.persistent.pick_up_point_postgres import (
-        PickUpPointPostgres,
+            print(f"Ошибка пакетной загрузки Order, загрузка построчно: {e}")
+
+    async for orders, order_items, row_numbers in read_chunks(checkpoint.row_offset):
+        for order, items, row_number in zip(orders, order_items, row_numbers):
+            try:
+                async with pg.get_session() as session:
+                    result = await session.execute(statement, [order])
+                    order_id = result.scalar_one()
+                    for goods_id, quantity in items.items():
+                        session.add(
+                            OrderItem(
+                                order_id=order_id, goods_id=goods_id, quantity=quantity
+                            )
+                        )
+                    await checkpoint.save(session, row_number - 1)
+                    await session.commit()
+                imported += 1
+            except Exception as e:
+                print(f"Ошибка при импорте заказа (строка {row_number}): {e}")
+        await checkpoint.commit(pg, source.offset)
+        progress.update(source.offset, source.total_rows)
+    await checkpoint.commit(pg, checkpoint.row_offset, completed=True)
+    return imported
+
+
+async def load_order_lookups(pg: PG):
+    """Загружает справочники для сопоставления заказов одним запросом на таблицу"""
+    async with pg.get_session() as session:
+        users = (await session.execute(select(User.full_name, User.id))).all()
+        goods = (await session.execute(select(Good.article, Good.id))).all()
+        points = (
+            await session.execute(
+                select(OrderPickUpPoint.id, OrderPickUpPoint.full_address).order_by(
+                    OrderPickUpPoint.id
+                )
+            )
+        ).all()
+
+    user_ids = {}
+    ambiguous_names = set()
+    for full_name, user_id in users:
+        if full_name in user_ids:
+            ambiguous_names.add(full_name)
+        user_ids[full_name] = user_id
+
+    point_ids = {point_id for point_id, _ in points}
+    point_ids_by_address = {}
+    for point_id, full_address in points:
+        point_ids_by_address.setdefault(full_address.strip().lower(), point_id)
+
+    addresses = [full_address for _, full_address in points]
+    return (
+        user_ids,
+        ambiguous_names,
+        dict(goods),
+        point_ids,
+        point_ids_by_address,
+        addresses,
     )
-    from backend.internal.repo.persistent.goods_postgres import GoodsPostgres
-    from backend.internal.entity.order_item import OrderItem
 
-    order_repo = OrderPostgres(pg)
-    user_repo = UserPostgres(pg)
-    pick_up_repo = PickUpPointPostgres(pg)
-    goods_repo = GoodsPostgres(pg)
 
-    imported = 0
-    for idx, row in df.iterrows():
-        try:
-            created_at = None
-            if pd.notna(row.get("Дата заказа")):
-                created_at = excel_serial_to_date(row.get("Дата заказа"))
+def detect_order_address_column(columns: List[str]) -> Optional[str]:
+    """Определяет колонку пункта выдачи в файле заказов по строке заголовка"""
+    for col in columns:
+        col_lower = str(col).lower()
+        if "адрес" in col_lower and ("пункт" in col_lower or "выдач" in col_lower):
+            return col
+    return find_column(columns, ["адрес"])
+
+
+async def order_chunks(
+    source: ExcelSource, address_col: Optional[str], lookups, start: int = 0
+):
+    """Разбирает заказы по частям: заказы, их позиции и номера строк в Excel"""
+    (
+        user_ids,
+        ambiguous_names,
+        goods_ids,
+        point_ids,
+        point_ids_by_address,
+        addresses,
+    ) = lookups
+
+    prev_date = None
+    async for df in source.chunks(start):
+        created_dates = excel_column_to_dates(df, "Дата заказа")
+        delivered_dates = excel_column_to_dates(df, "Дата доставки")
+
+        orders = []
+        order_items = []
+        row_numbers = []
+        for idx, row, created_at, delivered_at in zip(
+            df.index, df.to_dict("records"), created_dates, delivered_dates
+        ):
+            try:
                 if created_at and created_at.year == 2025 and created_at.month == 11:
-                    if imported > 0:
-                        prev_order = await order_repo.get_all()
-                        if prev_order:
-                            prev_date = prev_order[-1].created_at
-                            if prev_date:
-                                created_at = prev_date + timedelta(days=14)
+                    if prev_date:
+                        created_at = prev_date + timedelta(days=14)
                     if not created_at or (
                         created_at.year == 2025 and created_at.month == 11
                     ):
                         created_at = datetime(2025, 3, 15)
-            delivered_at = None
-            if pd.notna(row.get("Дата доставки")):
-                delivered_at = excel_serial_to_date(row.get("Дата доставки"))
-
-            user_id = None
-            recipient_full_name = (
-                str(row.get("ФИО авторизированного клиента", ""))
-                if pd.notna(row.get("ФИО авторизированного клиента"))
-                else None
-            )
-            if recipient_full_name:
-                user = await user_repo.get_by_full_name(recipient_full_name)
-                if user:
-                    user_id = user.id
-                else:
-                    print(
-                        f"Предупреждение: пользователь с ФИО '{recipient_full_name}' не найден (строка {idx + 2})"
-                    )
 
-            pick_up_point_id = None
-            address_col = None
-            for col in df.columns:
-                col_lower = str(col).lower()
-                if "адрес" in col_lower and (
-                    "пункт" in col_lower or "выдач" in col_lower
-                ):
-                    address_col = col
-                    break
-            if not address_col:
-                for col in df.columns:
-                    col_lower = str(col).lower()
-                    if "адрес" in col_lower:
-                        address_col = col
-                        break
-
-            if address_col and pd.notna(row.get(address_col)):
-                value = row.get(address_col)
-                try:
-                    pick_up_point_id = int(float(str(value)))
-                    point = await pick_up_repo.get(pick_up_point_id)
-                    if not point:
+                user_id = None
+                recipient_full_name = (
+                    str(row.get("ФИО авторизированного клиента", ""))
+                    if pd.notna(row.get("ФИО авторизированного клиента"))
+                    else None
+                )
+                if recipient_full_name:
+                    if recipient_full_name in ambiguous_names:
                         print(
-                            f"Предупреждение: пункт выдачи с ID {pick_up_point_id} не найден (строка {idx + 2})"
+                            f"Пропуск строки {idx + 2}: несколько пользователей с ФИО '{recipient_full_name}'"
                         )
-                        pick_up_point_id = None
-                except (ValueError, TypeError):
-                    address = str(value).strip()
-                    if address:
-                        all_points = await pick_up_repo.get_all()
-                        address_normalized = address.strip().lower()
-                        for point in all_points:
-                            if point.full_address.strip().lower() == address_normalized:
-                                pick_up_point_id = point.id
-                                break
-                        if not pick_up_point_id:
-                            print(
-                                f"Предупреждение: пункт выдачи с адресом '{address}' не найден (строка {idx + 2})"
-                            )
+                        continue
+                    user_id = user_ids.get(recipient_full_name)
+                    if not user_id:
+                        print(
+                            f"Предупреждение: пользователь с ФИО '{recipient_full_name}' не найден (строка {idx + 2})"
+                        )
+
+                pick_up_point_id = None
+                if address_col and pd.notna(row.get(address_col)):
+                    value = row.get(address_col)
+                    try:
+                        pick_up_point_id = int(float(str(value)))
+                        if pick_up_point_id not in point_ids:
                             print(
-                                f"  Доступные пункты выдачи: {[p.full_address for p in all_points[:5]]}"
+                                f"Предупреждение: пункт выдачи с ID {pick_up_point_id} не найден (строка {idx + 2})"
                             )
-            else:
-                print(
-                    f"Предупреждение: адрес пункта выдачи не найден в строке {idx + 2}, доступные колонки: {list(df.columns)}"
-                )
-
-            order = Order(
-                user_id=user_id,
-                pick_up_point_id=pick_up_point_id,
-                delivered_at=delivered_at,
-                recipient_code=str(row.get("Код для получения", ""))
-                if pd.notna(row.get("Код для получения"))
-                else None,
-                status=str(row.get("Статус заказа", "новый"))
-                if pd.notna(row.get("Статус заказа"))
-                else "новый",
-            )
-
-            if created_at:
-                order.created_at = created_at
-
-            created_order = await order_repo.create(order)
-
-            articles_str = (
-                str(row.get("Артикул заказа", ""))
-                if pd.notna(row.get("Артикул заказа"))
-                else ""
-            )
-            if articles_str and articles_str.strip():
-                parts = [p.strip() for p in articles_str.split(",")]
-                if len(parts) % 2 != 0:
+                            pick_up_point_id = None
+                    except (ValueError, TypeError):
+                        address = str(value).strip()
+                        if address:
+                            pick_up_point_id = point_ids_by_address.get(address.lower())
+                            if not pick_up_point_id:
+                                print(
+                                    f"Предупреждение: пункт выдачи с адресом '{address}' не найден (строка {idx + 2})"
+                                )
+                                print(f"  Доступные пункты выдачи: {addresses[:5]}")
+                else:
                     print(
-                        f"Предупреждение: нечетное количество элементов в артикулах заказа (строка {idx + 2}): {articles_str}"
+                        f"Предупреждение: адрес пункта выдачи не найден в строке {idx + 2}, доступные колонки: {source.columns}"
                     )
 
-                for i in range(0, len(parts) - 1, 2):
-                    if i + 1 < len(parts):
-                        article = parts[i].strip()
-                        try:
-                            quantity = int(parts[i + 1].strip())
-                            if quantity <= 0:
-                                print(
-                                    f"Предупреждение: некорректное количество для артикула {article}: {quantity}"
-                                )
-                                continue
-
-                            good = await goods_repo.get_by_article(article)
-                            if good:
-                                order_item = OrderItem(
-                                    order_id=created_order.id,
-                                    goods_id=good.id,
-                                    quantity=quantity,
-                                )
-                                await order_repo.add_order_item(order_item)
-                            else:
+                items = {}
+                articles_str = (
+                    str(row.get("Артикул заказа", ""))
+                    if pd.notna(row.get("Артикул заказа"))
+                    else ""
+                )
+                if articles_str and articles_str.strip():
+                    parts = [p.strip() for p in articles_str.split(",")]
+                    if len(parts) % 2 != 0:
+                        print(
+                            f"Предупреждение: нечетное количество элементов в артикулах заказа (строка {idx + 2}): {articles_str}"
+                        )
+
+                    for i in range(0, len(parts) - 1, 2):
+                        if i + 1 < len(parts):
+                            article = parts[i].strip()
+                            try:
+                                quantity = int(parts[i + 1].strip())
+                                if quantity <= 0:
+                                    print(
+                                        f"Предупреждение: некорректное количество для артикула {article}: {quantity}"
+                                    )
+                                    continue
+
+                                goods_id = goods_ids.get(article)
+                                if goods_id:
+                                    if goods_id in items:
+                                        print(
+                                            f"Предупреждение: артикул '{article}' повторяется в заказе, количество суммируется (строка {idx + 2})"
+                                        )
+                                    items[goods_id] = items.get(goods_id, 0) + quantity
+                                else:
+                                    print(
+                                        f"Предупреждение: товар с артикулом '{article}' не найден (строка {idx + 2})"
+                                    )
+                            except (ValueError, IndexError) as e:
                                 print(
-                                    f"Предупреждение: товар с артикулом '{article}' не найден (заказ ID: {created_order.id})"
+                                    f"Ошибка при парсинге артикула '{article}' в заказе (строка {idx + 2}): {e}"
                                 )
-                        except (ValueError, IndexError) as e:
-                            print(
-                                f"Ошибка при парсинге артикула '{article}' в заказе ID {created_order.id}: {e}"
-                            )
 
-            imported += 1
-        except Exception as e:
-            print(f"Ошибка при импорте заказа: {e}")
+                prev_date = created_at or datetime.now()
+                orders.append(
+                    {
+                        "user_id": user_id,
+                        "pick_up_point_id": pick_up_point_id,
+                        "created_at": prev_date,
+                        "delivered_at": delivered_at,
+                        "recipient_code": str(row.get("Код для получения", ""))
+                        if pd.notna(row.get("Код для получения"))
+                        else None,
+                        "status": str(row.get("Статус заказа", "новый"))
+                        if pd.notna(row.get("Статус заказа"))
+                        else "новый",
+                    }
+                )
+                order_items.append(items)
+                row_numbers.append(idx + 2)
+            except Exception as e:
+                print(f"Ошибка при импорте заказа (строка {idx + 2}): {e}")
+        yield orders, order_items, row_numbers
+
+
+async def import_orders(
+    pg: PG,
+    excel_file: str,
+    bulk: bool = True,
+    executor: Optional[Executor] = None,
+    dependencies: Optional[Awaitable] = None,
+    chunk_size: Optional[int] = None,
+    progress: Optional[Callable[[ImportProgress], None]] = print_progress,
+):
+    """
+    Импортирует заказы из Excel. Файл открывается сразу, а сопоставление
+    с пользователями, товарами и пунктами выдачи начинается после dependencies
+    """
+    checkpoint = await start_checkpoint(pg, excel_file, "Order")
+    if checkpoint is None:
+        return
+
+    if checkpoint.row_offset == 0 and not await check_table_empty(pg, "Order_Items"):
+        print("Очистка таблицы Order_Items...")
+        async with pg.get_session() as session:
+            await session.execute(text('DELETE FROM "Order_Items"'))
+            await session.commit()
 
-    print(f"Импортировано заказов: {imported}")
+    print(f"Импорт заказов из {excel_file}...")
+    started = time.perf_counter()
+    source = ExcelSource(excel_file, executor, chunk_size)
+    await source.open()
+    address_col = detect_order_address_column(source.columns)
+
+    if dependencies is not None:
+        waiting = time.perf_counter()
+        await dependencies
+        started += time.perf_counter() - waiting
+
+    lookups = await load_order_lookups(pg)
+    imported = await load_order_chunks(
+        pg,
+        source,
+        lambda start: order_chunks(source, address_col, lookups, start),
+        checkpoint,
+        ImportProgress("Заказы", source.total_rows, checkpoint.row_offset, progress),
+        bulk,
+    )
+    report_imported("заказов", imported, started)
 
 
-async def import_all_data():
-    """Импортирует все данные из Excel файлов"""
+async def run_stage(timings: Dict[str, float], stage: str, coroutine: Awaitable):
+    """Выполняет этап импорта, замеряя время и не прерывая остальные этапы"""
+    started = time.perf_counter()
+    try:
+        await coroutine
+    except Exception as e:
+        print(f"Ошибка при импорте ({stage}): {e}")
+    finally:
+        timings[stage] = time.perf_counter() - started
+
+
+def missing_file(path: Path) -> bool:
+    """Проверяет наличие файла и сообщает об отсутствующем"""
+    if path.exists():
+        return False
+    print(f"Файл не найден: {path}")
+    return True
+
+
+async def import_all_data(
+    bulk: bool = True,
+    chunk_size: Optional[int] = None,
+    sync: bool = False,
+    progress: Optional[Callable[[ImportProgress], None]] = print_progress,
+):
+    """
+    Импортирует все данные из Excel файлов. Пользователи, товары и пункты
+    выдачи загружаются параллельно, заказы - после них. С chunk_size файлы
+    читаются потоково частями по chunk_size строк, с sync справочники
+    синхронизируются с файлами даже в непустых таблицах. progress вызывается
+    после каждой загруженной части файла
+    """
     pg = PG(
         host=config.database.host,
         port=config.database.port,
@@ -505,40 +1269,116 @@ async def import_all_data():
 
     print("Начало импорта данных из Excel файлов...")
     print("=" * 50)
+    started = time.perf_counter()
 
     base_path = root_dir / "schema" / "data_for_import"
-
     users_file = base_path / "Пользователи.xlsx"
-    if users_file.exists():
-        await import_users(pg, str(users_file))
-    else:
-        print(f"Файл не найден: {users_file}")
-
     goods_file = base_path / "Товары.xlsx"
-    if goods_file.exists():
-        await import_goods(pg, str(goods_file))
-    else:
-        print(f"Файл не найден: {goods_file}")
-
     pick_up_file = base_path / "Пункты выдачи.xlsx"
-    if pick_up_file.exists():
-        await import_pick_up_points(pg, str(pick_up_file))
-    else:
-        print(f"Файл не найден: {pick_up_file}")
-
     orders_file = base_path / "Заказы.xlsx"
-    if orders_file.exists():
-        await import_orders(pg, str(orders_file))
-    else:
-        print(f"Файл не найден: {orders_file}")
 
+    files = [users_file, goods_file, pick_up_file, orders_file]
+    total_size = sum(path.stat().st_size for path in files if path.exists())
+    cpu_count = os.cpu_count() or 1
+    executor = None
+    if not chunk_size and total_size >= PROCESS_POOL_MIN_BYTES and cpu_count > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=min(len(files), cpu_count),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    timings: Dict[str, float] = {}
+    try:
+        reference_stages = []
+        if not missing_file(users_file):
+            reference_stages.append(
+                run_stage(
+                    timings,
+                    "Пользователи",
+                    import_users(
+                        pg,
+                        str(users_file),
+                        bulk,
+                        executor,
+                        chunk_size,
+                        sync,
+                        progress,
+                    ),
+                )
+            )
+        if not missing_file(goods_file):
+            reference_stages.append(
+                run_stage(
+                    timings,
+                    "Товары",
+                    import_goods(
+                        pg,
+                        str(goods_file),
+                        bulk,
+                        executor,
+                        chunk_size,
+                        sync,
+                        progress,
+                    ),
+                )
+            )
+        if not missing_file(pick_up_file):
+            reference_stages.append(
+                run_stage(
+                    timings,
+                    "Пункты выдачи",
+                    import_pick_up_points(
+                        pg,
+                        str(pick_up_file),
+                        bulk,
+                        executor,
+                        chunk_size,
+                        sync,
+                        progress,
+                    ),
+                )
+            )
+        reference = asyncio.gather(*reference_stages)
+
+        stages = [reference]
+        if not missing_file(orders_file):
+            stages.append(
+                run_stage(
+                    timings,
+                    "Заказы",
+                    import_orders(
+                        pg,
+                        str(orders_file),
+                        bulk,
+                        executor,
+                        reference,
+                        chunk_size,
+                        progress,
+                    ),
+                )
+            )
+        await asyncio.gather(*stages)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    elapsed = time.perf_counter() - started
     print("=" * 50)
+    print("Время этапов импорта:")
+    for stage, seconds in timings.items():
+        print(f"  {stage:<16}{seconds:>8.2f} с")
+    print(f"  {'Сумма этапов':<16}{sum(timings.values()):>8.2f} с")
+    print(f"  {'Общее время':<16}{elapsed:>8.2f} с")
     print("Импорт данных завершен!")
 
     await pg.close()
 
 
 if __name__ == "__main__":
-    import asyncio
-
-    asyncio.run(import_all_data())
+    asyncio.run(
+        import_all_data(
+            bulk="--row-by-row" not in sys.argv,
+            chunk_size=STREAM_CHUNK_SIZE if "--stream" in sys.argv else None,
+            sync="--sync" in sys.argv,
+        )
+    )
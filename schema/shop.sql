@@ -1,3 +1,4 @@
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 CREATE TABLE "User" (
     id serial PRIMARY KEY,
     role VARCHAR(32) NOT NULL,
@@ -22,8 +23,28 @@ CREATE TABLE "Goods" (
     discount NUMERIC(5, 2),
     count INTEGER NOT NULL DEFAULT 0,
     description text,
-    image VARCHAR(255)
+    image VARCHAR(255),
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('russian', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(article, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(category, '')), 'B') ||
+        setweight(to_tsvector('russian', coalesce(manufacturer, '')), 'C') ||
+        setweight(to_tsvector('russian', coalesce(provider, '')), 'C') ||
+        setweight(to_tsvector('russian', coalesce(description, '')), 'D')
+    ) STORED
 );
+-- Полнотекстовый поиск по товарам
+CREATE INDEX ix_goods_search_vector ON "Goods" USING GIN (search_vector);
+-- Триграммные индексы для подсказок в строке поиска
+CREATE INDEX ix_goods_name_trgm ON "Goods" USING GIN (name gin_trgm_ops);
+CREATE INDEX ix_goods_article_trgm ON "Goods" USING GIN (article gin_trgm_ops);
+CREATE INDEX ix_goods_manufacturer_trgm ON "Goods" USING GIN (manufacturer gin_trgm_ops);
+-- Сортировка каталога по остатку, в том числе с фильтром по поставщику
+CREATE INDEX ix_goods_count_id ON "Goods" (count, id);
+CREATE INDEX ix_goods_provider_count_id ON "Goods" (provider, count, id);
+-- Списки категорий и производителей
+CREATE INDEX ix_goods_category ON "Goods" (category);
+CREATE INDEX ix_goods_manufacturer ON "Goods" (manufacturer);
 CREATE TABLE "Order" (
     id serial PRIMARY KEY,
     user_id INTEGER REFERENCES "User"(id) ON DELETE
@@ -35,6 +56,9 @@ CREATE TABLE "Order" (
         recipient_code VARCHAR(50),
         status VARCHAR(50)
 );
+-- Заказы пользователя и ON DELETE SET NULL по внешним ключам
+CREATE INDEX ix_order_user_id ON "Order" (user_id);
+CREATE INDEX ix_order_pick_up_point_id ON "Order" (pick_up_point_id);
 -- Таблица для связи "многие ко многим" между Order и Goods
 CREATE TABLE "Order_Items" (
     id serial PRIMARY KEY,
@@ -42,4 +66,26 @@ CREATE TABLE "Order_Items" (
     goods_id INTEGER NOT NULL REFERENCES "Goods"(id) ON DELETE CASCADE,
     quantity INTEGER NOT NULL CHECK (quantity > 0),
     UNIQUE(order_id, goods_id)
-);
\ No newline at end of file
+);
+-- Проверка, входит ли товар в заказы, и ON DELETE CASCADE товара
+CREATE INDEX ix_order_items_goods_id ON "Order_Items" (goods_id);
+-- Контрольные точки импорта из Excel: файл, хэш содержимого и число
+-- зафиксированных строк данных для продолжения прерванного импорта
+CREATE TABLE "Import_Checkpoint" (
+    file_name VARCHAR(255) PRIMARY KEY,
+    content_hash VARCHAR(64) NOT NULL,
+    row_offset INTEGER NOT NULL DEFAULT 0,
+    completed BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+-- Временные резервы товара открытыми корзинами: резерв действует до
+-- expires_at и уменьшает доступный остаток для других покупателей
+CREATE TABLE "Stock_Reservation" (
+    cart_id VARCHAR(36) NOT NULL,
+    goods_id INTEGER NOT NULL REFERENCES "Goods"(id) ON DELETE CASCADE,
+    quantity INTEGER NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (cart_id, goods_id)
+);
+CREATE INDEX ix_stock_reservation_goods_expires ON "Stock_Reservation" (goods_id, expires_at) INCLUDE (quantity, cart_id);
+CREATE INDEX ix_stock_reservation_expires ON "Stock_Reservation" (expires_at);